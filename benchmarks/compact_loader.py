@@ -0,0 +1,54 @@
+# compact_loader.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/compact_loader.py --raw-data data/raw/pretransformed_heart_disease.csv --rows 100000,1000000
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import pandas as pd
+from src.codebook import read_decoded
+from src.data_loader import load_heart_data
+from src.storage import dataset_path, write_dataset
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/pretransformed_heart_disease.csv',
+              help="Location of the decoded raw data file")
+@click.option('--rows', type=str, default='100000,1000000', help="Comma-separated row counts to benchmark")
+@click.option('--formats', type=str, default='csv,parquet', help="Comma-separated storage formats to benchmark")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(raw_data, rows, formats, write_to):
+    """Compare the in-memory size of heart disease tables as read by default and in the compact dtypes."""
+    decoded = read_decoded(raw_data)
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in [int(n) for n in rows.split(",")]:
+            frame = decoded.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+            for format in formats.split(","):
+                path = dataset_path(directory, f"heart_{n_rows}", format)
+                write_dataset(frame, path)
+                start = time.perf_counter()
+                _, footprint = load_heart_data(path)
+                records.append({
+                    "rows": n_rows,
+                    "format": format,
+                    "as_read_mb": round(footprint["before"] / 2**20, 2),
+                    "compact_mb": round(footprint["after"] / 2**20, 2),
+                    "ratio": round(footprint["before"] / footprint["after"], 1),
+                    "load_sec": round(time.perf_counter() - start, 3),
+                })
+                os.remove(path)
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# compiled_scorer.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/compiled_scorer.py --data data/processed/test_df.csv --pipeline results/models/disease_pipeline.pickle --scorer results/models/disease_scorer.json
+
+import os
+import subprocess
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Each snippet runs in a fresh interpreter, so the time includes importing the libraries it needs
+STARTUP = {
+    "pickled pipeline": "import pickle; pickle.load(open({path!r}, 'rb'))",
+    "compiled scorer": "from src.compiled_scorer import CompiledScorer; CompiledScorer.load({path!r})",
+}
+
+
+def cold_start_seconds(snippet, repeats):
+    """Median wall time of running `snippet` in a new Python process, minus an empty interpreter's startup."""
+    def run(code):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        return time.perf_counter() - start
+    baseline = np.median([run("pass") for _ in range(repeats)])
+    return np.median([run(snippet) for _ in range(repeats)]) - baseline
+
+
+def per_row_seconds(predict, rows, repeats):
+    """Median time to predict one row at a time."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for row in rows:
+            predict(row)
+        times.append((time.perf_counter() - start) / len(rows))
+    return np.median(times)
+
+
+@click.command()
+@click.option('--data', type=str, help="CSV of patients to score", required=True)
+@click.option('--pipeline', type=str, help="Path to the model pickle", required=True)
+@click.option('--scorer', type=str, help="Path to the compiled scorer JSON", required=True)
+@click.option('--repeats', type=int, default=5, help="Number of repetitions per measurement")
+def main(data, pipeline, scorer, repeats):
+    """Compare startup and single-row latency of the pickled pipeline and the compiled scorer."""
+    import pickle
+    from src.compiled_scorer import CompiledScorer
+
+    features = pd.read_csv(data).drop(columns='Diagnosis of heart disease', errors='ignore')
+    with open(pipeline, 'rb') as f:
+        model = pickle.load(f)
+    compiled = CompiledScorer.load(scorer)
+    assert np.array_equal(model.decision_function(features), compiled.decision_function(features))
+
+    frames = [features.iloc[[i]] for i in range(len(features))]
+    records = [{column: [value] for column, value in row.items()} for row in features.to_dict('records')]
+    results = pd.DataFrame({
+        "model": ["pickled pipeline", "compiled scorer"],
+        "startup_ms": [cold_start_seconds(STARTUP["pickled pipeline"].format(path=os.path.abspath(pipeline)), repeats) * 1000,
+                       cold_start_seconds(STARTUP["compiled scorer"].format(path=os.path.abspath(scorer)), repeats) * 1000],
+        "per_row_us": [per_row_seconds(model.predict, frames, repeats) * 1e6,
+                       per_row_seconds(compiled.predict, records, repeats) * 1e6],
+    })
+    print(results.round(1).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
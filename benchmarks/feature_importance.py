@@ -0,0 +1,67 @@
+# feature_importance.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/feature_importance.py --test data/processed/test_df.csv \
+#                                                --pipeline results/models/disease_pipeline.pickle --rows 1000,10000 --n-jobs 1,2,4
+
+import os
+import sys
+import time
+import pickle
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+from sklearn.inspection import permutation_importance
+from sklearn.metrics import make_scorer, f1_score
+from src.feature_importance import permutation_importance_encoded
+
+
+@click.command()
+@click.option('--test', type=str, default='data/processed/test_df.csv', help="Location of test data file")
+@click.option('--pipeline', type=str, default='results/models/disease_pipeline.pickle', help="Path to the model pickle")
+@click.option('--rows', type=str, default='1000,10000', help="Comma-separated row counts to benchmark")
+@click.option('--n-repeats', type=int, default=30, help="Number of permutations of each feature")
+@click.option('--n-jobs', type=str, default='1,2,4', help="Comma-separated worker counts to benchmark")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(test, pipeline, rows, n_repeats, n_jobs, write_to):
+    """Compare sklearn's permutation_importance on the raw test set with the encoded, per-worker version."""
+    with open(pipeline, 'rb') as f:
+        model = pickle.load(f)
+    test_data = pd.read_csv(test)
+    scorer = make_scorer(f1_score, pos_label='> 50% diameter narrowing')
+
+    records = []
+    for n_rows in [int(value) for value in rows.split(",")]:
+        # Bootstrap the test set up to the requested size
+        sample = test_data.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+        X, y = sample.drop(columns='Diagnosis of heart disease'), sample['Diagnosis of heart disease'].to_numpy()
+        for workers in [int(value) for value in n_jobs.split(",")]:
+            start = time.perf_counter()
+            reference = permutation_importance(model, X, y, scoring=scorer, n_repeats=n_repeats,
+                                               n_jobs=workers, random_state=123)
+            sklearn_time = time.perf_counter() - start
+            start = time.perf_counter()
+            encoded = permutation_importance_encoded(model, X, y, scoring="f1", n_repeats=n_repeats,
+                                                     n_jobs=workers, random_state=123)
+            encoded_time = time.perf_counter() - start
+            encoded = encoded.set_index("feature").loc[X.columns, "importance_mean"].to_numpy()
+            records.append({
+                "rows": n_rows,
+                "n_jobs": workers,
+                "sklearn_s": round(sklearn_time, 3),
+                "encoded_s": round(encoded_time, 3),
+                "speedup": round(sklearn_time / encoded_time, 2),
+                "max_abs_diff": float(np.abs(encoded - reference.importances_mean).max()),
+            })
+            print(records[-1])
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
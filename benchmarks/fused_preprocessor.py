@@ -0,0 +1,100 @@
+# fused_preprocessor.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/fused_preprocessor.py --train data/processed/train_df.csv --rows 1000,10000,100000,1000000
+
+import os
+import sys
+import time
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from src.fused_preprocessor import FusedPreprocessor
+
+CATEGORICAL_FEATURES = [
+    'Sex',
+    'Chest pain type',
+    'Fasting blood sugar > 120 mg/dl',
+    'Resting electrocardiographic results',
+    'Exercise-induced angina',
+    'Slope of the peak exercise ST segment',
+    'Thalassemia'
+]
+
+
+def make_composite(numeric_features):
+    """The preprocessor of 4_training_models.py."""
+    return make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy="most_frequent"),
+                       OneHotEncoder(handle_unknown="ignore", drop='if_binary', dtype=int, sparse_output=False)),
+         CATEGORICAL_FEATURES),
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric_features),
+    )
+
+
+def measure(call, repeats):
+    """Median wall time of `call()`, and its peak traced allocation from one extra traced run."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return np.median(times), peak
+
+
+@click.command()
+@click.option('--train', type=str, default='data/processed/train_df.csv', help="Location of train data file")
+@click.option('--rows', type=str, default='1000,10000,100000', help="Comma-separated row counts to benchmark")
+@click.option('--repeats', type=int, default=3, help="Number of repetitions per measurement")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(train, rows, repeats, write_to):
+    """Compare fit_transform and transform time and peak memory of the composite and fused preprocessors."""
+    train_data = pd.read_csv(train)
+    X_train = train_data.drop(columns='Diagnosis of heart disease')
+    numeric_features = [col for col in X_train.columns if col not in CATEGORICAL_FEATURES]
+
+    records = []
+    for n_rows in [int(value) for value in rows.split(",")]:
+        # Bootstrap the patient table up to the requested size
+        X = X_train.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+        candidates = {
+            "composite": make_composite(numeric_features),
+            "fused float64": FusedPreprocessor(CATEGORICAL_FEATURES, numeric_features),
+            "fused float32": FusedPreprocessor(CATEGORICAL_FEATURES, numeric_features, dtype=np.float32),
+            "fused sparse": FusedPreprocessor(CATEGORICAL_FEATURES, numeric_features, sparse_output=True),
+        }
+        reference = candidates["composite"].fit_transform(X)
+        for name, preprocessor in candidates.items():
+            fit_time, fit_peak = measure(lambda: preprocessor.fit_transform(X), repeats)
+            transform_time, transform_peak = measure(lambda: preprocessor.transform(X), repeats)
+            output = preprocessor.transform(X)
+            output = output.toarray() if hasattr(output, "toarray") else output
+            records.append({
+                "rows": n_rows,
+                "preprocessor": name,
+                "fit_transform_ms": round(fit_time * 1000, 2),
+                "transform_ms": round(transform_time * 1000, 2),
+                "transform_peak_mb": round(transform_peak / 2**20, 2),
+                "max_abs_diff": float(np.abs(output - reference).max()),
+            })
+            print(records[-1])
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# incremental_retraining.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/incremental_retraining.py --train data/processed/train_df.csv --rows 50000 --appended 1000,5000
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import make_scorer, f1_score
+from sklearn.pipeline import make_pipeline
+from src.fused_preprocessor import FusedPreprocessor
+from src.incremental_retraining import RetrainingState, incremental_retrain
+from src.model_tuning import RegularizationPathSearchCV
+
+CATEGORICAL_FEATURES = [
+    'Sex',
+    'Chest pain type',
+    'Fasting blood sugar > 120 mg/dl',
+    'Resting electrocardiographic results',
+    'Exercise-induced angina',
+    'Slope of the peak exercise ST segment',
+    'Thalassemia'
+]
+
+warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+
+def full_search(X, y, numeric_features, scorer):
+    """The tuning of 4_training_models.py: the 50-value C path of logreg_bal, refitted on every row."""
+    pipeline = make_pipeline(FusedPreprocessor(CATEGORICAL_FEATURES, numeric_features),
+                             LogisticRegression(max_iter=1000, class_weight="balanced"))
+    return RegularizationPathSearchCV(pipeline, Cs=np.logspace(-5, 5, 50), scoring=scorer).fit(X, y)
+
+
+@click.command()
+@click.option('--train', type=str, default='data/processed/train_df.csv', help="Location of train data file")
+@click.option('--rows', type=int, default=50000, help="Rows of the initial training file")
+@click.option('--appended', type=str, default='1000,5000', help="Comma-separated numbers of appended rows")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(train, rows, appended, write_to):
+    """Compare a full re-search with an incremental retrain after rows are appended to the training file."""
+    train_data = pd.read_csv(train)
+    target = 'Diagnosis of heart disease'
+    numeric_features = [col for col in train_data.columns if col not in CATEGORICAL_FEATURES + [target]]
+    scorer = make_scorer(f1_score, pos_label='> 50% diameter narrowing')
+    n_appended = [int(value) for value in appended.split(",")]
+
+    # Bootstrap the patient table, with a little noise so rows are not exact duplicates
+    data = train_data.sample(n=rows + max(n_appended), replace=True, random_state=123).reset_index(drop=True)
+    data[numeric_features] += np.random.default_rng(123).normal(0, 0.5, (len(data), len(numeric_features)))
+
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "train.csv")
+        base = data.iloc[:rows]
+        base_search = full_search(base.drop(columns=target), base[target], numeric_features, scorer)
+        for n_new in n_appended:
+            base.to_csv(path, index=False)
+            state = RetrainingState.from_training(path, base.drop(columns=target), base[target],
+                                                  base_search.best_estimator_, CATEGORICAL_FEATURES,
+                                                  numeric_features, seed=123)
+            data.iloc[rows:rows + n_new].to_csv(path, mode="a", header=False, index=False)
+            current = pd.read_csv(path)
+            X, y = current.drop(columns=target), current[target]
+
+            start = time.perf_counter()
+            search = full_search(X, y, numeric_features, scorer)
+            records.append({"rows": len(X), "new_rows": n_new, "route": "full (50 C values)",
+                            "seconds": round(time.perf_counter() - start, 2),
+                            "C": search.best_params_["logisticregression__C"], "cv_f1": search.best_score_})
+
+            start = time.perf_counter()
+            _, search, summary = incremental_retrain(state, path, X, y, scoring=scorer)
+            records.append({"rows": len(X), "new_rows": n_new, "route": "incremental (5 C values, warm start)",
+                            "seconds": round(time.perf_counter() - start, 2),
+                            "C": summary["C"], "cv_f1": search.best_score_})
+            print(records[-2], records[-1], sep="\n")
+
+    table = pd.DataFrame(records).round(4)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
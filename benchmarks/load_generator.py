@@ -0,0 +1,142 @@
+# load_generator.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/load_generator.py --data data/processed/test_df.csv --pipeline results/models/disease_pipeline.pickle --concurrency 1,8,32
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+
+async def _request(reader, writer, method, path, body=b""):
+    """Sends one keep-alive HTTP/1.1 request and returns the status code and decoded JSON body."""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _client(host, port, payloads, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for body in payloads:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, "POST", "/predict", body)
+            if status != 200:
+                raise RuntimeError(f"Request failed with status {status}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, records, n_requests, concurrency, rows_per_request=1):
+    """
+    Sends `n_requests` prediction requests over `concurrency` keep-alive connections
+
+    Returns the client-side p50/p99 latency and throughput, and the service's own /metrics.
+    """
+    payloads = [json.dumps([records[(i * rows_per_request + j) % len(records)]
+                            for j in range(rows_per_request)]).encode()
+                for i in range(n_requests)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, payloads[i::concurrency], latencies) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, metrics = await _request(reader, writer, "GET", "/metrics")
+    writer.close()
+
+    p50, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 99])
+    return {
+        "concurrency": concurrency,
+        "rows_per_request": rows_per_request,
+        "requests": n_requests,
+        "client_p50_ms": p50,
+        "client_p99_ms": p99,
+        "requests_per_sec": n_requests / elapsed,
+        "rows_per_sec": n_requests * rows_per_request / elapsed,
+        "service_p50_ms": metrics["p50_ms"],
+        "service_p99_ms": metrics["p99_ms"],
+        "service_mean_batch_rows": metrics["mean_batch_rows"],
+    }
+
+
+def _wait_until_healthy(host, port, timeout=30):
+    async def check():
+        reader, writer = await asyncio.open_connection(host, port)
+        await _request(reader, writer, "GET", "/health")
+        writer.close()
+
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return asyncio.run(check())
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+@click.command()
+@click.option('--data', type=str, help="CSV of patients to send (the diagnosis column is dropped)", required=True)
+@click.option('--pipeline', type=str, default=None,
+              help="Start scripts/7_serve_model.py with this model pickle for each run instead of using a running service")
+@click.option('--host', type=str, default='127.0.0.1', help="Host of the service")
+@click.option('--port', type=int, default=8000, help="Port of the service")
+@click.option('--requests', 'n_requests', type=int, default=2000, help="Number of requests per run")
+@click.option('--concurrency', type=str, default='1,8,32', help="Comma-separated numbers of concurrent connections")
+@click.option('--rows-per-request', type=int, default=1, help="Number of patients per request")
+@click.option('--max-delay-ms', type=float, default=2.0, help="Batching window of the started service")
+@click.option('--write-to', type=str, default=None, help="Optional CSV file for the results")
+def main(data, pipeline, host, port, n_requests, concurrency, rows_per_request, max_delay_ms, write_to):
+    """Benchmark the prediction service on localhost at several concurrency levels."""
+    features = pd.read_csv(data).drop(columns='Diagnosis of heart disease', errors='ignore')
+    # to_json writes missing values as null and numpy scalars as plain JSON numbers
+    records = json.loads(features.to_json(orient='records'))
+
+    results = []
+    for level in [int(c) for c in concurrency.split(',')]:
+        server = None
+        if pipeline is not None:
+            # A fresh service per run, so its latency counters cover this run only
+            server = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, 'scripts', '7_serve_model.py'), '--pipeline', pipeline,
+                 '--host', host, '--port', str(port), '--max-delay-ms', str(max_delay_ms)],
+                stdout=subprocess.DEVNULL,
+            )
+        try:
+            _wait_until_healthy(host, port)
+            results.append(asyncio.run(run_load(host, port, records, n_requests, level, rows_per_request)))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        print(pd.DataFrame(results[-1:]).round(3).to_string(index=False))
+
+    results = pd.DataFrame(results)
+    if write_to is not None:
+        results.round(3).to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+# parallel_handoff.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/parallel_handoff.py --train data/processed/train_df.csv --rows 1000,10000,100000 --n-jobs 1,2,4
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+import psutil
+from sklearn.compose import make_column_transformer
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import make_scorer, f1_score
+from sklearn.model_selection import RandomizedSearchCV
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.utils import parallel_backend
+from src.class_model_trainer import cross_validate_shared
+
+warnings.filterwarnings("ignore")
+
+CATEGORICAL_FEATURES = [
+    'Sex',
+    'Chest pain type',
+    'Fasting blood sugar > 120 mg/dl',
+    'Resting electrocardiographic results',
+    'Exercise-induced angina',
+    'Slope of the peak exercise ST segment',
+    'Thalassemia'
+]
+
+
+class PeakRSS:
+    """Sample the summed RSS of this process and all of its children in a background thread."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = 0
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            for proc in [process] + process.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak = max(self.peak, total)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def make_preprocessor(X):
+    numeric_features = [col for col in X.columns if col not in CATEGORICAL_FEATURES]
+    return make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy="most_frequent"),
+                       OneHotEncoder(handle_unknown="ignore", drop='if_binary', dtype=int, sparse_output=False)),
+         CATEGORICAL_FEATURES),
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric_features),
+    )
+
+
+def run_pickling_backend(pipeline, X, y, Cs, scorer, n_jobs):
+    """The current script 4 setup: RandomizedSearchCV under the multiprocessing backend."""
+    search = RandomizedSearchCV(pipeline, {'logisticregression__C': Cs}, n_iter=len(Cs), n_jobs=n_jobs,
+                                scoring=scorer, random_state=123, refit=False, return_train_score=True)
+    with PeakRSS() as rss:
+        start = time.perf_counter()
+        with parallel_backend("multiprocessing"):
+            search.fit(X, y)
+        wall = time.perf_counter() - start
+    n_splits = search.n_splits_
+    compute = n_splits * (search.cv_results_["mean_fit_time"] + search.cv_results_["mean_score_time"]).sum()
+    return wall, compute, len(Cs) * n_splits, rss.peak
+
+
+def run_shared_backend(pipeline, preprocessor, X, y, Cs, scorer, n_jobs):
+    """The shared-memory layer: folds encoded once, workers receive indices and parameters."""
+    models = {f"C={C}": make_pipeline(preprocessor, LogisticRegression(**{**pipeline[-1].get_params(), "C": C}))
+              for C in Cs}
+    with tempfile.TemporaryDirectory() as shared_dir, PeakRSS() as rss:
+        start = time.perf_counter()
+        results = cross_validate_shared(models, preprocessor, X, y, scoring={"f1": scorer},
+                                        n_jobs=n_jobs, shared_dir=shared_dir)
+        wall = time.perf_counter() - start
+    compute = sum((fold_scores["fit_time"] + fold_scores["score_time"]).sum() for fold_scores in results.values())
+    return wall, compute, sum(len(fold_scores) for fold_scores in results.values()), rss.peak
+
+
+@click.command()
+@click.option('--train', type=str, default='data/processed/train_df.csv', help="Location of train data file")
+@click.option('--rows', type=str, default='1000,10000,100000', help="Comma-separated row counts to benchmark")
+@click.option('--n-jobs', type=str, default='1,2,4', help="Comma-separated worker counts to benchmark")
+@click.option('--n-candidates', type=int, default=20, help="Number of C values (tasks = candidates x 5 folds)")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(train, rows, n_jobs, n_candidates, write_to):
+    """Compare per-task overhead and peak RSS of pickled vs memory-mapped data handoff."""
+    train_data = pd.read_csv(train)
+    Cs = np.logspace(-3, 3, n_candidates)
+    scorer = make_scorer(f1_score, pos_label='> 50% diameter narrowing')
+
+    records = []
+    for n_rows in [int(value) for value in rows.split(",")]:
+        # Bootstrap the patient table up to the requested size
+        data = train_data.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+        X, y = data.drop(columns='Diagnosis of heart disease'), data[['Diagnosis of heart disease']]
+        preprocessor = make_preprocessor(X)
+        pipeline = make_pipeline(preprocessor, LogisticRegression(max_iter=1000, class_weight="balanced"))
+
+        for workers in [int(value) for value in n_jobs.split(",")]:
+            effective = min(workers, os.cpu_count())
+            for backend, runner in [
+                ("multiprocessing (pickled)", lambda: run_pickling_backend(pipeline, X, y, Cs, scorer, workers)),
+                ("shared memmap", lambda: run_shared_backend(pipeline, preprocessor, X, y, Cs, scorer, workers)),
+            ]:
+                wall, compute, n_tasks, peak = runner()
+                records.append({
+                    "rows": n_rows,
+                    "n_jobs": workers,
+                    "backend": backend,
+                    "tasks": n_tasks,
+                    "wall_s": round(wall, 3),
+                    "overhead_ms_per_task": round(1000 * max(wall * effective - compute, 0) / n_tasks, 2),
+                    "peak_rss_mb": round(peak / 2**20, 1),
+                })
+                print(records[-1])
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# scalable_tier.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/scalable_tier.py --train data/processed/train_df.csv --rows 10000,20000,40000,80000
+
+import os
+import sys
+import time
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.exceptions import ConvergenceWarning
+from src.class_model_trainer import exact_models, scalable_models
+from src.fused_preprocessor import FusedPreprocessor
+
+CATEGORICAL_FEATURES = [
+    'Sex',
+    'Chest pain type',
+    'Fasting blood sugar > 120 mg/dl',
+    'Resting electrocardiographic results',
+    'Exercise-induced angina',
+    'Slope of the peak exercise ST segment',
+    'Thalassemia'
+]
+
+warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+
+@click.command()
+@click.option('--train', type=str, default='data/processed/train_df.csv', help="Location of train data file")
+@click.option('--rows', type=str, default='10000,20000,40000,80000', help="Comma-separated row counts to benchmark")
+@click.option('--max-svc-rows', type=int, default=20000, help="Largest row count the kernel SVC is timed at")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(train, rows, max_svc_rows, write_to):
+    """Time one fit of each model of the exact and scalable tiers on bootstrapped copies of the training data."""
+    train_data = pd.read_csv(train)
+    numeric_features = [col for col in train_data.columns
+                        if col not in CATEGORICAL_FEATURES + ['Diagnosis of heart disease']]
+    preprocessor = FusedPreprocessor(CATEGORICAL_FEATURES, numeric_features)
+
+    records = []
+    for n_rows in [int(value) for value in rows.split(",")]:
+        # Bootstrap the patient table up to the requested size, with a little noise so rows are not exact duplicates
+        data = train_data.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+        X, y = data.drop(columns='Diagnosis of heart disease'), data['Diagnosis of heart disease']
+        X[numeric_features] += np.random.default_rng(123).normal(0, 0.5, (n_rows, len(numeric_features)))
+
+        models = {f"scalable/{name}": model for name, model in scalable_models(preprocessor, seed=123).items()}
+        if n_rows <= max_svc_rows:
+            models["exact/svc"] = exact_models(preprocessor, seed=123)["svc"]
+        for name, model in models.items():
+            start = time.perf_counter()
+            clone(model).fit(X, y)
+            seconds = time.perf_counter() - start
+            records.append({"rows": n_rows, "model": name, "fit_sec": round(seconds, 3),
+                            "us_per_row": round(seconds / n_rows * 1e6, 2)})
+            print(records[-1])
+
+    table = pd.DataFrame(records).pivot(index="model", columns="rows", values="us_per_row")
+    print("Fit time per row (microseconds):")
+    print(table.to_string())
+    if write_to:
+        pd.DataFrame(records).to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
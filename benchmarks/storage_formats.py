@@ -0,0 +1,65 @@
+# storage_formats.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/storage_formats.py --raw-data data/raw/pretransformed_heart_disease.csv --rows 100000,1000000
+
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import pandas as pd
+from src.codebook import read_decoded
+from src.storage import FORMATS, dataset_path, read_dataset, write_dataset
+
+# Columns read by the projected read: one categorical and one measure
+PROJECTION = ['Chest pain type', 'Maximum heart rate achieved']
+
+
+def timed(function, *args, **kwargs):
+    """Return the result of `function` and the seconds it took."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+@click.command()
+@click.option('--raw-data', type=str, default='data/raw/pretransformed_heart_disease.csv',
+              help="Location of the decoded raw data file")
+@click.option('--rows', type=str, default='100000,1000000', help="Comma-separated row counts to benchmark")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(raw_data, rows, write_to):
+    """Compare the write time, file size and full and projected read times of CSV, Parquet and Arrow files."""
+    decoded = read_decoded(raw_data)
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in [int(n) for n in rows.split(",")]:
+            frame = decoded.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+            for format in FORMATS:
+                path = dataset_path(directory, f"heart_{n_rows}", format)
+                _, write_time = timed(write_dataset, frame, path)
+                # CSV files only get the codebook types back by parsing with them
+                read = read_decoded if format == "csv" else read_dataset
+                full, read_time = timed(read, path)
+                _, projected_time = timed(read_dataset, path, columns=PROJECTION)
+                records.append({
+                    "rows": n_rows,
+                    "format": format,
+                    "file_mb": round(os.path.getsize(path) / 2**20, 2),
+                    "write_sec": round(write_time, 3),
+                    "read_sec": round(read_time, 3),
+                    "projected_read_sec": round(projected_time, 3),
+                    "typed": bool((full.dtypes == frame.dtypes).all()),
+                })
+                os.remove(path)
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
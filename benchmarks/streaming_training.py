@@ -0,0 +1,93 @@
+# streaming_training.py
+# author: agent
+# date: 2026-10-17
+# Usage: python benchmarks/streaming_training.py --train data/processed/train_df.csv --rows 50000,200000 --chunk-size 10000
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import click
+import numpy as np
+import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+from src.fused_preprocessor import FusedPreprocessor
+from src.streaming_training import stream_train
+
+CATEGORICAL_FEATURES = [
+    'Sex',
+    'Chest pain type',
+    'Fasting blood sugar > 120 mg/dl',
+    'Resting electrocardiographic results',
+    'Exercise-induced angina',
+    'Slope of the peak exercise ST segment',
+    'Thalassemia'
+]
+
+warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+
+def traced(call):
+    """Wall time and peak traced allocation of `call()`."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    call()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def in_memory(path):
+    """The whole-file route of 4_training_models.py: read the CSV, then fit the logistic-regression pipeline."""
+    data = pd.read_csv(path)
+    X, y = data.drop(columns='Diagnosis of heart disease'), data['Diagnosis of heart disease']
+    numeric_features = [col for col in X.columns if col not in CATEGORICAL_FEATURES]
+    make_pipeline(FusedPreprocessor(CATEGORICAL_FEATURES, numeric_features),
+                  LogisticRegression(max_iter=1000, class_weight="balanced")).fit(X, y)
+
+
+@click.command()
+@click.option('--train', type=str, default='data/processed/train_df.csv', help="Location of train data file")
+@click.option('--rows', type=str, default='50000,200000', help="Comma-separated row counts to benchmark")
+@click.option('--chunk-size', type=int, default=10000, help="Rows per chunk of the streaming route")
+@click.option('--write-to', type=str, default=None, help="Optional CSV path for the benchmark table")
+def main(train, rows, chunk_size, write_to):
+    """Compare the peak memory of whole-file and streaming training as the file grows."""
+    train_data = pd.read_csv(train)
+    numeric_features = [col for col in train_data.columns
+                        if col not in CATEGORICAL_FEATURES + ['Diagnosis of heart disease']]
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rows in [int(value) for value in rows.split(",")]:
+            data = train_data.sample(n=n_rows, replace=True, random_state=123).reset_index(drop=True)
+            data[numeric_features] += np.random.default_rng(123).normal(0, 0.5, (n_rows, len(numeric_features)))
+            path = os.path.join(directory, f"train_{n_rows}.csv")
+            data.to_csv(path, index=False)
+            del data
+
+            routes = {
+                "in-memory": lambda: in_memory(path),
+                f"streaming ({chunk_size} rows/chunk)": lambda: stream_train(
+                    path, CATEGORICAL_FEATURES, chunk_size=chunk_size, class_weight="balanced", n_epochs=1, seed=123),
+            }
+            for name, call in routes.items():
+                seconds, peak = traced(call)
+                records.append({"rows": n_rows, "route": name, "file_mb": round(os.path.getsize(path) / 2**20, 1),
+                                "seconds": round(seconds, 2), "peak_mb": round(peak / 2**20, 1)})
+                print(records[-1])
+
+    table = pd.DataFrame(records)
+    print(table.to_string(index=False))
+    if write_to:
+        table.to_csv(write_to, index=False)
+
+
+if __name__ == '__main__':
+    main()
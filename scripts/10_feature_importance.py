@@ -0,0 +1,74 @@
+# 10_feature_importance.py
+# author: agent
+# date: 2026-10-17
+# Usage: python scripts/10_feature_importance.py --test data/processed/test_df.csv \
+                                # --pipeline results/models/disease_pipeline.pickle \
+                                # --n-repeats 30 --n-jobs -1 \
+                                # --write-to results
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import time
+import pickle
+import click
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from src.feature_importance import permutation_importance_encoded
+from src.data_loader import load_heart_data
+from src.storage import booleans_as_objects
+
+@click.command()
+@click.option('--test', type=str, help="Path to the test data file", required=True)
+@click.option('--pipeline', type=str, help="Path to the model pickle", required=True)
+@click.option('--n-repeats', type=int, default=30, help="Number of permutations of each feature")
+@click.option('--n-jobs', type=int, default=-1, help="Number of worker processes (-1 uses all cores)")
+@click.option('--seed', type=int, default=123, help="Set seed for reproducible permutations")
+@click.option('--write-to', type=str, help="Path to the master directory where outputs will be written", required=True)
+def main(test, pipeline, n_repeats, n_jobs, seed, write_to):
+    """
+    Measure how much the test F1 score of the trained model drops when each feature is shuffled.
+
+    The test set is encoded once and the one-hot columns of each categorical feature are
+    permuted together, so importances are reported per original feature. Saves
+    tables/feature_importance.csv and figures/feature_importance.png.
+    """
+
+    # Check if the model file exists
+    if not os.path.exists(pipeline):
+        raise FileNotFoundError(f"The model file {pipeline} does not exist. Ensure it has been trained and saved.")
+    with open(pipeline, 'rb') as f:
+        best_model = pickle.load(f)
+
+    test_df = booleans_as_objects(load_heart_data(test)[0])
+    X_test = test_df.drop(columns=['Diagnosis of heart disease'])
+    y_test = test_df['Diagnosis of heart disease']
+
+    print(f"Permuting {X_test.shape[1]} features {n_repeats} times each...")
+    start = time.perf_counter()
+    importances = permutation_importance_encoded(
+        best_model, X_test, y_test,
+        scoring="f1", n_repeats=n_repeats, n_jobs=n_jobs, random_state=seed
+    )
+    print(f"Done in {time.perf_counter() - start:.2f}s (baseline test F1: {importances.attrs['baseline_score']:.3f}).")
+
+    os.makedirs(os.path.join(write_to, "tables"), exist_ok=True)
+    os.makedirs(os.path.join(write_to, "figures"), exist_ok=True)
+    importances.round(4).to_csv(os.path.join(write_to, "tables", "feature_importance.csv"), index=False)
+    print(importances[["feature", "importance_mean", "importance_std"]].round(4).to_string(index=False))
+
+    # Box plot of the per-repeat drops, most important feature at the top
+    repeats = importances.filter(like="repeat_").to_numpy()
+    fig, ax = plt.subplots(figsize=(10, 7))
+    ax.boxplot(repeats[::-1].T, vert=False)
+    ax.set_yticklabels(importances["feature"][::-1])
+    ax.axvline(0, color="grey", linestyle="--", linewidth=1)
+    ax.set_xlabel("Decrease in test F1 score when the feature is permuted")
+    ax.set_title(f"Permutation importance ({n_repeats} repeats)")
+    fig.tight_layout()
+    fig.savefig(os.path.join(write_to, "figures", "feature_importance.png"), dpi=300)
+    print(f"Feature importance saved to {write_to}")
+
+if __name__ == '__main__':
+    main()
@@ -16,23 +16,29 @@ from deepchecks.tabular.checks.data_integrity import FeatureFeatureCorrelation
 from sklearn.model_selection import train_test_split
 import warnings
 from src.data_validation import validate_data
+from src.codebook import DIAGNOSIS_CODES, decode_column
+from src.data_loader import format_footprint, load_heart_data
+from src.storage import FORMATS, dataset_path, write_dataset
 
 @click.command()
 @click.option('--split', type=float, help="Proportion of data to use as test data")
 @click.option('--raw-data', type=str, help="Location of pre-processed data file")
 @click.option('--write-to', type=str, help="Path to directory where raw data will be written to")
+@click.option('--seed', type=int, default=None, help="Set seed for a reproducible train-test split")
+@click.option('--chunksize', type=int, default=None, help="Rows read at a time from the raw data file")
+@click.option('--format', type=click.Choice(list(FORMATS)), default='csv',
+              help="Storage format of the train and test files; parquet and arrow keep the column types")
 
-def main(split, raw_data, write_to):
+def main(split, raw_data, write_to, seed, chunksize, format):
     """Validates data and exports two csv files as train test split."""
-    # fetch dataset
-    df = pd.read_csv(raw_data)
+    # fetch dataset, in the compact dtypes of the shared loader
+    df, footprint = load_heart_data(raw_data, chunksize=chunksize)
+    print(f"Raw data in memory: {format_footprint(footprint)}")
 
-    # Initial data cleaning
+    # Initial data cleaning: binarize the diagnosis, dropping the codes it does not cover
     print("Processing and validating data...")
-    df = df[df['Diagnosis of heart disease'] <= 3]
-    df['Diagnosis of heart disease'] = df['Diagnosis of heart disease'].replace(
-        {0: '< 50% diameter narrowing', 1: '> 50% diameter narrowing',
-         2: '> 50% diameter narrowing', 3: '> 50% diameter narrowing'})
+    df['Diagnosis of heart disease'] = decode_column(df['Diagnosis of heart disease'], DIAGNOSIS_CODES)
+    df = df[df['Diagnosis of heart disease'].notna()]
 
     
     # Validate data using function 
@@ -42,7 +48,7 @@ def main(split, raw_data, write_to):
     df = validate_data(df)
 
     # Train-test split
-    train_df, test_df = train_test_split(df, test_size=split)
+    train_df, test_df = train_test_split(df, test_size=split, random_state=seed)
 
     #verify correlations - Feature-target:
     train_ds = Dataset(train_df, label="Diagnosis of heart disease", cat_features=['Sex','Chest pain type',
@@ -70,9 +76,9 @@ def main(split, raw_data, write_to):
     check = FeatureDrift()
     result = check.run(train_dataset=train_ds, test_dataset=test_ds)    
 
-    # Save the DataFrame to a CSV file
-    train_df.to_csv(os.path.join(write_to, "train_df.csv"), index=False)
-    test_df.to_csv(os.path.join(write_to, "test_df.csv"), index=False)
+    # Save the train and test sets
+    write_dataset(train_df, dataset_path(write_to, "train_df", format))
+    write_dataset(test_df, dataset_path(write_to, "test_df", format))
 
     print("Data processed and validated.")
 
@@ -10,19 +10,20 @@ import os
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
 if src_path not in sys.path:
     sys.path.append(src_path)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 import warnings
 from altair.utils.deprecation import AltairDeprecationWarning
 # Suppress 
 warnings.filterwarnings("ignore", category=AltairDeprecationWarning)
 
 import click
-import pandas as pd
 from eda_utils import (
     create_numeric_distributions,
     create_categorical_distributions,
     create_correlation_heatmap,
     save_high_correlations
 )
+from src.data_loader import format_footprint, load_heart_data
 
 
 @click.command()
@@ -48,7 +49,8 @@ def main(train, write_to):
     print("Generating EDA outputs...")
     
     # Load data
-    train_df = pd.read_csv(train)
+    train_df, footprint = load_heart_data(train)
+    print(f"Train data in memory: {format_footprint(footprint)}")
 
     # Define numeric and categorical columns
     numeric_columns = [
@@ -7,6 +7,8 @@ import numpy as np
 import pandas as pd 
 import matplotlib.pyplot as plt
 import pickle
+import tempfile
+import time
 import warnings
 import os
 import sys
@@ -14,7 +16,6 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 import click
 
 from sklearn.exceptions import UndefinedMetricWarning
-from sklearn.utils import parallel_backend
 from sklearn.metrics import ConfusionMatrixDisplay
 from sklearn.compose import make_column_transformer
 from sklearn.pipeline import make_pipeline
@@ -22,10 +23,18 @@ from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.svm import SVC
 from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import RandomizedSearchCV, cross_validate, train_test_split
+from sklearn.model_selection import cross_validate, train_test_split
 from sklearn.dummy import DummyClassifier
 from sklearn.metrics import (make_scorer, precision_score, recall_score, f1_score)
 from src.class_model_trainer import class_model_trainer
+from src.model_tuning import (RegularizationPathSearchCV, ResumableRandomizedSearchCV, budgeted_halving_search,
+                              summarize_budget)
+from src.compiled_scorer import export_scorer
+from src.fused_preprocessor import FusedPreprocessor
+from src.compact_features import make_compact, feature_memory_report
+from src.incremental_retraining import RetrainingState, incremental_retrain
+from src.data_loader import format_footprint, load_heart_data
+from src.storage import booleans_as_objects
 
 # Suppress UndefinedMetricWarning when calculating precision for Dummy
 warnings.filterwarnings("ignore", category=UndefinedMetricWarning)
@@ -34,12 +43,75 @@ warnings.filterwarnings("ignore", category=UndefinedMetricWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
 
+def save_best_model(best_model, tuning_results, write_to):
+    """Save the tuning scores, the best pipeline and its compiled scorer."""
+    # Save the per-candidate tuning scores
+    tuning_results.to_csv(os.path.join(write_to, "tables", "tuning_results.csv"), index=False)
+ 
+    # Save the best model
+    with open(os.path.join(write_to, "models", "disease_pipeline.pickle"), 'wb') as f:
+        pickle.dump(best_model, f)
+    print("Best model saved.")
+
+    # Export the best model as a NumPy-only scorer (imputation values, category maps,
+    # scaler parameters and coefficients) that predicts without importing sklearn
+    export_scorer(best_model, os.path.join(write_to, "models", "disease_scorer.json"))
+    print("Compiled scorer saved.")
+
+
+RETRAINING_COLUMNS = ["mode", "previous_rows", "new_rows", "rows", "previous_C", "C",
+                      "statistics_seconds", "search_seconds", "refit_seconds", "total_seconds"]
+
+
+def record_retraining(record, write_to):
+    """
+    Record one training run in the retraining history table.
+
+    A full run starts the table over, so it holds the last full run followed by the
+    incremental runs since, and repeated full builds leave the same file.
+    """
+    path = os.path.join(write_to, "tables", "retraining.csv")
+    row = pd.DataFrame([record], columns=RETRAINING_COLUMNS).round(4)
+    append = record["mode"] != "full" and os.path.exists(path)
+    row.to_csv(path, mode='a' if append else 'w', header=not append, index=False)
+    print(row.to_string(index=False))
+
+
 @click.command()
 @click.option('--train', type=str, help="Location of train data file")
 @click.option('--seed', type =int, help="Set seed for reproducibility")
 @click.option('--write-to', type=str, help="Path to master directory where outputs will be written")
+@click.option('--n-jobs', type=int, default=-1, help="Number of parallel workers for training and tuning (-1 uses all cores)")
+@click.option('--tuning', type=click.Choice(['path', 'random', 'halving']), default='random', 
+              help="Tune logreg_bal C with RandomizedSearchCV ('random'), a faster warm-started regularization path "
+                   "('path'; scores may differ slightly from cold fits, and ties go to the smallest C), "
+                   "or tune every model with budgeted successive halving ('halving')")
+@click.option('--budget', type=float, default=None, help="Halving budget in seconds shared by all models (default: no limit)")
+@click.option('--budget-type', type=click.Choice(['wall', 'cpu']), default='wall', help="Whether --budget counts wall-clock or CPU seconds")
+@click.option('--share-data/--no-share-data', default=True, 
+              help="Hand encoded folds to workers through memory-mapped files instead of pickling them per task")
+@click.option('--cache-dir', type=str, default=None, 
+              help="Persistent directory for the encoded fold matrices, reused across runs (default: a temporary directory)")
+@click.option('--preprocessor', 'preprocessor_type', type=click.Choice(['composite', 'fused']), default='composite', 
+              help="Preprocess with the ColumnTransformer of imputer/encoder/scaler pipelines ('composite') "
+                   "or the equivalent single-pass FusedPreprocessor ('fused')")
+@click.option('--tier', type=click.Choice(['auto', 'exact', 'scalable']), default='auto', 
+              help="Candidate models: kernel SVC ('exact'), linear SVM and Nystroem approximations ('scalable'), "
+                   "or 'exact' up to --max-kernel-rows rows and 'scalable' above ('auto')")
+@click.option('--max-kernel-rows', type=int, default=50000, help="Row count above which --tier auto switches to the scalable tier")
+@click.option('--compact-features/--no-compact-features', default=False, 
+              help="Keep one-hot blocks sparse and numeric blocks float32 through training and tuning, "
+                   "densifying only for estimators that require it")
+@click.option('--incremental/--no-incremental', default=False, 
+              help="If rows were only appended to --train since the last run, update the preprocessing statistics "
+                   "with the new rows and re-search C near the previous optimum from the saved coefficients; "
+                   "otherwise train from scratch")
+@click.option('--checkpoint-dir', type=str, default=None, 
+              help="Append every candidate x fold tuning result to a checkpoint in this directory, so an interrupted "
+                   "'path' or 'random' search resumes where it stopped when rerun on the same data")
 
-def main(train, seed, write_to):
+def main(train, seed, write_to, n_jobs, tuning, budget, budget_type, share_data, cache_dir, preprocessor_type,
+         compact_features, tier, max_kernel_rows, incremental, checkpoint_dir):
     
     # Ensure necessary directories exist
     os.makedirs(os.path.join(write_to, "tables"), exist_ok=True)
@@ -48,7 +120,9 @@ def main(train, seed, write_to):
 
     print("Loading train data...")
     # Load train data
-    train_data = pd.read_csv(train)
+    train_data, footprint = load_heart_data(train)
+    print(f"Train data in memory: {format_footprint(footprint)}")
+    train_data = booleans_as_objects(train_data)
 
     # Split data into features and labels
     X_train, y_train = train_data.drop(columns='Diagnosis of heart disease'), train_data[['Diagnosis of heart disease']]
@@ -63,7 +137,7 @@ def main(train, seed, write_to):
         'Slope of the peak exercise ST segment', 
         'Thalassemia'
     ]
-    numeric_features = list(set(X_train.columns) - set(categorical_features))
+    numeric_features = [col for col in X_train.columns if col not in categorical_features]
     
     categorical_transformer = make_pipeline(
         SimpleImputer(strategy="most_frequent"),
@@ -73,10 +147,17 @@ def main(train, seed, write_to):
         SimpleImputer(strategy="median"),
         StandardScaler(),
     )
-    preprocessor = make_column_transformer(
-        (categorical_transformer, categorical_features),
-        (numeric_transformer, numeric_features),
-    )
+    if preprocessor_type == 'fused':
+        # Same imputation, encoding and scaling, written in one pass into one output array
+        preprocessor = FusedPreprocessor(categorical_features, numeric_features)
+    else:
+        preprocessor = make_column_transformer(
+            (categorical_transformer, categorical_features),
+            (numeric_transformer, numeric_features),
+        )
+    if compact_features:
+        # Sparse float32 one-hot columns and float32 numeric columns instead of one dense float64 matrix
+        preprocessor = make_compact(preprocessor)
 
     # 2. CLASSIFICATION METRICS
     classification_metrics = {
@@ -86,32 +167,104 @@ def main(train, seed, write_to):
         "f1": make_scorer(f1_score, pos_label='> 50% diameter narrowing'),
     }
     
-    print("Training models...")
-    # 3. Training models
-    models = class_model_trainer(preprocessor, X_train, y_train, pos_lable = '> 50% diameter narrowing', 
-                        seed=seed, write_to=write_to, 
-                        cv = 5, metrics = classification_metrics)
-
-    print("Tuning model...")
-    # 4. HYPERPARAMETER OPTIMIZATION
-    param_distributions = {'logisticregression__C': np.logspace(-5, 5, 50)}
+    # Encoded folds are written once to memory-mapped files in this directory, so
+    # parallel workers receive fold indices instead of pickled copies of the data.
+    # Entries are keyed by the data and preprocessor, so training and tuning share them.
+    shared_tmp = tempfile.TemporaryDirectory() if share_data and cache_dir is None else None
+    shared_dir = (cache_dir or shared_tmp.name) if share_data else None
     custom_scorer = make_scorer(f1_score, pos_label='> 50% diameter narrowing')
-    random_search = RandomizedSearchCV(
-        models['logreg_bal'], 
-        param_distributions=param_distributions,
-        n_iter=100, n_jobs=-1, scoring=custom_scorer, random_state=123,
-        return_train_score=True
-    )
-    
-    with parallel_backend("multiprocessing"):
-      with warnings.catch_warnings():
-        random_search.fit(X_train, y_train)
-    best_model = random_search.best_estimator_
- 
-    # Save the best model
-    with open(os.path.join(write_to, "models", "disease_pipeline.pickle"), 'wb') as f:
-        pickle.dump(best_model, f)
-    print("Best model saved.")
-    
+
+    try:
+        # Fingerprint of the training file, statistics and coefficients of the last run
+        state_path = os.path.join(write_to, "models", "retraining_state.pickle")
+        state = RetrainingState.load(state_path) if incremental and os.path.exists(state_path) else None
+        new_rows = state.new_rows(train, len(X_train)) if state is not None else None
+        if state is not None and new_rows == 0:
+            print("No rows were appended since the last run; nothing to retrain.")
+            return
+        if state is not None and new_rows is not None:
+            print(f"Retraining incrementally on {new_rows} appended rows...")
+            with warnings.catch_warnings():
+                best_model, search, summary = incremental_retrain(
+                    state, train, X_train, y_train, scoring=custom_scorer, n_jobs=n_jobs, shared_dir=shared_dir
+                )
+            save_best_model(best_model, pd.DataFrame(search.cv_results_), write_to)
+            state.save(state_path)
+            record_retraining({"mode": "incremental", **summary,
+                               "total_seconds": summary["statistics_seconds"] + summary["search_seconds"]
+                                                + summary["refit_seconds"]}, write_to)
+            return
+        if incremental:
+            print("The training file was not only appended to since the last run, or no run was recorded; training from scratch.")
+
+        start = time.perf_counter()
+        print("Training models...")
+        # 3. Training models
+        models = class_model_trainer(preprocessor, X_train, y_train, pos_lable = '> 50% diameter narrowing', 
+                            seed=seed, write_to=write_to, 
+                            cv = 5, metrics = classification_metrics, n_jobs = n_jobs,
+                            shared_dir = shared_dir, tier = tier, max_kernel_rows = max_kernel_rows)
+
+        # Memory held by the feature matrix at each stage, to compare dense and compact runs
+        memory_report = feature_memory_report(preprocessor, models, X_train, y_train, n_folds=5)
+        memory_report.round(4).to_csv(os.path.join(write_to, "tables", "feature_memory.csv"), index=False)
+        print(memory_report.round(4).to_string(index=False))
+
+        print("Tuning model...")
+        # 4. HYPERPARAMETER OPTIMIZATION
+        # Tuning reuses the encoded folds and fold assignment of the training step above
+        param_distributions = {'logisticregression__C': np.logspace(-5, 5, 50)}
+        if tuning == 'halving':
+            with warnings.catch_warnings():
+                tuned_models, tuning_results = budgeted_halving_search(
+                    models, preprocessor, X_train, y_train, scoring=custom_scorer,
+                    budget=budget, budget_type=budget_type, n_jobs=n_jobs, seed=seed, folds=models.folds
+                )
+            best_model = tuned_models['logreg_bal']
+
+            # Save the budget used by each halving candidate
+            summarize_budget(tuning_results).to_csv(
+                os.path.join(write_to, "tables", "tuning_budget.csv"), index=False
+            )
+        else:
+            if tuning == 'path':
+                search = RegularizationPathSearchCV(
+                    models['logreg_bal'],
+                    Cs=param_distributions['logisticregression__C'],
+                    n_jobs=n_jobs, scoring=custom_scorer,
+                    return_train_score=True, folds=models.folds, checkpoint_dir=checkpoint_dir
+                )
+                with warnings.catch_warnings():
+                    search.fit(X_train, y_train)
+            else:
+                # Same candidates and folds as RandomizedSearchCV, fitted on the encoded folds of the
+                # training step, so workers receive fold handles instead of pickled copies of X_train;
+                # with --checkpoint-dir each finished fit is checkpointed
+                search = ResumableRandomizedSearchCV(
+                    models['logreg_bal'],
+                    param_distributions=param_distributions,
+                    n_iter=100, n_jobs=n_jobs, scoring=custom_scorer, random_state=123,
+                    return_train_score=True, checkpoint_dir=checkpoint_dir, folds=models.folds
+                )
+                with warnings.catch_warnings():
+                    search.fit(X_train, y_train)
+            best_model = search.best_estimator_
+            tuning_results = pd.DataFrame(search.cv_results_)
+
+        total_seconds = time.perf_counter() - start
+
+        save_best_model(best_model, tuning_results, write_to)
+
+        # Record what a later --incremental run starts from
+        RetrainingState.from_training(train, X_train, y_train, best_model, categorical_features, numeric_features,
+                                      seed=seed).save(state_path)
+        record_retraining({"mode": "full", "previous_rows": 0, "new_rows": len(X_train), "rows": len(X_train),
+                           "C": best_model[-1].C, "total_seconds": total_seconds}, write_to)
+    finally:
+        # Also on errors, so the encoded folds never outlive the run
+        if shared_tmp is not None:
+            shared_tmp.cleanup()
+
+
 if __name__ == '__main__':
     main()
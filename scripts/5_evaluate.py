@@ -10,17 +10,30 @@ import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 import pandas as pd
+from scipy import sparse
 import pickle
 import click
-from sklearn.metrics import ConfusionMatrixDisplay, f1_score, recall_score
+from sklearn.metrics import ConfusionMatrixDisplay
 from src.model_eval import eval_model
+from src.threshold_tuning import out_of_fold_scores, threshold_curve, select_threshold, ThresholdClassifier
+from src.feature_cache import encode_cached
+from src.data_loader import format_footprint, load_heart_data
+from src.storage import booleans_as_objects
 
 @click.command()
 @click.option('--train', type=str, help="Location of train data file")
 @click.option('--test', type=str, help="Path to the test data file", required=True)
 @click.option('--pipeline', type=str, help="Path to the model pickle", required=True)
 @click.option('--write-to', type=str, help="Path to the master directory where outputs will be written", required=True)
-def main(train, test, pipeline, write_to):
+@click.option('--cache-dir', type=str, default=None, 
+              help="Directory for memory-mapped encoded train/test matrices, reused while the data and model are unchanged")
+@click.option('--metrics', type=str, default='f1,recall,accuracy', 
+              help="Comma-separated metrics to report (f1, recall, accuracy, precision, specificity, npv, balanced_accuracy)")
+@click.option('--n-bootstrap', type=int, default=10000, help="Number of bootstrap resamples for metric confidence intervals (0 disables them)")
+@click.option('--seed', type=int, default=123, help="Set seed for reproducible bootstrap intervals")
+@click.option('--target-recall', type=float, default=None, 
+              help="Tune the decision threshold on out-of-fold train scores to reach this recall, and save the thresholded pipeline")
+def main(train, test, pipeline, write_to, cache_dir, metrics, n_bootstrap, seed, target_recall):
     """
     Evaluate a trained model on test data and save evaluation metrics and confusion matrix.
 
@@ -36,28 +49,69 @@ def main(train, test, pipeline, write_to):
     if not os.path.exists(pipeline):
         raise FileNotFoundError(f"The model file {pipeline} does not exist. Ensure it has been trained and saved.")
 
-    # Load train and test data
-    train_data = pd.read_csv(train)
-    test_data = pd.read_csv(test)
-
-    # Split data into features and labels
-    X_train, y_train = train_data.drop(columns='Diagnosis of heart disease'), train_data[['Diagnosis of heart disease']]
-    X_test, y_test = test_data.drop(columns='Diagnosis of heart disease'), test_data[['Diagnosis of heart disease']]
-
     # Load the saved best model
     print(f"Loading model from: {pipeline}")
     with open(pipeline, 'rb') as f:
         best_model = pickle.load(f)
     print(f"Model loaded successfully.")
+    full_pipeline = best_model
+
+    if cache_dir is not None:
+        # Open the encoded matrices from the feature cache (encoding them on a miss) and
+        # evaluate the final estimator on them instead of re-running the preprocessor
+        preprocessor, best_model = best_model[:-1], best_model[-1]
+        X_train, y_train = encode_cached(preprocessor, train, cache_dir)
+        X_test, y_test = encode_cached(preprocessor, test, cache_dir)
+        # Sparse matrices (from a compact preprocessor) stay sparse inside the frames
+        X_train, X_test = [pd.DataFrame.sparse.from_spmatrix(X) if sparse.issparse(X) else pd.DataFrame(X)
+                           for X in (X_train, X_test)]
+        y_train = pd.DataFrame({'Diagnosis of heart disease': y_train})
+        y_test = pd.DataFrame({'Diagnosis of heart disease': y_test})
+    else:
+        # Load train and test data
+        train_data, train_footprint = load_heart_data(train)
+        test_data, test_footprint = load_heart_data(test)
+        print(f"Train data in memory: {format_footprint(train_footprint)}")
+        print(f"Test data in memory: {format_footprint(test_footprint)}")
+        train_data, test_data = booleans_as_objects(train_data), booleans_as_objects(test_data)
+
+        # Split data into features and labels
+        X_train, y_train = train_data.drop(columns='Diagnosis of heart disease'), train_data[['Diagnosis of heart disease']]
+        X_test, y_test = test_data.drop(columns='Diagnosis of heart disease'), test_data[['Diagnosis of heart disease']]
+
+    if target_recall is not None:
+        # Score every train row with a model that did not see it, sweep all thresholds from
+        # one sort of those scores, and keep the most precise one that reaches the target recall
+        if cache_dir is not None:
+            # The cached matrices were encoded by a preprocessor fitted on every train row, so
+            # refit the full pipeline per fold on the raw rows to keep the scores out-of-fold
+            train_data = booleans_as_objects(load_heart_data(train)[0])
+            oof_scores = out_of_fold_scores(full_pipeline, train_data.drop(columns='Diagnosis of heart disease'),
+                                            train_data[['Diagnosis of heart disease']])
+        else:
+            oof_scores = out_of_fold_scores(best_model, X_train, y_train)
+        curve = threshold_curve(y_train, oof_scores)
+        chosen = select_threshold(curve, target_recall)
+        curve.round(3).to_csv(os.path.join(write_to, "tables", "threshold_curve.csv"), index=False)
+        print(f"Threshold {chosen['threshold']:.4f}: recall {chosen['recall']:.3f}, precision {chosen['precision']:.3f} (out-of-fold)")
+
+        # Save the threshold together with the full pipeline for inference, and evaluate with it
+        os.makedirs(os.path.join(write_to, "models"), exist_ok=True)
+        with open(os.path.join(write_to, "models", "disease_pipeline_thresholded.pickle"), 'wb') as f:
+            pickle.dump(ThresholdClassifier(full_pipeline, chosen['threshold']), f)
+        best_model = ThresholdClassifier(best_model, chosen['threshold'])
 
-    # Evaluate the model
-    metrics_df = eval_model(best_model,X_train, y_train, X_test, y_test)
+    # Evaluate the model (one prediction pass per split)
+    metrics_df, confusion = eval_model(best_model, X_train, y_train, X_test, y_test, 
+                                       metrics=metrics.split(','), return_confusion=True,
+                                       n_bootstrap=n_bootstrap, random_state=seed)
 
     #Save model score to csv
     metrics_df.to_csv(os.path.join(write_to, "tables", "model_metrics.csv"), index=False)
 
-    # Save confusion matrix
-    confmat = ConfusionMatrixDisplay.from_estimator(best_model, X_test, y_test, values_format="d")
+    # Save confusion matrix, reusing the test predictions from the evaluation
+    test_confusion, labels = confusion['Test']
+    confmat = ConfusionMatrixDisplay(test_confusion, display_labels=labels).plot(values_format="d")
     confmat.figure_.set_size_inches(10, 7)  # Set custom figure size
     confmat.figure_.tight_layout()
     confmat.figure_.savefig(
@@ -0,0 +1,44 @@
+# 6_batch_score.py
+# author: agent
+# date: 2026-10-17
+# Usage: python scripts/6_batch_score.py --data data/processed/test_df.csv \
+                                # --pipeline results/models/disease_pipeline.pickle \
+                                # --write-to results/tables/test_predictions.csv
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import click
+from src.batch_scoring import score_file
+
+@click.command()
+@click.option('--data', type=str, help="Path to the patient CSV, Parquet or Arrow file to score", required=True)
+@click.option('--pipeline', type=str, help="Path to the model pickle", required=True)
+@click.option('--write-to', type=str, help="Path to the CSV, Parquet or Arrow file the predictions are written to", required=True)
+@click.option('--chunk-size', type=int, default=10000, help="Number of rows read and scored at a time")
+@click.option('--n-jobs', type=int, default=1, help="Number of worker processes scoring chunks (-1 uses all cores)")
+def main(data, pipeline, write_to, chunk_size, n_jobs):
+    """
+    Score a patient file with a trained model in fixed-size chunks and write one prediction and score per row.
+
+    Usage:
+    python scripts/6_batch_score.py --data data/processed/test_df.csv \
+                                --pipeline results/models/disease_pipeline.pickle \
+                                --write-to results/tables/test_predictions.csv
+
+    """
+
+    # Check if the model file exists
+    if not os.path.exists(pipeline):
+        raise FileNotFoundError(f"The model file {pipeline} does not exist. Ensure it has been trained and saved.")
+
+    if os.path.dirname(write_to):
+        os.makedirs(os.path.dirname(write_to), exist_ok=True)
+
+    stats = score_file(pipeline, data, write_to, chunk_size=chunk_size, n_jobs=n_jobs)
+    print(f"Scored {stats['rows']} rows in {stats['chunks']} chunks in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec). Predictions saved to: {write_to}")
+
+
+if __name__ == '__main__':
+    main()
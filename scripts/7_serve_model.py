@@ -0,0 +1,48 @@
+# 7_serve_model.py
+# author: agent
+# date: 2026-10-17
+# Usage: python scripts/7_serve_model.py --pipeline results/models/disease_pipeline.pickle --port 8000
+
+import asyncio
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import click
+from src.prediction_service import PredictionService
+
+@click.command()
+@click.option('--pipeline', type=str, help="Path to the model pickle", required=True)
+@click.option('--host', type=str, default='127.0.0.1', help="Interface to listen on")
+@click.option('--port', type=int, default=8000, help="Port to listen on")
+@click.option('--max-delay-ms', type=float, default=2.0, 
+              help="Micro-batching window: requests arriving within it are predicted together")
+@click.option('--max-batch-rows', type=int, default=256, help="Number of rows that closes a micro-batch early")
+@click.option('--max-body-bytes', type=int, default=2**20, help="Largest request body accepted (larger ones get 413)")
+def main(pipeline, host, port, max_delay_ms, max_batch_rows, max_body_bytes):
+    """
+    Serve a trained model over HTTP, loading it once and predicting concurrent requests in micro-batches.
+
+    POST /predict with a JSON object (or list of objects) of patient features; GET /metrics for
+    p50/p99 latency and throughput counters; GET /health.
+
+    Usage:
+    python scripts/7_serve_model.py --pipeline results/models/disease_pipeline.pickle --port 8000
+
+    """
+
+    # Check if the model file exists
+    if not os.path.exists(pipeline):
+        raise FileNotFoundError(f"The model file {pipeline} does not exist. Ensure it has been trained and saved.")
+
+    service = PredictionService.from_pickle(pipeline, host=host, port=port,
+                                            max_delay=max_delay_ms / 1000, max_batch_rows=max_batch_rows,
+                                            max_body_bytes=max_body_bytes)
+    print(f"Serving {pipeline} on http://{host}:{port} (batching window {max_delay_ms} ms)")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("Service stopped.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# 8_stream_train.py
+# author: agent
+# date: 2026-10-17
+# Usage: python scripts/8_stream_train.py --train data/processed/train_df.csv --seed 123 --write-to results
+#        python scripts/5_evaluate.py ... --pipeline results/models/disease_pipeline_streaming.pickle
+
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import pickle
+import warnings
+import click
+import pandas as pd
+from sklearn.exceptions import ConvergenceWarning
+from src.streaming_training import stream_train
+from src.compiled_scorer import export_scorer
+
+# partial_fit runs one epoch per call and always reports that it has not converged
+warnings.filterwarnings("ignore", category=ConvergenceWarning)
+
+CATEGORICAL_FEATURES = [
+    'Sex', 
+    'Chest pain type', 
+    'Fasting blood sugar > 120 mg/dl', 
+    'Resting electrocardiographic results', 
+    'Exercise-induced angina', 
+    'Slope of the peak exercise ST segment', 
+    'Thalassemia'
+]
+
+
+@click.command()
+@click.option('--train', type=str, help="Location of the train CSV, Parquet or Arrow file", required=True)
+@click.option('--seed', type=int, default=None, help="Set seed for reproducibility")
+@click.option('--write-to', type=str, help="Path to master directory where outputs will be written", required=True)
+@click.option('--chunk-size', type=int, default=10000, help="Number of rows held in memory at a time")
+@click.option('--epochs', type=int, default=5, help="Number of partial_fit passes over the file")
+@click.option('--C', 'C', type=float, default=1.0, help="Inverse regularization strength, as in LogisticRegression")
+@click.option('--balanced/--no-balanced', default=True, help="Weight classes inversely to their frequency")
+def main(train, seed, write_to, chunk_size, epochs, C, balanced):
+    """
+    Train the logistic-regression pipeline from a file too large for memory, one chunk at a time.
+
+    The imputation and scaling statistics are gathered in a first pass, then a logistic
+    regression is fitted with partial_fit over `--epochs` further passes. The pipeline is
+    saved as models/disease_pipeline_streaming.pickle, which 5_evaluate.py accepts.
+    """
+    os.makedirs(os.path.join(write_to, "tables"), exist_ok=True)
+    os.makedirs(os.path.join(write_to, "models"), exist_ok=True)
+    os.makedirs(os.path.join(write_to, "figures"), exist_ok=True)
+
+    print("Training from chunks...")
+    pipeline, summary = stream_train(train, CATEGORICAL_FEATURES, chunk_size=chunk_size, C=C,
+                                     class_weight="balanced" if balanced else None, n_epochs=epochs, seed=seed)
+    pd.DataFrame([summary]).round(3).to_csv(os.path.join(write_to, "tables", "streaming_training.csv"), index=False)
+    print(f"Trained on {summary['rows']} rows in {summary['chunks']} chunks x {summary['epochs']} epochs "
+          f"({summary['statistics_seconds'] + summary['training_seconds']:.2f}s).")
+
+    with open(os.path.join(write_to, "models", "disease_pipeline_streaming.pickle"), 'wb') as f:
+        pickle.dump(pipeline, f)
+    export_scorer(pipeline, os.path.join(write_to, "models", "disease_scorer_streaming.json"))
+    print("Streaming model saved.")
+
+
+if __name__ == '__main__':
+    main()
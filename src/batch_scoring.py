@@ -0,0 +1,150 @@
+# batch_scoring.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from src.data_validation import COLUMNS
+from src.storage import DatasetWriter, booleans_as_objects, iter_dataset, storage_format
+from src.threshold_tuning import positive_scores
+
+# CSV dtypes of the declared columns; booleans are left to the parser, which reads them as
+# True/False (objects once a value is missing) rather than as the strings a text dtype gives
+_CSV_DTYPES = {name: ("object" if kind is str else "float64") for name, (kind, _, _) in COLUMNS.items() if kind is not bool}
+
+# The model is unpickled once per worker process and kept here between chunks
+_worker_model = None
+
+
+def iter_chunks(path, chunk_size=10000, target='Diagnosis of heart disease'):
+    """
+    Reads a CSV, Parquet or Arrow file as a sequence of data frames of at most `chunk_size` rows
+
+    For CSV files the column types are pinned from the declared schema (`src.data_validation.COLUMNS`:
+    text columns are read as text, numeric columns as float), so a chunk with, say, a missing value in
+    an integer column or only missing values in a text column is encoded exactly as it would be in a
+    whole-file read. Parquet and Arrow
+    files keep their stored column types, and missing text values are read as NaN, as in CSV files.
+
+    Parameters
+    ----------
+    path : str
+        The CSV, Parquet (.parquet, .pq) or Arrow (.arrow, .feather) file to read
+
+    chunk_size : int
+        The maximum number of rows per chunk
+
+    target : str or None
+        The label column, dropped from each chunk if present (None keeps every column)
+
+    Returns
+    -------
+    generator of pandas.DataFrame
+        The chunks, in file order
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    if storage_format(path) != "csv":
+        chunks = map(booleans_as_objects, iter_dataset(path, chunk_size))
+    else:
+        chunks = pd.read_csv(path, chunksize=chunk_size, dtype=_CSV_DTYPES)
+    for chunk in chunks:
+        yield chunk if target is None else chunk.drop(columns=target, errors="ignore")
+
+
+def _load_worker_model(pipeline_path):
+    global _worker_model
+    with open(pipeline_path, "rb") as f:
+        _worker_model = pickle.load(f)
+
+
+def _score_chunk(chunk, pos_label):
+    """Predicts one chunk with the worker's model, returning the predictions and positive-class scores."""
+    return pd.DataFrame({
+        "prediction": _worker_model.predict(chunk),
+        "score": positive_scores(_worker_model, chunk, pos_label),
+    })
+
+
+def score_file(pipeline_path, data_path, output_path, chunk_size=10000, n_jobs=1,
+               pos_label='> 50% diameter narrowing', target='Diagnosis of heart disease'):
+    """
+    Scores a CSV, Parquet or Arrow file with a pickled model in fixed-size chunks, writing predictions as it goes
+
+    At most `2 * n_jobs` chunks are read ahead of the writer, so memory stays bounded by the chunk size
+    rather than the file size. Chunks are written back in input order, and each row's prediction is the
+    one `model.predict` gives for it.
+
+    Parameters
+    ----------
+    pipeline_path : str
+        The pickled model, e.g. results/models/disease_pipeline.pickle
+
+    data_path : str
+        The CSV, Parquet or Arrow file to score
+
+    output_path : str
+        The CSV, Parquet or Arrow file to write, with one `prediction` and one `score` column per input row
+
+    chunk_size : int
+        The number of rows scored per task
+
+    n_jobs : int
+        The number of worker processes (1 scores in this process; -1 uses all cores)
+
+    pos_label : str
+        The class whose score is reported
+
+    target : str
+        The label column, ignored if present in the input
+
+    Returns
+    -------
+    dict
+        The number of rows and chunks scored, the elapsed seconds, and the rows scored per second
+    """
+    if n_jobs is None or n_jobs == 0:
+        n_jobs = 1
+    elif n_jobs < 0:
+        n_jobs = max(os.cpu_count() + 1 + n_jobs, 1)
+
+    writer = DatasetWriter(output_path, columns=["prediction", "score"])
+    n_rows, n_chunks = 0, 0
+    start = time.perf_counter()
+    try:
+        if n_jobs == 1:
+            _load_worker_model(pipeline_path)
+            for chunk in iter_chunks(data_path, chunk_size, target):
+                writer.write(_score_chunk(chunk, pos_label))
+                n_rows, n_chunks = n_rows + len(chunk), n_chunks + 1
+        else:
+            with ProcessPoolExecutor(n_jobs, initializer=_load_worker_model, initargs=(pipeline_path,)) as pool:
+                pending = deque()
+                for chunk in iter_chunks(data_path, chunk_size, target):
+                    pending.append((len(chunk), pool.submit(_score_chunk, chunk, pos_label)))
+                    # Wait for the oldest chunk before reading further ahead
+                    while len(pending) >= 2 * n_jobs:
+                        size, future = pending.popleft()
+                        writer.write(future.result())
+                        n_rows, n_chunks = n_rows + size, n_chunks + 1
+                while pending:
+                    size, future = pending.popleft()
+                    writer.write(future.result())
+                    n_rows, n_chunks = n_rows + size, n_chunks + 1
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rows": n_rows,
+        "chunks": n_chunks,
+        "seconds": elapsed,
+        "rows_per_sec": n_rows / elapsed if elapsed > 0 else np.inf,
+    }
@@ -5,28 +5,351 @@
 
 # Core Libraries
 import os  # For file path operations
+import time  # For timing fits and scoring
 
 # Data Manipulation
+import numpy as np  # For index and label arrays
 import pandas as pd  # For handling DataFrame operations
+from joblib import Parallel, delayed  # For fanning model x fold jobs out to workers
 
 # Machine Learning
 from sklearn.dummy import DummyClassifier  # For dummy classification model
 from sklearn.linear_model import LogisticRegression  # For logistic regression model
-from sklearn.svm import SVC  # For support vector classifier
+from sklearn.svm import SVC, LinearSVC  # For support vector classifiers
+from sklearn.linear_model import SGDClassifier  # For the linear model on approximate kernel features
+from sklearn.kernel_approximation import Nystroem  # For approximate RBF kernel features
 from sklearn.pipeline import make_pipeline  # For creating pipelines
-from sklearn.model_selection import cross_validate  # For cross-validation
+from sklearn.model_selection import check_cv  # For cross-validation splits
+from sklearn.base import clone  # For unfitted copies of estimators
 
 # Metrics and Scoring
-from sklearn.metrics import make_scorer, precision_score, recall_score, f1_score  # For metrics
+from sklearn.metrics import check_scoring, make_scorer, precision_score, recall_score, f1_score  # For metrics
 
+# Parallel data handoff
+from src.shared_data import share_folds  # For memory-mapped fold matrices
+from src.compact_features import with_dense_fallback  # For estimators that need dense input
 
-def class_model_trainer(preprocessor, X_train, y_train, pos_lable, seed, write_to, cv = 5, metrics = None):
+# Row count above which `class_model_trainer` replaces kernel SVC with the scalable tier
+MAX_KERNEL_ROWS = 50000
+
+
+def preprocess_folds(preprocessor, X_train, y_train, cv=5, shared_dir=None):
+    """
+    Fit the preprocessor once per cross-validation fold and cache the transformed splits.
+
+    Every candidate model that shares `preprocessor` can then be fitted on the cached
+    matrices instead of refitting the same imputers, encoder and scaler on every fold.
+
+    Parameters
+    ----------
+    preprocessor : sklearn.compose.ColumnTransformer
+        The (unfitted) preprocessing step shared by the candidate pipelines.
+    X_train : pandas.DataFrame
+        The training feature set.
+    y_train : pandas.Series or pandas.DataFrame
+        The training target variable.
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy, as in `sklearn.model_selection.cross_validate`.
+    shared_dir : str, optional
+        If given, the transformed matrices are written to memory-mapped files in this
+        directory (see `src.shared_data.share_folds`) so parallel workers receive only
+        fold indices instead of pickled arrays.
+
+    Returns
+    -------
+    list of dict
+        One entry per fold with keys "train_idx", "test_idx", "X_train", "X_test",
+        "y_train" and "y_test", where the feature matrices are already transformed.
+    """
+    if shared_dir is not None:
+        return share_folds(preprocessor, X_train, y_train, shared_dir, cv=cv)
+
+    y = np.asarray(y_train).ravel()
+    splitter = check_cv(cv, y, classifier=True)
+
+    folds = []
+    for train_idx, test_idx in splitter.split(X_train, y):
+        fold_preprocessor = clone(preprocessor)
+        folds.append({
+            "train_idx": train_idx,
+            "test_idx": test_idx,
+            "X_train": fold_preprocessor.fit_transform(X_train.iloc[train_idx], y[train_idx]),
+            "X_test": fold_preprocessor.transform(X_train.iloc[test_idx]),
+            "y_train": y[train_idx],
+            "y_test": y[test_idx],
+        })
+    return folds
+
+
+def untransformed_folds(folds, X_train):
+    """Return copies of `folds` holding the raw feature rows instead of the transformed matrices."""
+    return [{"train_idx": fold["train_idx"], "test_idx": fold["test_idx"],
+             "X_train": X_train.iloc[fold["train_idx"]], "X_test": X_train.iloc[fold["test_idx"]],
+             "y_train": fold["y_train"], "y_test": fold["y_test"]}
+            for fold in folds]
+
+
+def _fit_and_score(estimator, fold, scorers):
+    """Fit one estimator on one fold and return its scores in `cross_validate` layout."""
+    X_fit, y_fit, X_test, y_test = fold["X_train"], fold["y_train"], fold["X_test"], fold["y_test"]
+
+    start = time.time()
+    estimator.fit(X_fit, y_fit)
+    fit_time = time.time() - start
+
+    start = time.time()
+    test_scores = {name: scorer(estimator, X_test, y_test) for name, scorer in scorers.items()}
+    score_time = time.time() - start
+
+    train_scores = {name: scorer(estimator, X_fit, y_fit) for name, scorer in scorers.items()}
+
+    result = {"fit_time": fit_time, "score_time": score_time}
+    for name in scorers:
+        result[f"test_{name}"] = test_scores[name]
+        result[f"train_{name}"] = train_scores[name]
+    return result, estimator
+
+
+def _shares_preprocessor(pipeline, preprocessor):
+    """Whether `pipeline` starts with `preprocessor`, so its estimator can be fitted on the encoded folds."""
+    return len(pipeline.steps) > 1 and pipeline.steps[0][1] is preprocessor
+
+
+def cross_validate_shared(models, preprocessor, X_train, y_train, cv=5, scoring=None, n_jobs=None,
+                          shared_dir=None, return_estimator=False, folds=None):
+    """
+    Cross-validate several pipelines that share one preprocessor.
+
+    The preprocessor is fitted once per fold (see `preprocess_folds`) and every
+    model x fold fit is dispatched to a joblib worker pool. Pipelines whose first
+    step is `preprocessor` are fitted on the cached transformed matrices; any other
+    pipeline is fitted on the raw fold as `cross_validate` would.
+
+    Parameters
+    ----------
+    models : dict of str to sklearn.pipeline.Pipeline
+        The candidate pipelines, keyed by model name.
+    preprocessor : sklearn.compose.ColumnTransformer
+        The preprocessing step shared by the pipelines.
+    X_train : pandas.DataFrame
+        The training feature set.
+    y_train : pandas.Series or pandas.DataFrame
+        The training target variable.
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy.
+    scoring : str, callable or dict, optional
+        Scoring metrics, as accepted by `sklearn.model_selection.cross_validate`. A single
+        metric, or None for each estimator's default scorer, is reported under "score".
+    n_jobs : int, optional
+        Number of workers for the model x fold jobs. None means 1, -1 means all cores.
+    shared_dir : str, optional
+        Directory for memory-mapped fold matrices, see `preprocess_folds`.
+    return_estimator : bool, optional, default=False
+        Whether to add an "estimator" column holding each fold's fitted estimator, as
+        `cross_validate` does. For pipelines that share `preprocessor` this is the part
+        of the pipeline after it, fitted on the encoded fold.
+    folds : list of dict, optional
+        Encoded folds already returned by `preprocess_folds` for `preprocessor`, used
+        instead of encoding `X_train` again; `cv` and `shared_dir` are then ignored.
+
+    Returns
+    -------
+    dict of str to pandas.DataFrame
+        Per-fold results for each model, with the same columns as `cross_validate`
+        called with `return_train_score=True`.
+    """
+    if folds is None:
+        folds = preprocess_folds(preprocessor, X_train, y_train, cv=cv, shared_dir=shared_dir)
+    raw_folds = None
+    if not isinstance(scoring, dict):
+        scoring = {"score": scoring}
+
+    jobs = []
+    for model_name, pipeline in models.items():
+        shares_preprocessor = _shares_preprocessor(pipeline, preprocessor)
+        estimator = pipeline[1:] if shares_preprocessor else pipeline
+        scorers = {name: check_scoring(estimator, scoring=metric) for name, metric in scoring.items()}
+        if not shares_preprocessor and raw_folds is None:
+            raw_folds = untransformed_folds(folds, X_train)
+        for fold in (folds if shares_preprocessor else raw_folds):
+            jobs.append((model_name, clone(estimator), fold, scorers))
+
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_and_score)(estimator, fold, scorers)
+        for _, estimator, fold, scorers in jobs
+    )
+
+    cross_val_results = {}
+    for (model_name, *_), (fold_scores, fitted) in zip(jobs, outputs):
+        if return_estimator:
+            fold_scores = {**fold_scores, "estimator": fitted}
+        cross_val_results.setdefault(model_name, []).append(fold_scores)
+    return {model_name: pd.DataFrame(rows) for model_name, rows in cross_val_results.items()}
+
+
+def exact_models(preprocessor, seed):
+    """
+    The candidate pipelines of the exact tier: dummy, logistic regression and kernel SVC.
+
+    Kernel SVC fits in roughly quadratic to cubic time in the number of rows.
+    """
+    return {
+        "dummy": make_pipeline(DummyClassifier()),
+        "logreg": make_pipeline(preprocessor, LogisticRegression(random_state=seed, max_iter=1000)),
+        "svc": make_pipeline(preprocessor, SVC(random_state=seed)),
+        "logreg_bal": make_pipeline(preprocessor, LogisticRegression(random_state=seed, max_iter=1000, class_weight="balanced")),
+        "svc_bal": make_pipeline(preprocessor, SVC(random_state=seed, class_weight="balanced"))
+    }
+
+
+def scalable_models(preprocessor, seed, n_components=300):
+    """
+    The candidate pipelines of the scalable tier, whose fit time grows linearly with the number of rows.
+
+    Kernel SVC is replaced by a linear SVM (`LinearSVC` solved in the primal, since rows
+    far outnumber features at this scale) and by an RBF kernel approximation
+    (`Nystroem` with `n_components` landmarks) followed by a hinge-loss `SGDClassifier`.
+    The dummy and logistic regression models are kept.
+    """
+    return {
+        "dummy": make_pipeline(DummyClassifier()),
+        "logreg": make_pipeline(preprocessor, LogisticRegression(random_state=seed, max_iter=1000)),
+        "linear_svc": make_pipeline(preprocessor, LinearSVC(random_state=seed, dual=False)),
+        "nystroem_svc": make_pipeline(preprocessor, Nystroem(n_components=n_components, random_state=seed),
+                                      SGDClassifier(loss="hinge", random_state=seed)),
+        "logreg_bal": make_pipeline(preprocessor, LogisticRegression(random_state=seed, max_iter=1000, class_weight="balanced")),
+        "linear_svc_bal": make_pipeline(preprocessor, LinearSVC(random_state=seed, dual=False, class_weight="balanced")),
+        "nystroem_svc_bal": make_pipeline(preprocessor, Nystroem(n_components=n_components, random_state=seed),
+                                          SGDClassifier(loss="hinge", random_state=seed, class_weight="balanced")),
+    }
+
+
+class TrainingResult(dict):
+    """
+    The candidate pipelines of `class_model_trainer` together with their cross-validation.
+
+    The object is the dictionary of unfitted pipelines keyed by model name that tuning
+    starts from, so `result["logreg_bal"]` and `result.items()` work as before. It also
+    keeps what the cross-validation produced, so later steps can reuse the fits and the
+    fold assignment instead of repeating them.
+
+    Parameters
+    ----------
+    models : dict of str to sklearn.pipeline.Pipeline
+        The candidate pipelines.
+    preprocessor : sklearn.base.BaseEstimator
+        The preprocessing step shared by the pipelines.
+    tier : {"exact", "scalable"}
+        The model tier that ran.
+    folds : list of dict
+        The encoded folds, as returned by `preprocess_folds` for `preprocessor`.
+    cross_val_results : dict of str to pandas.DataFrame
+        Per-fold results of each model from `cross_validate_shared` with `return_estimator=True`.
+
+    Attributes
+    ----------
+    cv_results : dict of str to pandas.DataFrame
+        Per-fold scores and times of each model, in `cross_validate` layout.
+    fold_estimators : dict of str to list
+        The fitted estimator of each model on each fold. For pipelines that share
+        `preprocessor` it is the part after the preprocessor, which takes the encoded
+        fold matrices in `folds`.
+    """
+
+    def __init__(self, models, preprocessor, tier, folds, cross_val_results):
+        super().__init__(models)
+        self.preprocessor = preprocessor
+        self.tier = tier
+        self.folds = folds
+        self.cv_results = {name: frame.drop(columns="estimator") for name, frame in cross_val_results.items()}
+        self.fold_estimators = {name: list(frame["estimator"]) for name, frame in cross_val_results.items()}
+
+    @property
+    def splits(self):
+        """The (train, test) row indices of each fold, usable as the `cv` argument of sklearn searches."""
+        return [(fold["train_idx"], fold["test_idx"]) for fold in self.folds]
+
+    @property
+    def timings(self):
+        """Total and per-fold mean fit and score seconds of each model."""
+        return pd.DataFrame({
+            name: {"fit_time": frame["fit_time"].sum(), "score_time": frame["score_time"].sum(),
+                   "mean_fit_time": frame["fit_time"].mean(), "mean_score_time": frame["score_time"].mean()}
+            for name, frame in self.cv_results.items()
+        }).T
+
+    def summary(self):
+        """
+        The mean and standard deviation of every score and time of each model across folds.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One (mean, std) column pair per model.
+        """
+        tables = {model_name: fold_scores.agg(['mean', 'std']).round(3).T
+                  for model_name, fold_scores in self.cv_results.items()}
+        return pd.concat(tables, axis='columns').reset_index()
+
+    def write_tables(self, write_to):
+        """
+        Write the summary to `cross_val_score.csv` and `cross_val_std.csv` under `<write_to>/tables`,
+        and the models with the tier they belong to to `cross_val_tier.csv`.
+        """
+        table = self.summary()
+        for file_name in ["cross_val_std.csv", "cross_val_score.csv"]:
+            table.to_csv(os.path.join(write_to, "tables", file_name), index=False)
+        pd.DataFrame({"model": list(self.cv_results), "tier": self.tier}).to_csv(
+            os.path.join(write_to, "tables", "cross_val_tier.csv"), index=False)
+
+    def out_of_fold(self, model_name, X_train, method="predict"):
+        """
+        Predict every row with the fold estimator that did not see it, without refitting.
+
+        Parameters
+        ----------
+        model_name : str
+            The model.
+        X_train : pandas.DataFrame
+            The training feature set the folds were built from; used by pipelines that
+            do not share the preprocessor.
+        method : str, optional, default="predict"
+            The estimator method, e.g. "decision_function" or "predict_proba".
+
+        Returns
+        -------
+        numpy.ndarray
+            One prediction per row of `X_train`, in row order.
+        """
+        shares = _shares_preprocessor(self[model_name], self.preprocessor)
+        parts = []
+        for fold, estimator in zip(self.folds, self.fold_estimators[model_name]):
+            X_test = fold["X_test"] if shares else X_train.iloc[fold["test_idx"]]
+            parts.append(np.asarray(getattr(estimator, method)(X_test)))
+        predictions = np.empty((len(X_train),) + parts[0].shape[1:], dtype=parts[0].dtype)
+        for fold, part in zip(self.folds, parts):
+            predictions[fold["test_idx"]] = part
+        return predictions
+
+
+def class_model_trainer(preprocessor, X_train, y_train, pos_lable, seed, write_to, cv = 5, metrics = None, n_jobs = None,
+                        shared_dir = None, tier = "auto", max_kernel_rows = MAX_KERNEL_ROWS):
     """
     Train and evaluate multiple classification models using cross-validation.
     
     This function trains a variety of classification models, including a dummy classifier, 
     logistic regression, and support vector classifier (SVC), with optional class weight balancing. 
     It performs cross-validation using specified metrics and saves the results to CSV files.
+    The preprocessor is fitted once per fold and shared by all models, and the model x fold
+    fits are spread over `n_jobs` workers. If the preprocessor may produce sparse output
+    (e.g. one built by `src.compact_features.make_compact`), models whose estimator only
+    accepts dense input get a `DenseTransformer` step in front of it; all others are fitted
+    on the sparse matrix directly.
+
+    Kernel SVC does not scale past a few tens of thousands of rows, so above
+    `max_kernel_rows` rows the SVC models are replaced by the scalable tier of
+    `scalable_models` (linear SVM and Nystroem kernel approximation). The tier that ran
+    is recorded, next to each model, in `cross_val_tier.csv`.
     
     Parameters
     ----------
@@ -40,29 +363,43 @@ def class_model_trainer(preprocessor, X_train, y_train, pos_lable, seed, write_t
         The positive class label for evaluation metrics such as precision, recall, and F1-score.
     seed : int
         The random seed for reproducibility.
-    write_to : str
+    write_to : str or None
         The directory path where the cross-validation results (CSV files) will be saved.
+        None skips writing them.
     cv : int, optional, default=5
         The number of cross-validation folds.
     metrics : dict, optional
         Custom scoring metrics for cross-validation. If not provided, the default is accuracy, 
         precision, recall, and F1-score.
+    n_jobs : int, optional
+        Number of workers used for the model x fold fits. None means 1, -1 means all cores.
+    shared_dir : str, optional
+        Directory for memory-mapped fold matrices, so workers receive only fold indices.
+    tier : {"auto", "exact", "scalable"}, optional, default="auto"
+        The model tier. "auto" picks "scalable" when `X_train` has more than
+        `max_kernel_rows` rows and "exact" otherwise.
+    max_kernel_rows : int, optional, default=MAX_KERNEL_ROWS
+        The row count above which "auto" switches to the scalable tier.
     
     Returns
     -------
-    dict
-        A dictionary containing trained model pipelines:
+    TrainingResult
+        A dictionary of the candidate (unfitted) model pipelines, which also holds each
+        model's fitted fold estimators, per-fold scores and timings, and the encoded folds:
         - "dummy": DummyClassifier pipeline.
         - "logreg": LogisticRegression pipeline.
-        - "svc": Support Vector Classifier pipeline.
+        - "svc": Support Vector Classifier pipeline (exact tier).
         - "logreg_bal": LogisticRegression pipeline with balanced class weights.
-        - "svc_bal": Support Vector Classifier pipeline with balanced class weights.
+        - "svc_bal": Support Vector Classifier pipeline with balanced class weights (exact tier).
+        - "linear_svc", "linear_svc_bal": LinearSVC pipelines (scalable tier).
+        - "nystroem_svc", "nystroem_svc_bal": Nystroem and SGDClassifier pipelines (scalable tier).
     
     Output
     ------
     CSV files containing cross-validation results:
     - `cross_val_std.csv`: Standard deviation of cross-validation scores for each metric and model.
     - `cross_val_score.csv`: Mean cross-validation scores for each metric and model.
+    - `cross_val_tier.csv`: The models that ran, in table order, and their tier.
     
     Examples
     --------
@@ -96,42 +433,27 @@ def class_model_trainer(preprocessor, X_train, y_train, pos_lable, seed, write_t
     ... )
     """
     
-    models = {
-        "dummy": make_pipeline(DummyClassifier()),
-        "logreg": make_pipeline(preprocessor, LogisticRegression(random_state=seed, max_iter=1000)),
-        "svc": make_pipeline(preprocessor, SVC(random_state=seed)),
-        "logreg_bal": make_pipeline(preprocessor, LogisticRegression(random_state=seed, max_iter=1000, class_weight="balanced")),
-        "svc_bal": make_pipeline(preprocessor, SVC(random_state=seed, class_weight="balanced"))
-    }
+    if tier == "auto":
+        tier = "scalable" if len(X_train) > max_kernel_rows else "exact"
+    if tier not in ("exact", "scalable"):
+        raise ValueError("tier must be 'auto', 'exact' or 'scalable'")
+    models = exact_models(preprocessor, seed) if tier == "exact" else scalable_models(preprocessor, seed)
+    models = {model_name: with_dense_fallback(pipeline) for model_name, pipeline in models.items()}
 
-    metrics = {
-        "accuracy": "accuracy",
-        "precision": make_scorer(precision_score, pos_label=pos_lable),
-        "recall": make_scorer(recall_score, pos_label=pos_lable),
-        "f1": make_scorer(f1_score, pos_label=pos_lable),
-    }
-    
-    cross_val_results = {}
-    for model_name, pipeline in models.items():
-        cross_val_results[model_name] = pd.DataFrame(
-            cross_validate(pipeline, 
-                           X_train, 
-                           y_train, 
-                           cv=cv, 
-                           scoring=metrics, 
-                           return_train_score=True)
-        ).agg(['mean', 'std']).round(3).T
-
-    # Save cross-validation results (standard deviation)
-    std_df = pd.concat(cross_val_results, axis='columns').reset_index()
-    std_df.to_csv(
-        os.path.join(write_to, "tables", "cross_val_std.csv"), index=False
-    )
+    if metrics is None:
+        metrics = {
+            "accuracy": "accuracy",
+            "precision": make_scorer(precision_score, pos_label=pos_lable),
+            "recall": make_scorer(recall_score, pos_label=pos_lable),
+            "f1": make_scorer(f1_score, pos_label=pos_lable),
+        }
     
-    # Save cross-validation results (mean)
-    mean_df = pd.concat(cross_val_results, axis='columns').reset_index()
-    mean_df.to_csv(
-        os.path.join(write_to, "tables", "cross_val_score.csv"), index=False
-    )
+    folds = preprocess_folds(preprocessor, X_train, y_train, cv=cv, shared_dir=shared_dir)
+    cross_val_results = cross_validate_shared(models, preprocessor, X_train, y_train, scoring=metrics,
+                                              n_jobs=n_jobs, return_estimator=True, folds=folds)
+    result = TrainingResult(models, preprocessor, tier, folds, cross_val_results)
 
-    return models
\ No newline at end of file
+    # Save cross-validation results (mean and standard deviation)
+    if write_to is not None:
+        result.write_tables(write_to)
+    return result
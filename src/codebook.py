@@ -0,0 +1,201 @@
+# codebook.py
+# author: agent
+# date: 2026-10-17
+
+import numpy as np
+import pandas as pd
+
+from src.storage import DatasetWriter, read_dataset, storage_format
+
+
+# Every column of the UCI heart disease source, keyed by its source name: the display name it
+# gets in the decoded data, the source code of each label (None for measurements, which keep
+# their values) and the dtype of the decoded column.
+CODEBOOK = {
+    "age": ("Age (in years)", None, "Int64"),
+    "sex": ("Sex", {0: "female", 1: "male"}, "category"),
+    "cp": ("Chest pain type", {1: "typical angina", 2: "atypical angina", 3: "non-anginal pain", 4: "asymptomatic"},
+           "category"),
+    "trestbps": ("Resting blood pressure (in mm Hg on admission to the hospital)", None, "Int64"),
+    "chol": ("Serum cholesterol (in mg/dl)", None, "Int64"),
+    "fbs": ("Fasting blood sugar > 120 mg/dl", {0: False, 1: True}, "category"),
+    "restecg": ("Resting electrocardiographic results",
+                {0: "normal", 1: "having ST-T wave abnormality",
+                 2: "showing probable or definite left ventricular hypertrophy by Estes' criteria"}, "category"),
+    "thalach": ("Maximum heart rate achieved", None, "Int64"),
+    "exang": ("Exercise-induced angina", {0: "no", 1: "yes"}, "category"),
+    "oldpeak": ("ST depression induced by exercise relative to rest", None, "float64"),
+    "slope": ("Slope of the peak exercise ST segment", {1: "upsloping", 2: "flat", 3: "downsloping"}, "category"),
+    "ca": ("Number of major vessels (0–3) colored by fluoroscopy", None, "float64"),
+    "thal": ("Thalassemia", {3: "normal", 6: "fixed defect", 7: "reversable defect"}, "category"),
+    "num": ("Diagnosis of heart disease", None, "Int64"),
+}
+
+# The binary diagnosis of the processed data, by angiographic disease status (0-3; 4 is dropped)
+DIAGNOSIS_CODES = {0: "< 50% diameter narrowing", 1: "> 50% diameter narrowing",
+                   2: "> 50% diameter narrowing", 3: "> 50% diameter narrowing"}
+
+
+def _labels(codes):
+    """The distinct labels of a code mapping, in code order"""
+    return list(dict.fromkeys(codes[code] for code in sorted(codes)))
+
+
+def decoded_dtypes():
+    """
+    Returns the dtype of each decoded column by display name, for reading decoded files back.
+
+    Coded columns read as categoricals with the codebook's labels as categories (True/False
+    text is parsed into boolean categories).
+
+    Returns
+    -------
+    dict of str to dtype
+    """
+    dtypes = {}
+    for name, codes, dtype in CODEBOOK.values():
+        dtypes[name] = pd.CategoricalDtype(_labels(codes)) if dtype == "category" else dtype
+    return dtypes
+
+
+def decode_column(values, codes):
+    """
+    Maps a column of codes to a categorical of labels in one vectorized pass.
+
+    A lookup table indexed by code gives each code its category position, so the whole column is
+    translated by one array index rather than value by value. Missing values, codes that are not
+    in `codes` and non-integer values all become missing.
+
+    Parameters
+    ----------
+    values : array-like
+        The codes, as integers or floats.
+    codes : dict
+        Label of each integer code.
+
+    Returns
+    -------
+    pandas.Categorical
+        The labels, with categories in code order.
+    """
+    labels = _labels(codes)
+    keys = np.array(sorted(codes))
+    offset, size = keys.min(), keys.max() - keys.min() + 1
+    # Position of each code's label; the extra last slot (-1) catches everything else
+    table = np.full(size + 1, -1, dtype=np.int8)
+    table[keys - offset] = [labels.index(codes[key]) for key in keys]
+
+    index = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float, na_value=np.nan) - offset
+    valid = (index >= 0) & (index < size) & (index == np.floor(index))
+    return pd.Categorical.from_codes(table[np.where(valid, index, size).astype(np.intp)], categories=labels)
+
+
+def decode_frame(source_df):
+    """
+    Decodes a frame of source columns and gives them their display names.
+
+    Parameters
+    ----------
+    source_df : pandas.DataFrame
+        Columns named as the keys of `CODEBOOK`, holding the source codes.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The decoded columns, in codebook order, under their display names: categoricals for coded
+        columns and the codebook dtype for measurements.
+    """
+    missing = [column for column in CODEBOOK if column not in source_df.columns]
+    if missing:
+        raise ValueError(f"Source data is missing columns: {missing}")
+
+    decoded = {}
+    for column, (name, codes, dtype) in CODEBOOK.items():
+        values = source_df[column]
+        if codes is None:
+            decoded[name] = pd.array(values).astype(dtype) if dtype == "Int64" else values.astype(dtype)
+        else:
+            decoded[name] = decode_column(values, codes)
+    return pd.DataFrame(decoded, index=source_df.index)
+
+
+def decode_source(source, chunksize=1_000_000, header=True, na_values=None):
+    """
+    Reads a CSV of source columns and yields it decoded, one chunk of rows at a time.
+
+    Parameters
+    ----------
+    source : str
+        Path to a CSV with the columns of `CODEBOOK` (other columns are ignored).
+    chunksize : int, optional
+        Number of rows decoded at a time.
+    header : bool, optional
+        Whether the file starts with a header row. Without one, the columns must be in
+        codebook order, as in the UCI `processed.*.data` files.
+    na_values : str or list of str, optional
+        Extra strings marking missing values (the UCI files use "?").
+
+    Yields
+    ------
+    pandas.DataFrame
+        The decoded chunks, as returned by `decode_frame`.
+    """
+    options = {"usecols": list(CODEBOOK)} if header else {"header": None, "names": list(CODEBOOK)}
+    # Every source column is numeric; reading them as floats keeps missing values in every chunk
+    for chunk in pd.read_csv(source, dtype=float, chunksize=chunksize, na_values=na_values, **options):
+        yield decode_frame(chunk)
+
+
+def decode_csv(source, destination, chunksize=1_000_000):
+    """
+    Decodes a CSV of source columns to a file of decoded columns, one chunk of rows at a time.
+
+    Memory is bounded by the chunk size, so source files of millions of rows decode in the same
+    footprint as small ones. The destination is written as CSV, Parquet or Arrow by its extension;
+    Parquet and Arrow keep the decoded dtypes.
+
+    Parameters
+    ----------
+    source : str
+        Path to a CSV with the columns of `CODEBOOK` (other columns are ignored).
+    destination : str
+        Path of the decoded file, overwritten if it exists.
+    chunksize : int, optional
+        Number of rows decoded at a time.
+
+    Returns
+    -------
+    int
+        The number of rows decoded.
+    """
+    with DatasetWriter(destination, columns=[name for name, _, _ in CODEBOOK.values()]) as writer:
+        for chunk in decode_source(source, chunksize=chunksize):
+            writer.write(chunk)
+    return writer.n_rows
+
+
+def read_decoded(path, chunksize=None):
+    """
+    Reads a decoded file with the codebook dtypes, in chunks if requested.
+
+    CSV files are parsed with the dtypes of `decoded_dtypes`; Parquet and Arrow files already
+    store them.
+
+    Parameters
+    ----------
+    path : str
+        Path to a file written by `decode_frame` or `decode_csv`.
+    chunksize : int, optional
+        Rows read at a time from a CSV; the chunks are concatenated, which keeps the peak memory
+        of parsing low for large files.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    if storage_format(path) != "csv":
+        return read_dataset(path)
+    dtypes = decoded_dtypes()
+    if chunksize is None:
+        return pd.read_csv(path, dtype=dtypes)
+    return pd.concat(pd.read_csv(path, dtype=dtypes, chunksize=chunksize), ignore_index=True)
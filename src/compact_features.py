@@ -0,0 +1,249 @@
+# compact_features.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import warnings  # For silencing convergence warnings of the sparse-support probe
+
+# Data Manipulation
+import numpy as np  # For dtypes and array sizes
+import pandas as pd  # For the memory report
+from scipy import sparse  # For sparse matrices
+
+# Machine Learning
+from sklearn.base import BaseEstimator, TransformerMixin, clone  # For sklearn compatibility
+from sklearn.pipeline import Pipeline, make_pipeline  # For inserting and appending steps
+
+# Sparse-input support of each estimator class, filled in by `accepts_sparse`
+_sparse_support = {}
+
+
+class DenseTransformer(TransformerMixin, BaseEstimator):
+    """
+    Convert sparse input to a dense array; dense input passes through unchanged.
+
+    Inserted by `with_dense_fallback` in front of estimators that only accept dense input.
+    """
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X.toarray() if sparse.issparse(X) else X
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(input_features, dtype=object)
+
+
+class CastTransformer(TransformerMixin, BaseEstimator):
+    """
+    Cast the input to another dtype, keeping sparse input sparse.
+
+    Parameters
+    ----------
+    dtype : numpy dtype, optional, default=np.float32
+        The output dtype.
+    """
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = dtype
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return X.astype(self.dtype) if sparse.issparse(X) else np.asarray(X, dtype=self.dtype)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(input_features, dtype=object)
+
+
+def accepts_sparse(estimator):
+    """
+    Return whether an estimator can be fitted on a scipy sparse matrix.
+
+    The answer is found by fitting a clone on a tiny sparse float32 problem once per
+    estimator class, since scikit-learn has no tag for it; an estimator that raises
+    (e.g. "dense data is required") is treated as dense-only.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The (unfitted) estimator.
+
+    Returns
+    -------
+    bool
+    """
+    kind = type(estimator)
+    if kind not in _sparse_support:
+        X = sparse.csr_matrix(np.tile(np.array([[1, 0], [0, 1], [1, 1], [0, 0]], dtype=np.float32), (3, 1)))
+        y = np.tile([0, 1], 6)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                clone(estimator).fit(X, y)
+            _sparse_support[kind] = True
+        except (TypeError, ValueError):
+            _sparse_support[kind] = False
+    return _sparse_support[kind]
+
+
+def may_produce_sparse(preprocessor):
+    """
+    Return whether a preprocessor's configuration allows sparse output.
+
+    True when any of its (nested) steps has `sparse_output=True` (or `sparse=True`) and
+    no ColumnTransformer in it has `sparse_threshold=0`. Whether a ColumnTransformer's
+    output actually ends up sparse also depends on the data, so this is an upper bound.
+    """
+    params = preprocessor.get_params(deep=True)
+    names = {key: key.rsplit("__", 1)[-1] for key in params}
+    sparse_steps = any(names[key] in ("sparse_output", "sparse") and params[key] is True for key in params)
+    thresholds = [params[key] for key in params if names[key] == "sparse_threshold"]
+    return sparse_steps and (not thresholds or any(threshold > 0 for threshold in thresholds))
+
+
+def with_dense_fallback(pipeline):
+    """
+    Insert a `DenseTransformer` before the final estimator if it needs dense input that the preprocessor may not give.
+
+    Pipelines whose final estimator accepts sparse input, or whose first step never
+    produces it, are returned unchanged.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        A pipeline of a preprocessor and an estimator.
+
+    Returns
+    -------
+    sklearn.pipeline.Pipeline
+    """
+    if len(pipeline.steps) < 2 or not may_produce_sparse(pipeline[0]) or accepts_sparse(pipeline[-1]):
+        return pipeline
+    steps = list(pipeline.steps)
+    steps.insert(len(steps) - 1, ("densetransformer", DenseTransformer()))
+    return Pipeline(steps, memory=pipeline.memory, verbose=pipeline.verbose)
+
+
+def _compact_group(transformer):
+    """Returns a column group of a ColumnTransformer with sparse float32 encoders and a float32 cast elsewhere."""
+    transformer = clone(transformer)
+    steps = [step for _, step in transformer.steps] if isinstance(transformer, Pipeline) else [transformer]
+    encoders = [step for step in steps if type(step).__name__ == "OneHotEncoder"]
+    for encoder in encoders:
+        encoder.set_params(sparse_output=True, dtype=np.float32)
+    if encoders:
+        return transformer
+    if isinstance(transformer, Pipeline):
+        return Pipeline(transformer.steps + [("casttransformer", CastTransformer(np.float32))])
+    return make_pipeline(transformer, CastTransformer(np.float32))
+
+
+def make_compact(preprocessor):
+    """
+    Return an unfitted copy of a preprocessor that keeps one-hot blocks sparse and numeric blocks float32.
+
+    A `FusedPreprocessor` is switched to `dtype=np.float32, sparse_output=True`. In a
+    ColumnTransformer, every OneHotEncoder is switched to sparse float32 output, every
+    other column group gets a trailing `CastTransformer(np.float32)`, and
+    `sparse_threshold=1.0` keeps the stacked output sparse.
+
+    Parameters
+    ----------
+    preprocessor : FusedPreprocessor or sklearn.compose.ColumnTransformer
+        The dense preprocessor.
+
+    Returns
+    -------
+    FusedPreprocessor or sklearn.compose.ColumnTransformer
+
+    Raises
+    ------
+    ValueError
+        If the preprocessor is of another kind.
+    """
+    kind = type(preprocessor).__name__
+    if kind == "FusedPreprocessor":
+        return clone(preprocessor).set_params(dtype=np.float32, sparse_output=True)
+    if kind != "ColumnTransformer":
+        raise ValueError(f"Cannot make a {kind} compact; expected a FusedPreprocessor or ColumnTransformer.")
+    compact = clone(preprocessor)
+    compact.transformers = [
+        (name, transformer if isinstance(transformer, str) else _compact_group(transformer), columns)
+        for name, transformer, columns in compact.transformers
+    ]
+    return compact.set_params(sparse_threshold=1.0)
+
+
+def matrix_nbytes(X):
+    """Return the bytes held by a dense array, a sparse matrix (data, indices and index pointers) or a DataFrame."""
+    if isinstance(X, pd.DataFrame):
+        return int(X.memory_usage(deep=True, index=False).sum())
+    if sparse.issparse(X):
+        X = X.tocsr()
+        return int(X.data.nbytes + X.indices.nbytes + X.indptr.nbytes)
+    return int(np.asarray(X).nbytes)
+
+
+def _describe(stage, X, nbytes=None, fmt=None, dtype=None):
+    if isinstance(X, pd.DataFrame):
+        fmt, dtype = fmt or "DataFrame", dtype or "mixed"
+    else:
+        fmt = fmt or ("CSR" if sparse.issparse(X) else "dense")
+        dtype = dtype or X.dtype.name
+    return {"stage": stage, "format": fmt, "dtype": dtype, "n_rows": X.shape[0], "n_columns": X.shape[1],
+            "megabytes": (matrix_nbytes(X) if nbytes is None else nbytes) / 2**20}
+
+
+def feature_memory_report(preprocessor, models, X_train, y_train=None, n_folds=5):
+    """
+    Report the memory held by the feature matrix at each stage of training.
+
+    The stages are the raw feature frame, the encoded matrix, the same matrix as a dense
+    float64 array (the baseline a compact preprocessor is compared with), the cached
+    fold matrices of `preprocess_folds` (one full-size encoding per fold), and the input
+    each model's estimator receives: the encoded matrix as is, its dense copy when
+    `with_dense_fallback` inserted a `DenseTransformer`, or the raw frame for pipelines
+    that do not share `preprocessor`.
+
+    Parameters
+    ----------
+    preprocessor : sklearn.base.BaseEstimator
+        The preprocessing step shared by the pipelines; it is fitted on a clone.
+    models : dict of str to sklearn.pipeline.Pipeline
+        The candidate pipelines, keyed by model name.
+    X_train : pandas.DataFrame
+        The training feature set.
+    y_train : pandas.Series or pandas.DataFrame, optional
+        The training target variable.
+    n_folds : int, optional, default=5
+        The number of cross-validation folds.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per stage with the format, dtype, shape and size in megabytes.
+    """
+    y = None if y_train is None else np.asarray(y_train).ravel()
+    encoded = clone(preprocessor).fit(X_train, y).transform(X_train)
+    n_rows, n_columns = encoded.shape
+    encoded_bytes = matrix_nbytes(encoded)
+    dtype = encoded.dtype if encoded.dtype.kind == "f" else np.dtype(np.float64)
+
+    rows = [
+        _describe("raw features", X_train),
+        _describe("encoded features", encoded),
+        _describe("dense float64 equivalent", encoded, n_rows * n_columns * 8, "dense", "float64"),
+        _describe(f"cross-validation folds ({n_folds})", encoded, n_folds * encoded_bytes),
+    ]
+    for model_name, pipeline in models.items():
+        stage = f"estimator input: {model_name}"
+        if not (len(pipeline.steps) > 1 and pipeline.steps[0][1] is preprocessor):
+            rows.append(_describe(stage, X_train))
+        elif sparse.issparse(encoded) and any(isinstance(step, DenseTransformer) for _, step in pipeline.steps):
+            rows.append(_describe(stage, encoded, n_rows * n_columns * dtype.itemsize, "dense", dtype.name))
+        else:
+            rows.append(_describe(stage, encoded))
+    return pd.DataFrame(rows)
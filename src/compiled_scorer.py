@@ -0,0 +1,274 @@
+# compiled_scorer.py
+# author: agent
+# date: 2026-10-17
+
+# This module deliberately imports nothing but NumPy and the standard library, so that
+# scoring with a compiled artifact does not pay for importing scikit-learn or pandas.
+import json
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+def _to_json(value):
+    """Converts NumPy scalars in a category list to the JSON equivalents."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _compile_step(step, n_columns):
+    """Describes one fitted preprocessing step of a column group as a JSON-friendly dict."""
+    kind = type(step).__name__
+    if kind == "SimpleImputer":
+        if not (isinstance(step.missing_values, float) and np.isnan(step.missing_values)) or step.add_indicator:
+            raise ValueError("Only SimpleImputer(missing_values=np.nan, add_indicator=False) can be compiled.")
+        if len(step.statistics_) != n_columns:
+            raise ValueError("SimpleImputer dropped empty features; refit with keep_empty_features=True.")
+        return {"op": "impute", "values": [_to_json(value) for value in step.statistics_]}
+    if kind == "OneHotEncoder":
+        if getattr(step, "infrequent_categories_", None) is not None and any(
+                categories is not None for categories in step.infrequent_categories_):
+            raise ValueError("OneHotEncoder with infrequent categories cannot be compiled.")
+        drop = [None] * n_columns if step.drop_idx_ is None else [
+            None if index is None else int(index) for index in step.drop_idx_]
+        return {"op": "onehot",
+                "categories": [[_to_json(value) for value in categories] for categories in step.categories_],
+                "drop": drop,
+                "handle_unknown": step.handle_unknown}
+    if kind == "CastTransformer":
+        return {"op": "cast", "dtype": np.dtype(step.dtype).name}
+    if kind == "StandardScaler":
+        return {"op": "scale",
+                "mean": None if step.mean_ is None or not step.with_mean else step.mean_.tolist(),
+                "scale": None if step.scale_ is None or not step.with_std else step.scale_.tolist()}
+    raise ValueError(f"Cannot compile a {kind} step; supported steps are SimpleImputer, OneHotEncoder, "
+                     "StandardScaler and CastTransformer.")
+
+
+def _compile_fused(transformer):
+    """Describes a fitted FusedPreprocessor as the equivalent categorical and numeric column groups."""
+    categorical = {"columns": list(transformer.categorical_features), "numeric": False,
+                   "steps": [{"op": "impute", "values": [_to_json(value) for value in transformer.categorical_fill_]},
+                             {"op": "onehot",
+                              "categories": [[_to_json(value) for value in categories]
+                                             for categories in transformer.categories_],
+                              "drop": list(transformer.drop_idx_),
+                              "handle_unknown": transformer.handle_unknown}]}
+    numeric = {"columns": list(transformer.numeric_features), "numeric": True,
+               "steps": [{"op": "impute", "values": transformer.numeric_fill_.tolist()},
+                         {"op": "scale", "mean": transformer.mean_.tolist(), "scale": transformer.scale_.tolist()}]}
+    return [group for group in (categorical, numeric) if group["columns"]]
+
+
+def compile_pipeline(model):
+    """
+    Compiles a fitted preprocessing-plus-linear-classifier pipeline into a plain dictionary.
+
+    The supported shape is the one `4_training_models.py` produces: a Pipeline of a
+    ColumnTransformer, whose column groups chain SimpleImputer, OneHotEncoder and
+    StandardScaler steps (or a FusedPreprocessor), and a binary linear classifier
+    (e.g. LogisticRegression). A `ThresholdClassifier` around such a pipeline is
+    compiled with its threshold. Every float is kept at full precision, so the
+    compiled scorer reproduces the pipeline's scores bit for bit, including for the
+    sparse float32 preprocessors of `src.compact_features.make_compact`.
+
+    Parameters
+    ----------
+    model : sklearn.pipeline.Pipeline or ThresholdClassifier
+        The fitted model.
+
+    Returns
+    -------
+    dict
+        The JSON-serializable artifact.
+
+    Raises
+    ------
+    ValueError
+        If the model contains a step that cannot be compiled.
+    """
+    threshold, pos_label = None, None
+    if type(model).__name__ == "ThresholdClassifier":
+        threshold, pos_label, model = float(model.threshold), model.pos_label, model.estimator
+
+    # A DenseTransformer changes the storage of the features, not their values
+    steps = [] if type(model).__name__ != "Pipeline" else [
+        step for _, step in model.steps if type(step).__name__ != "DenseTransformer"]
+    if len(steps) != 2:
+        raise ValueError("Expected a Pipeline of a ColumnTransformer and a linear classifier.")
+    transformer, classifier = steps
+    densified = len(steps) != len(model.steps)
+    if type(transformer).__name__ not in ("ColumnTransformer", "FusedPreprocessor"):
+        raise ValueError("The first pipeline step must be a ColumnTransformer or FusedPreprocessor.")
+    if not hasattr(classifier, "coef_") or classifier.coef_.shape[0] != 1:
+        raise ValueError("The final step must be a binary linear classifier with coef_ and intercept_.")
+
+    groups = []
+    if type(transformer).__name__ == "FusedPreprocessor":
+        groups = _compile_fused(transformer)
+    for name, group, columns in getattr(transformer, "transformers_", []):
+        if group == "drop" or (name == "remainder" and len(columns) == 0):
+            continue
+        if group == "passthrough":
+            raise ValueError("Passthrough columns cannot be compiled.")
+        steps = [step for _, step in group.steps] if type(group).__name__ == "Pipeline" else [group]
+        columns = [transformer.feature_names_in_[c] if isinstance(c, (int, np.integer)) else c for c in columns]
+        groups.append({"columns": list(columns),
+                       # Encoded columns are read as Python objects, all others as float64
+                       "numeric": not any(type(step).__name__ == "OneHotEncoder" for step in steps),
+                       "steps": [_compile_step(step, len(columns)) for step in steps]})
+
+    # The classifier scored a sparse matrix, whose product sums each row's terms in column order
+    is_sparse = not densified and bool(getattr(transformer, "sparse_output_", getattr(transformer, "sparse_output", False)))
+    return {
+        "format_version": FORMAT_VERSION,
+        "groups": groups,
+        "dtype": np.dtype(getattr(transformer, "dtype", np.float64)).name,
+        "sparse": is_sparse,
+        "coef": classifier.coef_.ravel().tolist(),
+        "intercept": float(classifier.intercept_[0]),
+        "classes": [_to_json(label) for label in classifier.classes_],
+        "threshold": threshold,
+        "pos_label": _to_json(pos_label) if pos_label is not None else None,
+    }
+
+
+def export_scorer(model, path):
+    """
+    Compiles a fitted pipeline and writes the artifact as JSON.
+
+    Parameters
+    ----------
+    model : sklearn.pipeline.Pipeline or ThresholdClassifier
+        The fitted model, see `compile_pipeline`.
+    path : str
+        The JSON file to write.
+    """
+    with open(path, "w") as f:
+        json.dump(compile_pipeline(model), f)
+
+
+class CompiledScorer:
+    """
+    Scores patients with a compiled pipeline artifact using NumPy alone.
+
+    Parameters
+    ----------
+    artifact : dict
+        The output of `compile_pipeline` (or the parsed JSON file).
+    """
+
+    def __init__(self, artifact):
+        if artifact.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported scorer format version {artifact.get('format_version')}.")
+        self.groups = artifact["groups"]
+        # Same (1, n_features) C-ordered layout as the classifier's coef_, so the product
+        # below runs the same BLAS call as the classifier's decision_function
+        self.coef = np.array([artifact["coef"]], dtype=np.float64)
+        self.intercept = np.array([artifact["intercept"]], dtype=np.float64)
+        self.classes = np.array(artifact["classes"], dtype=object)
+        self.dtype = np.dtype(artifact.get("dtype", "float64"))
+        self.sparse = artifact.get("sparse", False)
+        self.threshold = artifact.get("threshold")
+        self.pos_label = artifact.get("pos_label")
+        for group in self.groups:
+            for step in group["steps"]:
+                if step["op"] == "scale":
+                    step["mean_array"] = None if step["mean"] is None else np.array(step["mean"])
+                    step["scale_array"] = None if step["scale"] is None else np.array(step["scale"])
+
+    @classmethod
+    def load(cls, path):
+        """Loads a scorer from a JSON artifact written by `export_scorer`."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @property
+    def feature_names(self):
+        return [column for group in self.groups for column in group["columns"]]
+
+    def transform(self, X):
+        """
+        Applies the compiled preprocessing to a table of patients.
+
+        Parameters
+        ----------
+        X : mapping of str to array-like
+            The feature columns, e.g. a pandas DataFrame or a dict of lists.
+
+        Returns
+        -------
+        numpy.ndarray
+            The encoded float64 matrix, identical to the ColumnTransformer output.
+        """
+        blocks = []
+        for group in self.groups:
+            dtype = np.float64 if group["numeric"] else object
+            values = np.column_stack([np.asarray(X[column], dtype=dtype) for column in group["columns"]])
+            for step in group["steps"]:
+                values = getattr(self, f"_{step['op']}")(values, step)
+            blocks.append(np.asarray(values, dtype=np.float64))
+        return np.hstack(blocks).astype(self.dtype, copy=False)
+
+    @staticmethod
+    def _impute(values, step):
+        values = values.copy()
+        # NaN is the only missing marker, as in SimpleImputer (None is an ordinary value there)
+        missing = values != values
+        for j, fill in enumerate(step["values"]):
+            values[missing[:, j], j] = fill
+        return values
+
+    @staticmethod
+    def _onehot(values, step):
+        n_outputs = sum(len(categories) - (drop is not None) for categories, drop in zip(step["categories"], step["drop"]))
+        encoded = np.zeros((len(values), n_outputs), dtype=np.float64)
+        offset = 0
+        for j, (categories, drop) in enumerate(zip(step["categories"], step["drop"])):
+            column = values[:, j]
+            known = np.zeros(len(column), dtype=bool)
+            for k, category in enumerate(categories):
+                match = np.asarray(column == category, dtype=bool)
+                known |= match
+                if k == drop:
+                    continue
+                encoded[:, offset] = match
+                offset += 1
+            if step["handle_unknown"] == "error" and not known.all():
+                raise ValueError(f"Unknown categories {set(column[~known])} in feature {j}.")
+        return encoded
+
+    @staticmethod
+    def _cast(values, step):
+        return np.asarray(values, dtype=step["dtype"])
+
+    @staticmethod
+    def _scale(values, step):
+        values = np.array(values, dtype=np.float64)
+        if step["mean_array"] is not None:
+            values -= step["mean_array"]
+        if step["scale_array"] is not None:
+            values /= step["scale_array"]
+        return values
+
+    def decision_function(self, X):
+        """Returns the linear scores, positive for the second class, as the classifier's decision_function does."""
+        X = self.transform(X)
+        if not self.sparse:
+            return (X @ self.coef.T + self.intercept).reshape(-1)
+        # Same summation order as scipy's sparse product (zero terms leave the sums unchanged)
+        X = X.astype(np.float64)
+        scores = np.zeros(len(X), dtype=np.float64)
+        for j in range(X.shape[1]):
+            scores += X[:, j] * self.coef[0, j]
+        return scores + self.intercept
+
+    def predict(self, X):
+        """Predicts class labels, applying the compiled threshold if there is one."""
+        scores = self.decision_function(X)
+        if self.threshold is None:
+            return self.classes[(scores > 0).astype(int)]
+        positive = list(self.classes).index(self.pos_label)
+        negative_label = self.classes[1 - positive]
+        scores = scores if positive == 1 else -scores
+        return np.where(scores >= self.threshold, self.pos_label, negative_label).astype(object)
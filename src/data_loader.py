@@ -0,0 +1,134 @@
+# data_loader.py
+# author: agent
+# date: 2026-10-17
+
+# Data Manipulation
+import pandas as pd  # For data frames and dtypes
+
+from src.codebook import CODEBOOK, DIAGNOSIS_CODES, decoded_dtypes  # For the declared columns and their labels
+from src.site_acquisition import HEART_DISEASE_SITES  # For the site labels of the merged data
+from src.storage import iter_dataset, read_dataset  # For reading CSV/Parquet/Arrow data files
+
+TARGET = "Diagnosis of heart disease"
+
+# Narrower dtypes than the decoded ones, by source column: nullable booleans for fasting blood
+# sugar, and the narrowest integer dtype that holds every value of each whole measurement.
+# Float measurements (oldpeak, ca) stay float64, as the serving and batch-scoring paths
+# validate them, so training never sees values rounded to float32
+_COMPACT_OVERRIDES = {
+    "fbs": "boolean",
+    "age": "Int8",
+    "trestbps": "Int16",
+    "chol": "Int16",
+    "thalach": "Int16",
+}
+
+# Compact in-memory dtype of each column of the heart disease tables; coded columns are
+# categoricals over the codebook labels
+COMPACT_DTYPES = {name: dtype for name, dtype in decoded_dtypes().items() if name != TARGET}
+COMPACT_DTYPES.update({CODEBOOK[column][0]: dtype for column, dtype in _COMPACT_OVERRIDES.items()})
+COMPACT_DTYPES["Site"] = pd.CategoricalDtype(list(HEART_DISEASE_SITES))
+
+# The diagnosis is a 0-4 code in the raw data and a binary label once processed
+_DIAGNOSIS_DTYPES = {"code": "Int8", "label": pd.CategoricalDtype(list(dict.fromkeys(DIAGNOSIS_CODES.values())))}
+
+
+def compact_dtypes(frame):
+    """
+    Return the compact dtype of each declared column of `frame`.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        Heart disease data; columns without a declared dtype are left out.
+
+    Returns
+    -------
+    dict of str to dtype
+    """
+    dtypes = {name: dtype for name, dtype in COMPACT_DTYPES.items() if name in frame.columns}
+    if TARGET in frame.columns:
+        is_code = pd.api.types.is_numeric_dtype(frame[TARGET]) and not frame[TARGET].isna().all()
+        dtypes[TARGET] = _DIAGNOSIS_DTYPES["code" if is_code else "label"]
+    return dtypes
+
+
+def check_categories(frame, dtypes):
+    """
+    Raise if a column of `frame` holds a label outside the categories of its dtype in `dtypes`.
+
+    Casting to a `CategoricalDtype` turns unknown labels into missing values, which would
+    otherwise hide them from the data validation.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        Heart disease data as read.
+    dtypes : dict of str to dtype
+        The dtypes `frame` is about to be cast to.
+
+    Raises
+    ------
+    ValueError
+        Naming the column and its unknown labels.
+    """
+    for name, dtype in dtypes.items():
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        values = frame[name].dropna()
+        unknown = values[~values.isin(dtype.categories)].unique()
+        if len(unknown):
+            raise ValueError(f"Column {name!r} has labels outside its categories: {sorted(map(str, unknown))}")
+
+
+def memory_footprint(frame):
+    """Return the bytes held by `frame`, including the Python objects of object columns."""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def load_heart_data(path, chunksize=None, columns=None):
+    """
+    Read a heart disease table into the compact dtypes of `COMPACT_DTYPES`.
+
+    The file is read as `src.storage.read_dataset` reads it (default `pandas.read_csv`
+    dtypes for CSV files, the stored dtypes for Parquet and Arrow files), then cast. With
+    `chunksize`, each chunk is cast as it is read, so only one chunk is ever held in the
+    default dtypes.
+
+    Parameters
+    ----------
+    path : str
+        A CSV, Parquet or Arrow file of raw, merged or processed heart disease data.
+    chunksize : int, optional
+        Rows read at a time. Defaults to reading the whole file at once.
+    columns : list of str, optional
+        The columns to read. Defaults to every column.
+
+    Returns
+    -------
+    frame : pandas.DataFrame
+        The data in compact dtypes; undeclared columns keep the dtype they were read with.
+    footprint : dict
+        Bytes held by the data as read ("before") and in compact dtypes ("after").
+
+    Raises
+    ------
+    ValueError
+        If a categorical column holds a label outside its categories (see `check_categories`).
+    """
+    chunks = [read_dataset(path, columns=columns)] if chunksize is None else iter_dataset(path, chunksize, columns)
+    frames, before, dtypes = [], 0, None
+    for chunk in chunks:
+        # The first chunk settles the dtypes, so every chunk is cast alike
+        dtypes = dtypes or compact_dtypes(chunk)
+        check_categories(chunk, dtypes)
+        before += memory_footprint(chunk)
+        frames.append(chunk.astype(dtypes))
+    frame = pd.concat(frames, ignore_index=True) if len(frames) != 1 else frames[0]
+    return frame, {"before": before, "after": memory_footprint(frame)}
+
+
+def format_footprint(footprint):
+    """Describe a footprint of `load_heart_data`, e.g. '110.52 MB as read, 8.31 MB compact (13.3x smaller)'."""
+    return (f"{footprint['before'] / 2**20:.2f} MB as read, {footprint['after'] / 2**20:.2f} MB compact "
+            f"({footprint['before'] / max(footprint['after'], 1):.1f}x smaller)")
@@ -2,10 +2,81 @@
 # author: Sarah Eshafi
 # date: 2024-12-14
 
+import functools
+
+import numpy as np
 import pandas as pd
 import pandera as pa
 
 
+# Column types, allowed values and whether missing values are accepted. Nullable
+# columns may be at most 5% missing in a data set.
+COLUMNS = {
+    "Age (in years)": (int, None, True),
+    "Sex": (str, ["male", "female"], False),
+    "Chest pain type": (str, ["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"], False),
+    "Resting blood pressure (in mm Hg on admission to the hospital)": (int, None, True),
+    "Serum cholesterol (in mg/dl)": (int, None, True),
+    "Fasting blood sugar > 120 mg/dl": (bool, None, True),
+    "Resting electrocardiographic results": (str, ["normal", 
+                                                   "having ST-T wave abnormality", 
+                                                   "showing probable or definite left ventricular hypertrophy by Estes' criteria"], False),
+    "Maximum heart rate achieved": (int, None, True),
+    "Exercise-induced angina": (str, ["yes", "no"], False),
+    "ST depression induced by exercise relative to rest": (float, None, True),
+    "Slope of the peak exercise ST segment": (str, ["upsloping", "flat", "downsloping"], False),
+    "Number of major vessels (0–3) colored by fluoroscopy": (float, None, True),
+    "Thalassemia": (str, None, True),
+    "Diagnosis of heart disease": (str, ["< 50% diameter narrowing", "> 50% diameter narrowing"], False),
+}
+
+TARGET = "Diagnosis of heart disease"
+
+# Dtypes that can hold a missing value in any row, for validating payload rows
+_PAYLOAD_DTYPES = {int: "Int64", bool: "boolean", float: float, str: object}
+
+
+def _is_boolean(series):
+    """Whether a column holds booleans: a bool column, or a categorical with True/False categories."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return pd.api.types.is_bool_dtype(series.cat.categories)
+    return pd.api.types.is_bool_dtype(series)
+
+
+# Dtype checks of the non-text columns of a data set
+_DTYPE_CHECKS = {bool: _is_boolean, int: pd.api.types.is_integer_dtype, float: pd.api.types.is_float_dtype}
+
+
+def _columns(null_rate_check=True, target=True):
+    """Builds the pandera columns from COLUMNS, optionally without the missing-value rate checks or the target."""
+    columns = {}
+    for name, (dtype, allowed, nullable) in COLUMNS.items():
+        if name == TARGET and not target:
+            continue
+        checks = [pa.Check.isin(allowed)] if allowed is not None else []
+        if nullable and null_rate_check:
+            checks.append(pa.Check(lambda s: s.isna().mean() <= 0.05, 
+                                   element_wise=False,
+                                   error="Too many null values in column."))
+        if null_rate_check and dtype in _DTYPE_CHECKS:
+            # Typed (Parquet/Arrow) data stores boolean features as categoricals, and the compact
+            # loader narrows measurements (e.g. Int8, Int16), so any dtype of the kind passes
+            checks.append(pa.Check(_DTYPE_CHECKS[dtype], element_wise=False,
+                                   error=f"Expected {dtype.__name__} values in {name}."))
+            columns[name] = pa.Column(None, checks, nullable=nullable)
+        elif null_rate_check:
+            columns[name] = pa.Column(dtype, checks, nullable=nullable)
+        else:
+            columns[name] = pa.Column(_PAYLOAD_DTYPES[dtype], checks, nullable=nullable, coerce=dtype is not str)
+    return columns
+
+
+@functools.lru_cache(maxsize=None)
+def _feature_schema():
+    """The schema of a payload of feature rows, built once per process."""
+    return pa.DataFrameSchema(_columns(null_rate_check=False, target=False))
+
+
 def validate_data(heart_df):
     """
     Validates the input cancer data in the form of a pandas DataFrame against a predefined schema,
@@ -39,60 +110,54 @@ def validate_data(heart_df):
         raise ValueError("Dataframe must contain observations.")
     
     schema = pa.DataFrameSchema(
-        {
-            "Age (in years)": pa.Column(int,
-                                        pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                            element_wise=False,
-                                            error="Too many null values in column."), 
-                                        nullable=True),
-            "Sex": pa.Column(str,pa.Check.isin(["male", "female"])),
-            "Chest pain type": pa.Column(str, pa.Check.isin(["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"])),
-            "Resting blood pressure (in mm Hg on admission to the hospital)": pa.Column(int,
-                                                                                pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                                                                    element_wise=False, 
-                                                                                    error="Too many null values in column."), 
-                                                                                nullable=True),
-            "Serum cholesterol (in mg/dl)": pa.Column(int,
-                                                pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                                    element_wise=False, 
-                                                    error="Too many null values in column."), 
-                                                nullable=True),
-            "Fasting blood sugar > 120 mg/dl": pa.Column(bool,
-                                                    pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                                        element_wise=False, 
-                                                        error="Too many null values in column."), 
-                                                    nullable=True),
-            "Resting electrocardiographic results": pa.Column(str,pa.Check.isin(["normal", 
-                                                                                 "having ST-T wave abnormality", 
-                                                                                 "showing probable or definite left ventricular hypertrophy by Estes' criteria"])),
-            "Maximum heart rate achieved": pa.Column(int,
-                                                pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                                    element_wise=False, 
-                                                    error="Too many null values in column."), 
-                                                nullable=True),
-            "Exercise-induced angina": pa.Column(str, pa.Check.isin(["yes","no"])),
-            "ST depression induced by exercise relative to rest": pa.Column(float,
-                                                                    pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                                                        element_wise=False, 
-                                                                        error="Too many null values in column."), 
-                                                                    nullable=True),
-            "Slope of the peak exercise ST segment": pa.Column(str, pa.Check.isin(["upsloping", "flat", "downsloping"])),
-            "Number of major vessels (0–3) colored by fluoroscopy": pa.Column(float,
-                                                                        pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                                                        element_wise=False, 
-                                                                        error="Too many null values in column."),
-                                                                    nullable=True),
-            "Thalassemia": pa.Column(str, 
-                                     pa.Check(lambda s: s.isna().mean() <= 0.05, 
-                                            element_wise=False, 
-                                            error="Too many null values in column."),
-                                        nullable=True),
-            "Diagnosis of heart disease": pa.Column(str, pa.Check.isin(["< 50% diameter narrowing", "> 50% diameter narrowing"]))
-        } ,
+        _columns(),
         checks=[
             pa.Check(lambda heart_df: ~heart_df.duplicated().any(), error="Duplicate rows found."),
             pa.Check(lambda heart_df: ~(heart_df.isna().all(axis=1)).any(), error="Empty rows found.")
         ]
     )
     
-    return schema.validate(heart_df, lazy = True)
\ No newline at end of file
+    return schema.validate(heart_df, lazy = True)
+
+
+def validate_features(features_df):
+    """
+    Validates rows of patient features (without the diagnosis) against the column schema of `validate_data`,
+    and returns them ready to pass to a trained pipeline.
+
+    Unlike `validate_data`, this checks each row on its own: the column types, allowed values and
+    nullability are enforced, but not the data-set level checks (missing-value rates, duplicate rows).
+    Whole numbers sent as floats (e.g. 120.0) are accepted for integer columns.
+
+    Parameters
+    ----------
+    features_df : pandas.DataFrame
+        One row per patient with every feature column of the heart disease data.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The validated rows, with missing values as NaN and integer columns as floats, the way they
+        appear when the data is read from CSV.
+
+    Raises
+    ------
+    pandera.errors.SchemaErrors
+        If a row does not conform to the schema (e.g. a missing column, an unknown category, or a
+        missing value in a required column).
+    """
+    if not isinstance(features_df, pd.DataFrame):
+        raise TypeError("Input must be a pandas DataFrame")
+    if features_df.empty:
+        raise ValueError("Dataframe must contain observations.")
+
+    schema = _feature_schema()
+    validated = schema.validate(features_df, lazy=True)[list(schema.columns)].copy()
+
+    # Convert to what pandas.read_csv gives the trained pipeline: floats for integer
+    # columns, and NaN rather than None or pd.NA for missing values
+    integer = [name for name in schema.columns if COLUMNS[name][0] is int]
+    other = [name for name in schema.columns if COLUMNS[name][0] in (bool, str)]
+    validated[integer] = validated[integer].astype(float)
+    validated[other] = validated[other].astype(object).where(validated[other].notna(), np.nan)
+    return validated
@@ -0,0 +1,151 @@
+# dataset_store.py
+# author: agent
+# date: 2026-10-17
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import urllib.request
+
+from src.feature_cache import file_digest
+
+
+def uci_name(id):
+    """The store name of a UCI repository dataset"""
+    return f"uci-{id}"
+
+
+class DatasetStore:
+    """
+    A local, content-addressed store of raw dataset downloads.
+
+    Every download is kept once under the SHA-256 digest of its bytes
+    (`objects/<first two hex digits>/<digest>`), and a named reference (`refs/<name>.json`)
+    records which object a dataset name resolves to, with its size, source and download time.
+    Objects and references are written to a temporary file and renamed into place, so an
+    interrupted write never leaves a partial file under a final name.
+
+    Parameters
+    ----------
+    root : str
+        Directory of the store; created if missing.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "refs"), exist_ok=True)
+
+    def _write(self, path, data):
+        """Writes bytes to `path` through a temporary file in the same directory"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def object_path(self, digest):
+        """The path of the object with this digest"""
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _ref_path(self, name):
+        return os.path.join(self.root, "refs", f"{name}.json")
+
+    def put(self, data, name, source=None):
+        """
+        Stores raw bytes and points `name` at them.
+
+        Parameters
+        ----------
+        data : bytes
+            The raw download.
+        name : str
+            The dataset name, e.g. `uci_name(45)`.
+        source : str, optional
+            Where the bytes came from, kept in the reference.
+
+        Returns
+        -------
+        str
+            The SHA-256 hex digest of `data`.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        if not os.path.exists(self.object_path(digest)):
+            self._write(self.object_path(digest), data)
+        ref = {"sha256": digest, "size": len(data), "source": source,
+               "stored_at": time.strftime("%Y-%m-%dT%H:%M:%S")}
+        self._write(self._ref_path(name), json.dumps(ref, indent=2).encode())
+        return digest
+
+    def fetch(self, location, name, timeout=60):
+        """
+        Downloads a file or URL into the store under `name`.
+
+        Parameters
+        ----------
+        location : str
+            A local path, or a URL that `urllib` opens (`http://`, `https://`, `file://`).
+        name : str
+            The dataset name.
+        timeout : float, optional
+            Seconds to wait for a URL to respond.
+
+        Returns
+        -------
+        str
+            The SHA-256 hex digest of the downloaded bytes.
+        """
+        if "://" not in location:
+            with open(location, "rb") as f:
+                return self.put(f.read(), name, source=os.path.abspath(location))
+        with urllib.request.urlopen(location, timeout=timeout) as response:
+            return self.put(response.read(), name, source=location)
+
+    def ref(self, name):
+        """The reference of `name`, or None if it is not in the store"""
+        if not os.path.exists(self._ref_path(name)):
+            return None
+        with open(self._ref_path(name)) as f:
+            return json.load(f)
+
+    def __contains__(self, name):
+        return self.ref(name) is not None
+
+    def resolve(self, name, verify=True):
+        """
+        Returns the path of the object `name` points at.
+
+        Parameters
+        ----------
+        name : str
+            The dataset name.
+        verify : bool, optional
+            Recompute the object's checksum and compare it with the reference.
+
+        Returns
+        -------
+        str
+            The object path.
+
+        Raises
+        ------
+        KeyError
+            If `name` is not in the store.
+        ValueError
+            If the object is missing or its contents no longer match its checksum.
+        """
+        ref = self.ref(name)
+        if ref is None:
+            raise KeyError(f"Dataset {name!r} is not in the store at {self.root}.")
+        path = self.object_path(ref["sha256"])
+        if not os.path.exists(path):
+            raise ValueError(f"The object of dataset {name!r} is missing from the store.")
+        if verify and file_digest(path) != ref["sha256"]:
+            raise ValueError(f"The object of dataset {name!r} does not match its checksum {ref['sha256']}.")
+        return path
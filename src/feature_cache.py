@@ -0,0 +1,291 @@
+# feature_cache.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import contextlib  # For the staged-write context manager
+import hashlib  # For content hashes
+import os  # For file path operations
+import pickle  # For hashing fitted transformer state
+import shutil  # For discarding incomplete cache entries
+import tempfile  # For writing cache entries atomically
+
+# Data Manipulation
+import numpy as np  # For .npy files and memory maps
+import pandas as pd  # For reading CSV files and hashing frames
+from scipy import sparse  # For storing sparse encoder output
+
+# Machine Learning
+from sklearn.base import BaseEstimator  # For describing transformer configurations
+
+from src.data_loader import load_heart_data  # For reading data files in the compact dtypes of training
+from src.storage import booleans_as_objects  # For passing boolean columns to scikit-learn
+
+
+def file_digest(path, chunk_size=2**20):
+    """
+    Return the SHA-256 hex digest of a file, read in chunks.
+
+    Parameters
+    ----------
+    path : str
+        The file to hash.
+    chunk_size : int, optional
+        Number of bytes read at a time.
+
+    Returns
+    -------
+    str
+        The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_digest(X, y=None):
+    """
+    Return a SHA-256 hex digest of the contents of a feature frame and its labels.
+
+    Parameters
+    ----------
+    X : pandas.DataFrame
+        The feature set.
+    y : pandas.Series or pandas.DataFrame, optional
+        The target variable.
+
+    Returns
+    -------
+    str
+        The hex digest of the column names and row hashes.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr(list(X.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    if y is not None:
+        labels = pd.DataFrame(np.asarray(y).reshape(len(X), -1))
+        digest.update(pd.util.hash_pandas_object(labels, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def splits_digest(splits):
+    """
+    Return a SHA-256 hex digest of materialized cross-validation splits.
+
+    Splitters are hashed by the indices they produced rather than their repr, which is the
+    same for two shuffling splitters without a fixed `random_state`.
+
+    Parameters
+    ----------
+    splits : list of (numpy.ndarray, numpy.ndarray)
+        The training and validation row indices of each fold.
+
+    Returns
+    -------
+    str
+    """
+    digest = hashlib.sha256()
+    for train_idx, test_idx in splits:
+        digest.update(np.asarray(train_idx, dtype=np.int64).tobytes() + b"|")
+        digest.update(np.asarray(test_idx, dtype=np.int64).tobytes() + b"/")
+    return digest.hexdigest()
+
+
+def _describe(value):
+    """Describe a parameter value without relying on the (possibly truncated) estimator repr."""
+    if isinstance(value, BaseEstimator):
+        return type(value).__name__
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _describe(item) for key, item in sorted(value.items())}
+    return repr(value)
+
+
+def transformer_digest(transformer, include_state=False):
+    """
+    Return a SHA-256 hex digest of a transformer's configuration, and optionally of its fitted state.
+
+    The configuration is taken from `get_params(deep=True)`, so two
+    `make_column_transformer` setups with the same steps, parameters and columns share
+    a digest. With `include_state=True` the pickled transformer is hashed too, so the
+    digest also identifies what a fitted transformer was fitted on.
+
+    Parameters
+    ----------
+    transformer : sklearn.base.BaseEstimator
+        The transformer (e.g. a ColumnTransformer or the preprocessing part of a pipeline).
+    include_state : bool, optional, default=False
+        Whether to hash the fitted state as well as the configuration.
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(type(transformer).__name__.encode())
+    digest.update(repr(_describe(transformer.get_params(deep=True))).encode())
+    if include_state:
+        digest.update(pickle.dumps(transformer))
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def staged_entry(entry_dir):
+    """
+    Build a cache entry in a temporary sibling directory and rename it into place on success.
+
+    Readers never see a half-written entry, and an interrupted write leaves nothing behind.
+
+    Parameters
+    ----------
+    entry_dir : str
+        The cache entry directory to create.
+
+    Yields
+    ------
+    str
+        The staging directory to write the entry's files into.
+    """
+    parent = os.path.dirname(entry_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging_", dir=parent)
+    try:
+        yield staging
+        os.replace(staging, entry_dir)
+    except OSError:
+        # Another process may have completed the same entry first
+        if not os.path.isdir(entry_dir):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def save_array(path, array):
+    """Save an array as `.npy`, densifying sparse input and storing strings fixed-width so it can be memory-mapped."""
+    if sparse.issparse(array):
+        array = array.toarray()
+    array = np.asarray(array)
+    np.save(path, array.astype(str) if array.dtype == object else array)
+
+
+def save_matrix(directory, name, matrix):
+    """
+    Save a feature matrix under `name`, keeping sparse matrices sparse.
+
+    Dense matrices are written as `<name>.npy`. Sparse matrices are written in CSR form
+    as `<name>.data.npy`, `<name>.indices.npy`, `<name>.indptr.npy` and `<name>.shape.npy`,
+    so the stored size follows the number of non-zero entries.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to write into.
+    name : str
+        The matrix name (without extension).
+    matrix : numpy.ndarray or scipy.sparse matrix
+        The matrix to store.
+    """
+    if not sparse.issparse(matrix):
+        save_array(os.path.join(directory, f"{name}.npy"), matrix)
+        return
+    matrix = matrix.tocsr()
+    for part in ("data", "indices", "indptr"):
+        np.save(os.path.join(directory, f"{name}.{part}.npy"), getattr(matrix, part))
+    np.save(os.path.join(directory, f"{name}.shape.npy"), np.asarray(matrix.shape, dtype=np.int64))
+
+
+def load_matrix(directory, name):
+    """
+    Open a matrix written by `save_matrix` without reading it into memory.
+
+    Returns a read-only `numpy.memmap` for dense matrices, and a `scipy.sparse.csr_matrix`
+    whose data, indices and index pointers are memory maps for sparse ones.
+    """
+    path = os.path.join(directory, f"{name}.npy")
+    if os.path.exists(path):
+        return np.load(path, mmap_mode="r")
+    data, indices, indptr = (np.load(os.path.join(directory, f"{name}.{part}.npy"), mmap_mode="r")
+                             for part in ("data", "indices", "indptr"))
+    shape = tuple(np.load(os.path.join(directory, f"{name}.shape.npy")))
+    return sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+
+
+def write_entry(entry_dir, arrays):
+    """
+    Write named arrays as `.npy` files into a cache entry, atomically.
+
+    Parameters
+    ----------
+    entry_dir : str
+        The cache entry directory to create.
+    arrays : dict of str to numpy.ndarray or scipy.sparse matrix
+        The arrays to store, keyed by file name (without `.npy`). Sparse matrices stay
+        sparse, see `save_matrix`.
+    """
+    with staged_entry(entry_dir) as staging:
+        for name, array in arrays.items():
+            save_matrix(staging, name, array)
+
+
+def read_entry(entry_dir, names):
+    """
+    Open the named arrays of a cache entry as read-only memory maps.
+
+    Parameters
+    ----------
+    entry_dir : str
+        The cache entry directory.
+    names : list of str
+        The arrays to open.
+
+    Returns
+    -------
+    list of numpy.memmap or scipy.sparse.csr_matrix
+        One memory map (or CSR matrix over memory maps) per name, in the order given.
+    """
+    return [load_matrix(entry_dir, name) for name in names]
+
+
+def encode_cached(transformer, data_path, cache_dir, target="Diagnosis of heart disease"):
+    """
+    Encode a CSV file with a fitted transformer, caching the result as memory-mapped `.npy` files.
+
+    The cache key combines the SHA-256 of the CSV file and of the fitted transformer. On a
+    cache hit the CSV is not even parsed: the encoded float matrix and the labels are
+    opened with `mmap_mode="r"`. Float matrices keep their dtype and sparse matrices stay
+    sparse, so a float32 or sparse preprocessor is cached at its own size.
+
+    Parameters
+    ----------
+    transformer : sklearn.base.BaseEstimator
+        A fitted transformer, e.g. `pipeline[:-1]` of the saved disease pipeline.
+    data_path : str
+        The CSV, Parquet or Arrow file to encode.
+    cache_dir : str
+        The directory holding the cache entries.
+    target : str, optional
+        Name of the label column.
+
+    Returns
+    -------
+    X_encoded : numpy.memmap or scipy.sparse.csr_matrix
+        The encoded feature matrix, shape (n_rows, n_features).
+    y : numpy.memmap
+        The labels, shape (n_rows,).
+    """
+    key = hashlib.sha256(
+        (file_digest(data_path) + transformer_digest(transformer, include_state=True)).encode()
+    ).hexdigest()
+    entry_dir = os.path.join(cache_dir, f"encoded-{key[:32]}")
+    if not os.path.isdir(entry_dir):
+        data = booleans_as_objects(load_heart_data(data_path)[0])
+        X, y = data.drop(columns=target), data[target].to_numpy()
+        encoded = transformer.transform(X)
+        if encoded.dtype.kind != "f":
+            encoded = encoded.astype(np.float64)
+        write_entry(entry_dir, {"features": encoded, "labels": y})
+    return tuple(read_entry(entry_dir, ["features", "labels"]))
@@ -0,0 +1,161 @@
+# feature_importance.py
+# author: agent
+# date: 2026-10-17
+
+from functools import partial
+import numpy as np
+import pandas as pd
+from joblib import Parallel, cpu_count, delayed
+from scipy import sparse
+from sklearn.metrics import check_scoring
+from sklearn.utils import check_random_state
+from src.model_eval import METRICS
+
+
+def feature_groups(preprocessor):
+    """
+    Maps each input feature of a fitted preprocessor to the encoded columns it produces
+
+    Output names are matched to input names with any `<transformer>__` prefix removed: a column
+    belongs to the feature it is named after, or to the longest feature name it starts with
+    followed by "_" (one-hot columns are named `<feature>_<category>`).
+
+    Parameters
+    ----------
+    preprocessor : sklearn transformer
+        A fitted preprocessor with `feature_names_in_` and `get_feature_names_out`, such as
+        a ColumnTransformer or a FusedPreprocessor
+
+    Returns
+    -------
+    dict of str to numpy.ndarray
+        Encoded column positions per input feature, in input order. Features without encoded
+        columns (dropped by the preprocessor) are left out
+    """
+    features = [str(feature) for feature in preprocessor.feature_names_in_]
+    groups = {feature: [] for feature in features}
+    for position, name in enumerate(preprocessor.get_feature_names_out()):
+        name = str(name).split("__", 1)[-1]
+        matches = [feature for feature in features if name == feature or name.startswith(feature + "_")]
+        if not matches:
+            raise ValueError(f"Encoded column {name!r} does not match any input feature.")
+        groups[max(matches, key=len)].append(position)
+    return {feature: np.array(columns) for feature, columns in groups.items() if columns}
+
+
+def repeat_permutations(n_rows, n_repeats, random_state=None):
+    """
+    Returns the row order of every repeat, as `sklearn.inspection.permutation_importance` draws them
+
+    sklearn shuffles each column again on every repeat, so repeat `r` applies the composition of
+    the first `r + 1` shuffles; the same orders are used for every feature.
+
+    Returns
+    -------
+    numpy.ndarray
+        An (n_repeats, n_rows) array of row indices
+    """
+    random_state = check_random_state(random_state)
+    generator = check_random_state(random_state.randint(np.iinfo(np.int32).max + 1))
+    shuffling_idx, order = np.arange(n_rows), np.arange(n_rows)
+    orders = np.empty((n_repeats, n_rows), dtype=np.intp)
+    for r in range(n_repeats):
+        generator.shuffle(shuffling_idx)
+        order = order[shuffling_idx]
+        orders[r] = order
+    return orders
+
+
+def _count_score(metric, pos_label, estimator, X, y):
+    """Scores the predictions of `estimator` with a metric from `METRICS`, from its four outcome counts"""
+    actual, predicted = np.asarray(y) == pos_label, np.asarray(estimator.predict(X)) == pos_label
+    tp, fp = np.count_nonzero(actual & predicted), np.count_nonzero(~actual & predicted)
+    fn = np.count_nonzero(actual & ~predicted)
+    return float(METRICS[metric][1](tp, fp, fn, len(actual) - tp - fp - fn))
+
+
+def _permuted_scores(estimator, X_encoded, y, groups, orders, scorer):
+    """Scores every feature group permuted by each of `orders`, on one private copy of the matrix"""
+    X = X_encoded.copy()
+    scores = np.empty((len(groups), len(orders)))
+    for g, columns in enumerate(groups):
+        original = X_encoded[:, columns]
+        for r, order in enumerate(orders):
+            X[:, columns] = original[order]
+            scores[g, r] = scorer(estimator, X, y)
+        X[:, columns] = original
+    return scores
+
+
+def permutation_importance_encoded(pipeline, X, y, scoring=None, pos_label='> 50% diameter narrowing', n_repeats=5,
+                                   n_jobs=None, random_state=None):
+    """
+    Computes permutation importance of the input features of a fitted pipeline on its encoded matrix
+
+    The preprocessing step transforms `X` once. Each input feature is then permuted by permuting
+    its block of encoded columns (all the one-hot columns of a categorical feature move together,
+    which is the encoding of the permuted feature), and only the rest of the pipeline is scored.
+    The repeats are split into one batch per worker; each worker permutes columns in place on its
+    own copy of the encoded matrix and restores them afterwards. With the same `random_state` the
+    importances equal those of `sklearn.inspection.permutation_importance` on the raw features.
+
+    Parameters
+    ----------
+    pipeline : sklearn.pipeline.Pipeline
+        The fitted pipeline; its first step is the preprocessor
+    X : pandas.DataFrame
+        The feature-data, typically the test set
+    y : pandas.DataFrame or pandas.Series
+        The target labels
+    scoring : str or callable, optional
+        A metric from `src.model_eval.METRICS` (scored from the outcome counts, which is much
+        faster than sklearn's metrics on string labels), or any sklearn scoring; defaults to
+        the estimator's `score`
+    pos_label : str, optional
+        The positive class of a metric from `METRICS`
+    n_repeats : int, optional
+        Number of permutations per feature
+    n_jobs : int, optional
+        Number of workers; None means 1, -1 means all cores
+    random_state : int, optional
+        Seed of the permutations
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per input feature, sorted by decreasing mean importance, with the number of
+        encoded columns, the mean and standard deviation of the importance (the drop from the
+        baseline score) and the importance of every repeat (`repeat_0`, `repeat_1`, ...).
+        The baseline score is stored in `attrs["baseline_score"]`
+    """
+    preprocessor, estimator = pipeline[0], pipeline[1:]
+    y = np.asarray(y).ravel()
+    X_encoded = preprocessor.transform(X)
+    # Row permutations of column blocks need a dense matrix; a test set fits in memory
+    X_encoded = np.asarray(X_encoded.toarray() if sparse.issparse(X_encoded) else X_encoded)
+    groups = feature_groups(preprocessor)
+    if isinstance(scoring, str) and scoring in METRICS:
+        scorer = partial(_count_score, scoring, pos_label)
+    else:
+        scorer = check_scoring(estimator, scoring=scoring)
+    baseline = scorer(estimator, X_encoded, y)
+
+    orders = repeat_permutations(len(y), n_repeats, random_state)
+    n_workers = min(n_repeats, cpu_count() if n_jobs == -1 else (n_jobs or 1))
+    batches = [batch for batch in np.array_split(np.arange(n_repeats), n_workers) if len(batch)]
+    scores = Parallel(n_jobs=n_workers)(
+        delayed(_permuted_scores)(estimator, X_encoded, y, list(groups.values()), orders[batch], scorer)
+        for batch in batches
+    )
+    importances = baseline - np.hstack(scores)
+
+    table = pd.DataFrame({
+        "feature": list(groups),
+        "n_columns": [len(columns) for columns in groups.values()],
+        "importance_mean": importances.mean(axis=1),
+        "importance_std": importances.std(axis=1),
+    })
+    table = pd.concat([table, pd.DataFrame(importances, columns=[f"repeat_{r}" for r in range(n_repeats)])], axis=1)
+    table = table.sort_values("importance_mean", ascending=False, kind="stable").reset_index(drop=True)
+    table.attrs["baseline_score"] = baseline
+    return table
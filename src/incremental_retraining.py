@@ -0,0 +1,277 @@
+# incremental_retraining.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import hashlib  # For hashing the previously seen part of the training file
+import os  # For file sizes
+import pickle  # For saving the retraining state
+import time  # For timing the search and the refit
+
+# Data Manipulation
+import numpy as np  # For coefficient arrays and the C neighborhood
+
+# Machine Learning
+from sklearn.base import clone  # For unfitted copies of the previous classifier
+from sklearn.pipeline import make_pipeline  # For the retrained pipeline
+
+from src.feature_cache import file_digest  # For fingerprinting the training file
+from src.fused_preprocessor import FusedPreprocessor  # For the per-fold preprocessing of the search
+from src.model_tuning import RegularizationPathSearchCV  # For the warm-started C search
+from src.streaming_training import StreamingStatistics  # For preprocessing statistics updated row batch by row batch
+
+
+def file_fingerprint(path, n_rows):
+    """
+    Return the size, SHA-256 digest and row count of a data file.
+
+    Parameters
+    ----------
+    path : str
+        The data file.
+    n_rows : int
+        The number of data rows in the file.
+
+    Returns
+    -------
+    dict
+        With keys "size", "sha256" and "rows".
+    """
+    return {"size": os.path.getsize(path), "sha256": file_digest(path), "rows": int(n_rows)}
+
+
+def prefix_digest(path, n_bytes, chunk_size=2**20):
+    """Return the SHA-256 hex digest of the first `n_bytes` bytes of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = n_bytes
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def is_append(path, fingerprint):
+    """
+    Whether a file is the fingerprinted file with zero or more bytes appended.
+
+    Parameters
+    ----------
+    path : str
+        The current data file.
+    fingerprint : dict
+        The `file_fingerprint` of an earlier version of the file.
+
+    Returns
+    -------
+    bool
+        True if the file starts with exactly the fingerprinted bytes.
+    """
+    return (os.path.getsize(path) >= fingerprint["size"]
+            and prefix_digest(path, fingerprint["size"]) == fingerprint["sha256"])
+
+
+def _output_name(name):
+    """Strip the step prefix a ColumnTransformer adds to output feature names (`pipeline-1__Sex_male`)."""
+    return str(name).split("__", 1)[-1]
+
+
+def map_coefficients(classifier, feature_names, new_feature_names):
+    """
+    Copy a fitted linear classifier onto a new feature encoding, matching columns by name.
+
+    Parameters
+    ----------
+    classifier : sklearn.linear_model.LogisticRegression
+        The fitted classifier.
+    feature_names : array-like of str
+        The encoded feature names `classifier` was fitted on.
+    new_feature_names : array-like of str
+        The encoded feature names of the new encoding.
+
+    Returns
+    -------
+    sklearn.linear_model.LogisticRegression
+        An unfitted copy of `classifier` holding its coefficients in the new column order
+        as `coef_` and `intercept_`. Columns without a counterpart (e.g. new categories)
+        get a zero coefficient.
+    """
+    position = {name: j for j, name in enumerate(feature_names)}
+    coef = np.zeros((classifier.coef_.shape[0], len(new_feature_names)))
+    for j, name in enumerate(new_feature_names):
+        if name in position:
+            coef[:, j] = classifier.coef_[:, position[name]]
+    mapped = clone(classifier)
+    mapped.coef_, mapped.intercept_ = coef, classifier.intercept_.copy()
+    return mapped
+
+
+class RetrainingState:
+    """
+    What `incremental_retrain` needs from the previous training run.
+
+    Parameters
+    ----------
+    fingerprint : dict
+        The `file_fingerprint` of the training file the state covers.
+    statistics : StreamingStatistics
+        The preprocessing statistics of every row of that file.
+    classifier : sklearn.linear_model.LogisticRegression
+        The fitted final step of the previous best pipeline.
+    feature_names : list of str
+        The encoded feature names `classifier` was fitted on.
+    """
+
+    def __init__(self, fingerprint, statistics, classifier, feature_names):
+        self.fingerprint = fingerprint
+        self.statistics = statistics
+        self.classifier = classifier
+        self.feature_names = list(feature_names)
+
+    @classmethod
+    def from_training(cls, data_path, X, y, model, categorical_features, numeric_features, seed=None):
+        """
+        Record the state of a full training run.
+
+        Parameters
+        ----------
+        data_path : str
+            The training file `X` and `y` were read from.
+        X : pandas.DataFrame
+            The training features.
+        y : pandas.Series or pandas.DataFrame
+            The training labels.
+        model : sklearn.pipeline.Pipeline
+            The fitted best pipeline, whose first step is the preprocessor and whose last
+            step is a LogisticRegression.
+        categorical_features, numeric_features : list of str
+            The feature groups of the preprocessor.
+        seed : int, optional
+            Seed for the median sampling of the statistics.
+
+        Returns
+        -------
+        RetrainingState
+        """
+        statistics = StreamingStatistics(categorical_features, numeric_features, seed=seed)
+        statistics.update(X, np.asarray(y).ravel())
+        feature_names = [_output_name(name) for name in model[:-1].get_feature_names_out()]
+        return cls(file_fingerprint(data_path, len(X)), statistics, model[-1], feature_names)
+
+    def new_rows(self, data_path, n_rows):
+        """
+        The number of rows appended to the training file since the state was recorded.
+
+        Parameters
+        ----------
+        data_path : str
+            The current training file.
+        n_rows : int
+            The number of data rows read from it, so rows with quoted line breaks count once.
+
+        Returns
+        -------
+        int or None
+            None when the file was changed other than by appending rows.
+        """
+        if not is_append(data_path, self.fingerprint):
+            return None
+        return int(n_rows) - self.fingerprint["rows"]
+
+    def save(self, path):
+        """Pickle the state to `path`."""
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path):
+        """Load a state saved with `save`."""
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+def incremental_retrain(state, data_path, X, y, scoring=None, width=0.5, n_Cs=5, cv=5, n_jobs=None,
+                        shared_dir=None):
+    """
+    Retrain the logistic-regression pipeline after rows were appended to the training file.
+
+    Only the appended rows are added to the preprocessing statistics. The search covers
+    `n_Cs` values of `C` within `width` decades either side of the previous best `C`,
+    and every fit, on each fold and on all rows, is warm-started from the previous
+    coefficients. `state` is updated in place to cover the current file.
+
+    Parameters
+    ----------
+    state : RetrainingState
+        The state of the previous run. The file must be an append of the one it covers
+        (see `RetrainingState.new_rows`).
+    data_path : str
+        The current training file.
+    X : pandas.DataFrame
+        Every row of the current training file, in file order, without the label column.
+    y : pandas.Series or pandas.DataFrame
+        The labels of `X`.
+    scoring : str or callable, optional
+        The metric used to rank the values of `C`.
+    width : float, optional, default=0.5
+        Half-width of the searched neighborhood in decades of `C`.
+    n_Cs : int, optional, default=5
+        The number of values of `C` searched.
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy.
+    n_jobs : int, optional
+        Number of folds walked in parallel.
+    shared_dir : str, optional
+        Directory for memory-mapped fold matrices.
+
+    Returns
+    -------
+    pipeline : sklearn.pipeline.Pipeline
+        The FusedPreprocessor built from the updated statistics and the refitted
+        LogisticRegression.
+    search : RegularizationPathSearchCV
+        The fitted neighborhood search.
+    summary : dict
+        Previous, new and total row counts, the previous and chosen `C`, and the seconds
+        spent on the statistics, the search and the refit.
+    """
+    previous_rows = state.fingerprint["rows"]
+    if len(X) < previous_rows:
+        raise ValueError(f"{data_path} has {len(X)} rows, fewer than the {previous_rows} already seen.")
+    y = np.asarray(y).ravel()
+    statistics = state.statistics
+
+    start = time.perf_counter()
+    statistics.update(X.iloc[previous_rows:], y[previous_rows:])
+    preprocessor = statistics.preprocessor()
+    feature_names = list(preprocessor.get_feature_names_out())
+    init = map_coefficients(state.classifier, state.feature_names, feature_names)
+    statistics_seconds = time.perf_counter() - start
+
+    previous_C = state.classifier.C
+    estimator = make_pipeline(FusedPreprocessor(statistics.categorical_features, statistics.numeric_features),
+                              clone(state.classifier))
+    search = RegularizationPathSearchCV(estimator, Cs=previous_C * np.logspace(-width, width, n_Cs),
+                                        scoring=scoring, cv=cv, n_jobs=n_jobs, shared_dir=shared_dir,
+                                        init=init, refit=False)
+    start = time.perf_counter()
+    search.fit(X, y)
+    search_seconds = time.perf_counter() - start
+
+    # Refit on every row with the incrementally updated preprocessor instead of a second pass over X
+    C = search.best_params_[f"{estimator.steps[-1][0]}__C"]
+    start = time.perf_counter()
+    classifier = clone(state.classifier).set_params(C=C, warm_start=True)
+    classifier.coef_, classifier.intercept_ = init.coef_, init.intercept_
+    classifier.fit(preprocessor.transform(X), y).set_params(warm_start=state.classifier.warm_start)
+    refit_seconds = time.perf_counter() - start
+
+    state.fingerprint = file_fingerprint(data_path, len(X))
+    state.classifier, state.feature_names = classifier, feature_names
+    summary = {"previous_rows": previous_rows, "new_rows": len(X) - previous_rows, "rows": len(X),
+               "previous_C": previous_C, "C": C, "statistics_seconds": statistics_seconds,
+               "search_seconds": search_seconds, "refit_seconds": refit_seconds}
+    return make_pipeline(preprocessor, classifier), search, summary
@@ -3,15 +3,135 @@
 # date: 2024-12-15
 
 import os
+import numpy as np
 import pandas as pd
-from sklearn.metrics import f1_score, recall_score
 
-def eval_model(model, X_train, y_train, X_test, y_test):
+
+def _safe_divide(numerator, denominator):
+    """Element-wise division that returns 0 where the denominator is 0, as sklearn's zero_division=0 does."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape),
+                     where=denominator != 0)
+
+
+# Metrics derived from the binary confusion-matrix counts (tp, fp, fn, tn). Each function
+# works element-wise, so it accepts scalars or arrays of counts alike.
+METRICS = {
+    "f1": ("F1 Score", lambda tp, fp, fn, tn: _safe_divide(2 * tp, 2 * tp + fp + fn)),
+    "recall": ("Recall", lambda tp, fp, fn, tn: _safe_divide(tp, tp + fn)),
+    "accuracy": ("Accuracy", lambda tp, fp, fn, tn: _safe_divide(tp + tn, tp + fp + fn + tn)),
+    "precision": ("Precision", lambda tp, fp, fn, tn: _safe_divide(tp, tp + fp)),
+    "specificity": ("Specificity", lambda tp, fp, fn, tn: _safe_divide(tn, tn + fp)),
+    "npv": ("Negative Predictive Value", lambda tp, fp, fn, tn: _safe_divide(tn, tn + fn)),
+    "balanced_accuracy": ("Balanced Accuracy", lambda tp, fp, fn, tn: 
+                          (_safe_divide(tp, tp + fn) + _safe_divide(tn, tn + fp)) / 2),
+}
+
+
+def confusion_counts(y_true, y_pred):
+    """
+    Build the confusion matrix of a set of predictions in a single vectorized pass.
+
+    Parameters
+    ----------
+    y_true : array-like
+        The true labels.
+    y_pred : array-like
+        The predicted labels.
+
+    Returns
+    -------
+    confusion : numpy.ndarray
+        Counts with true labels along rows and predicted labels along columns.
+    labels : numpy.ndarray
+        The sorted labels indexing the rows and columns, as in `sklearn.metrics.confusion_matrix`.
+    """
+    y_true, y_pred = np.asarray(y_true).ravel(), np.asarray(y_pred).ravel()
+    labels, codes = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+    n_labels = len(labels)
+    true_codes, pred_codes = codes[:len(y_true)], codes[len(y_true):]
+    confusion = np.bincount(true_codes * n_labels + pred_codes, minlength=n_labels ** 2)
+    return confusion.reshape(n_labels, n_labels), labels
+
+
+def binary_counts(confusion, labels, pos_label):
     """
-    Evaluates a classification model given a predetermined set of evaluation metrics, and returns a data frame of the model's score
+    Collapse a confusion matrix into true/false positive/negative counts for one positive class.
+
+    Parameters
+    ----------
+    confusion : numpy.ndarray
+        The confusion matrix returned by `confusion_counts`.
+    labels : numpy.ndarray
+        The labels indexing `confusion`.
+    pos_label : str
+        The positive class.
+
+    Returns
+    -------
+    tuple of int
+        The counts (tp, fp, fn, tn).
+    """
+    matches = np.flatnonzero(labels == pos_label)
+    if len(matches) == 0:
+        tp = fp = fn = 0
+    else:
+        pos = matches[0]
+        tp = confusion[pos, pos]
+        fp = confusion[:, pos].sum() - tp
+        fn = confusion[pos, :].sum() - tp
+    tn = confusion.sum() - tp - fp - fn
+    return tp, fp, fn, tn
+
+
+def bootstrap_intervals(counts, metrics, n_resamples=10000, confidence=0.95, random_state=None):
+    """
+    Compute percentile bootstrap confidence intervals for confusion-matrix metrics, fully vectorized.
+
+    Resampling the predictions with replacement and re-counting outcomes is the same as drawing
+    the four counts (tp, fp, fn, tn) from a multinomial with the observed proportions, so all
+    resamples are drawn at once as one (n_resamples, 4) count matrix. Every metric is then
+    evaluated on whole columns, with no Python loop per resample and no per-row work.
+
+    Parameters
+    ----------
+    counts : tuple of int
+        The observed counts (tp, fp, fn, tn), as returned by `binary_counts`.
+    metrics : list of str
+        Names of the metrics from `METRICS`.
+    n_resamples : int, optional
+        Number of bootstrap resamples.
+    confidence : float, optional
+        Confidence level of the intervals.
+    random_state : int or numpy.random.Generator, optional
+        Seed for reproducible resampling.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (len(metrics), 2) with the lower and upper bound of each interval.
+    """
+    rng = np.random.default_rng(random_state)
+    counts = np.asarray(counts, dtype=float)
+    total = int(counts.sum())
+    resampled = rng.multinomial(total, counts / total, size=n_resamples)
+    tp, fp, fn, tn = resampled.T
+
+    alpha = 1 - confidence
+    values = np.stack([METRICS[name][1](tp, fp, fn, tn) for name in metrics], axis=1)
+    return np.quantile(values, [alpha / 2, 1 - alpha / 2], axis=0).T
+
+
+def eval_model(model, X_train, y_train, X_test, y_test, metrics=None, pos_label='> 50% diameter narrowing',
+               return_confusion=False, n_bootstrap=0, confidence=0.95, random_state=None):
+    """
+    Evaluates a classification model given a set of evaluation metrics, and returns a data frame of the model's score
 
     This function evaluates the input model, which has been previously trained on the input train data.
-    The function then scores the model based on the following predetermined criteria: F1 score, recall and accuracy. The model is scored on both input train and input test data, and the final results are compiled in a dataframe which is returned by the function.
+    Each split is predicted once and summarized in one confusion matrix, from which every requested metric
+    (by default F1 score, recall and accuracy) is derived. The model is scored on both input train and input
+    test data, and the final results are compiled in a dataframe which is returned by the function.
 
     Parameters
     ----------
@@ -30,10 +150,34 @@ def eval_model(model, X_train, y_train, X_test, y_test):
     y_test : pandas.DataFrame
         The DataFrame containing target-data used for final model evaluation
 
+    metrics : list of str, optional
+        Names of the metrics to report, in order, from `METRICS`: "f1", "recall", "accuracy",
+        "precision", "specificity", "npv" and "balanced_accuracy". Defaults to ["f1", "recall", "accuracy"].
+
+    pos_label : str, optional
+        The positive class for the binary metrics
+
+    return_confusion : bool, optional
+        If True, also return the confusion matrix and its labels for each split
+
+    n_bootstrap : int, optional
+        Number of bootstrap resamples used for confidence intervals. If 0 (default), only point
+        estimates are reported
+
+    confidence : float, optional
+        Confidence level of the bootstrap intervals
+
+    random_state : int, optional
+        Seed for the bootstrap resampling
+
     Returns
     -------
     pandas.DataFrame
-        A data frame containing model F1 score, recall and accuracy for train and test data
+        A data frame containing the requested metrics for train and test data, followed by
+        "<split> CI Lower" and "<split> CI Upper" columns when `n_bootstrap` is positive
+
+    dict, optional
+        Only if `return_confusion` is True: {"Train": (confusion, labels), "Test": (confusion, labels)}
     """
     #Check that all input data are data frames
     if not isinstance(X_train, pd.DataFrame):
@@ -52,26 +196,34 @@ def eval_model(model, X_train, y_train, X_test, y_test):
     if X_train.empty:
         raise ValueError("Dataframe must contain observations.")
     
-    if X_train.empty:
+    if X_test.empty:
         raise ValueError("Dataframe must contain observations.")
+
+    if metrics is None:
+        metrics = ["f1", "recall", "accuracy"]
+    unknown = [name for name in metrics if name not in METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics {unknown}. Available metrics: {list(METRICS)}")
     
-    train_predictions = model.predict(X_train)
-    test_predictions = model.predict(X_test)
-    
-    metrics_df = pd.DataFrame({
-        'Metric': ['F1 Score', 'Recall', 'Accuracy'],
-        'Train': [
-            f1_score(y_train, train_predictions, average='binary', pos_label='> 50% diameter narrowing'),
-            recall_score(y_train, train_predictions, average='binary', pos_label='> 50% diameter narrowing'),
-            model.score(X_train, y_train),
-        ],
-        'Test': [
-            f1_score(y_test, test_predictions, average='binary', pos_label='> 50% diameter narrowing'),
-            recall_score(y_test, test_predictions, average='binary', pos_label='> 50% diameter narrowing'),
-            model.score(X_test, y_test),
-        ],
-    })
-    
-    return metrics_df.round(3)
+    # One inference pass and one confusion matrix per split
+    confusion = {
+        'Train': confusion_counts(y_train, model.predict(X_train)),
+        'Test': confusion_counts(y_test, model.predict(X_test)),
+    }
 
+    metrics_df = pd.DataFrame({'Metric': [METRICS[name][0] for name in metrics]})
+    counts = {split: binary_counts(matrix, labels, pos_label) for split, (matrix, labels) in confusion.items()}
+    for split, split_counts in counts.items():
+        metrics_df[split] = [float(METRICS[name][1](*split_counts)) for name in metrics]
 
+    if n_bootstrap > 0:
+        rng = np.random.default_rng(random_state)
+        for split, split_counts in counts.items():
+            intervals = bootstrap_intervals(split_counts, metrics, n_resamples=n_bootstrap, 
+                                            confidence=confidence, random_state=rng)
+            metrics_df[f'{split} CI Lower'] = intervals[:, 0]
+            metrics_df[f'{split} CI Upper'] = intervals[:, 1]
+    
+    if return_confusion:
+        return metrics_df.round(3), confusion
+    return metrics_df.round(3)
@@ -0,0 +1,624 @@
+# model_tuning.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import math  # For the halving schedule
+import time  # For timing fits and scoring
+
+# Data Manipulation
+import numpy as np  # For score arrays
+import pandas as pd  # For handling DataFrame operations
+from joblib import Parallel, delayed  # For running folds in parallel
+
+# Machine Learning
+from sklearn.base import BaseEstimator, clone  # For the search estimator and unfitted copies
+from sklearn.metrics import check_scoring  # For resolving the scoring argument
+from sklearn.model_selection import ParameterSampler, check_cv  # For drawing candidates and splitting folds
+from sklearn.utils import resample  # For stratified row subsamples
+from scipy.stats import loguniform  # For log-scale hyperparameter distributions
+
+from src.class_model_trainer import preprocess_folds, untransformed_folds
+from src.search_checkpoint import SearchCheckpoint, search_key
+
+
+def _initialize(estimator, init, n_features):
+    """Copy the coefficients of the fitted `init` into `estimator` when they have `n_features` columns."""
+    if init is not None and init.coef_.shape[1] == n_features:
+        estimator.coef_ = init.coef_.copy()
+        estimator.intercept_ = init.intercept_.copy()
+    return estimator
+
+
+def _fit_fold_path(estimator, Cs, fold, scorer, return_train_score, init=None, fold_index=0,
+                   checkpoint=None, completed=None):
+    """
+    Walk the C path on one fold, warm-starting each fit from the previous solution.
+
+    Values of C found in `completed` are not refitted: their recorded scores are reused
+    and their recorded coefficients start the next fit, exactly as the original fit did.
+    """
+    X_fit, y_fit, X_test, y_test = fold["X_train"], fold["y_train"], fold["X_test"], fold["y_test"]
+    estimator = _initialize(clone(estimator).set_params(warm_start=True), init, X_fit.shape[1])
+    completed = completed or {}
+    results = []
+    for position, C in enumerate(Cs):
+        if (position, fold_index) in completed:
+            result = completed[(position, fold_index)]
+            estimator.coef_, estimator.intercept_ = np.array(result["coef"]), np.array(result["intercept"])
+            results.append(result)
+            continue
+
+        start = time.time()
+        estimator.set_params(C=C).fit(X_fit, y_fit)
+        fit_time = time.time() - start
+
+        start = time.time()
+        test_score = scorer(estimator, X_test, y_test)
+        score_time = time.time() - start
+
+        result = {"fit_time": fit_time, "score_time": score_time, "test_score": test_score}
+        if return_train_score:
+            result["train_score"] = scorer(estimator, X_fit, y_fit)
+        if checkpoint is not None:
+            checkpoint.append(position, fold_index,
+                              {**result, "coef": estimator.coef_, "intercept": estimator.intercept_})
+        results.append(result)
+    return results
+
+
+def _cv_results(candidates, fold_results, return_train_score):
+    """Arrange per-fold, per-candidate results into a `RandomizedSearchCV.cv_results_` dictionary."""
+    results = {f"param_{name}": np.asarray([candidate[name] for candidate in candidates])
+               for name in candidates[0]}
+    results["params"] = candidates
+    for key in ["fit_time", "score_time"]:
+        values = np.array([[row[key] for row in fold] for fold in fold_results])
+        results[f"mean_{key}"] = values.mean(axis=0)
+        results[f"std_{key}"] = values.std(axis=0)
+
+    sets = ["test", "train"] if return_train_score else ["test"]
+    for split in sets:
+        scores = np.array([[row[f"{split}_score"] for row in fold] for fold in fold_results])
+        for k, fold_scores in enumerate(scores):
+            results[f"split{k}_{split}_score"] = fold_scores
+        results[f"mean_{split}_score"] = scores.mean(axis=0)
+        results[f"std_{split}_score"] = scores.std(axis=0)
+        if split == "test":
+            results["rank_test_score"] = pd.Series(-results["mean_test_score"]).rank(method="min").astype(int).to_numpy()
+    return results
+
+
+class RegularizationPathSearchCV(BaseEstimator):
+    """
+    Search the inverse regularization strength of a LogisticRegression pipeline along its path.
+
+    Each fold is preprocessed once, then the values in `Cs` are visited in increasing order
+    and every fit is warm-started from the coefficients of the previous (more regularized)
+    fit on the same fold. This replaces a randomized/grid search over `C` in which every
+    candidate refits the whole pipeline, preprocessor included, from scratch.
+
+    Warm-started fits stop at the solver tolerance from a different starting point, so
+    their scores can differ slightly from cold fits of the same `C` (by a few hundredths
+    of accuracy on small data), and the best `C` can then differ from a grid search's.
+    Ties are broken towards the smallest (most regularized) `C`, whereas
+    `RandomizedSearchCV` keeps the first tied candidate in sampling order.
+
+    The fitted object exposes the same `best_estimator_`, `best_params_`, `best_score_`
+    and `cv_results_` attributes as `sklearn.model_selection.RandomizedSearchCV`.
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        A pipeline whose last step is a `LogisticRegression` and whose earlier steps
+        preprocess the features.
+    Cs : array-like
+        The candidate values of `C`.
+    scoring : str or callable, optional
+        The metric used to rank candidates. Defaults to the estimator's `score` method.
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy.
+    n_jobs : int, optional
+        Number of folds walked in parallel. None means 1, -1 means all cores.
+    return_train_score : bool, optional, default=True
+        Whether to include training scores in `cv_results_`.
+    shared_dir : str, optional
+        Directory for memory-mapped fold matrices, so workers receive only fold indices.
+    init : sklearn.linear_model.LogisticRegression, optional
+        A fitted model whose coefficients start the path on every fold and the refit, e.g.
+        the previous best model when retraining on appended rows. Folds whose encoding
+        has a different number of columns start from zero as usual.
+    refit : bool, optional, default=True
+        Whether to refit the best pipeline on all of the data.
+    folds : list of dict, optional
+        Encoded folds already returned by `preprocess_folds` for the pipeline's
+        preprocessing step (e.g. `TrainingResult.folds` from `class_model_trainer`),
+        used instead of encoding `X` again; `cv` and `shared_dir` are then ignored.
+    checkpoint_dir : str, optional
+        Directory of the append-only checkpoint (see `src.search_checkpoint`). Every
+        C x fold result is written there with its coefficients as soon as it is known,
+        and a rerun on the same data, Cs, folds and metric resumes each fold's path from
+        the last recorded C, so the results equal those of an uninterrupted run.
+
+    Attributes
+    ----------
+    cv_results_ : dict of numpy.ndarray
+        Per-C scores in the layout of `RandomizedSearchCV.cv_results_`, sorted by `C`.
+    best_estimator_ : sklearn.pipeline.Pipeline
+        The pipeline refitted on all of the data with the best `C`. Only set when `refit=True`.
+    best_params_ : dict
+        The best `C`, keyed by its pipeline parameter name.
+    best_score_ : float
+        The mean cross-validated score of the best `C`.
+    best_index_ : int
+        Row of `cv_results_` holding the best `C`. Ties go to the smallest `C`.
+
+    Examples
+    --------
+    >>> search = RegularizationPathSearchCV(models["logreg_bal"], Cs=np.logspace(-5, 5, 50),
+    ...                                     scoring=custom_scorer, n_jobs=-1)
+    >>> search.fit(X_train, y_train)
+    >>> best_model = search.best_estimator_
+    """
+
+    def __init__(self, estimator, Cs, scoring=None, cv=5, n_jobs=None, return_train_score=True,
+                 shared_dir=None, init=None, refit=True, folds=None, checkpoint_dir=None):
+        self.estimator = estimator
+        self.Cs = Cs
+        self.scoring = scoring
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.return_train_score = return_train_score
+        self.shared_dir = shared_dir
+        self.init = init
+        self.refit = refit
+        self.folds = folds
+        self.checkpoint_dir = checkpoint_dir
+
+    def fit(self, X, y):
+        """
+        Run the path search on every fold and refit the best pipeline on all of `X`.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            The training feature set.
+        y : pandas.Series or pandas.DataFrame
+            The training target variable.
+
+        Returns
+        -------
+        RegularizationPathSearchCV
+            The fitted search.
+        """
+        # A single preprocessing step is used as is, so its encoded folds are shared with
+        # other callers of `preprocess_folds` that pass the same preprocessor
+        preprocessor = self.estimator[0] if len(self.estimator) == 2 else self.estimator[:-1]
+        step_name, classifier = self.estimator.steps[-1]
+        Cs = np.sort(np.asarray(self.Cs, dtype=float))
+        scorer = check_scoring(classifier, scoring=self.scoring)
+
+        folds = self.folds
+        if folds is None:
+            folds = preprocess_folds(preprocessor, X, y, cv=self.cv, shared_dir=self.shared_dir)
+
+        checkpoint, completed = None, {}
+        if self.checkpoint_dir is not None:
+            splits = self.cv if self.folds is None else [(fold["train_idx"], fold["test_idx"]) for fold in folds]
+            key = search_key(self.estimator, X, y, [{"C": C} for C in Cs], splits, self.scoring,
+                             self.return_train_score, None if self.init is None else self.init.coef_)
+            checkpoint = SearchCheckpoint(self.checkpoint_dir, key)
+            completed = checkpoint.completed()
+
+        fold_results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_fold_path)(classifier, Cs, fold, scorer, self.return_train_score, self.init,
+                                    k, checkpoint, completed)
+            for k, fold in enumerate(folds)
+        )
+
+        param_name = f"{step_name}__C"
+        self.cv_results_ = _cv_results([{param_name: C} for C in Cs], fold_results, self.return_train_score)
+        self.best_index_ = int(np.argmax(self.cv_results_["mean_test_score"]))
+        self.best_score_ = self.cv_results_["mean_test_score"][self.best_index_]
+        self.best_params_ = self.cv_results_["params"][self.best_index_]
+
+        self.n_splits_ = len(folds)
+        if not self.refit:
+            return self
+
+        start = time.time()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        if self.init is not None:
+            # Start the final fit from `init`, then restore the estimator's own warm_start setting
+            final = self.best_estimator_[-1]
+            warm_start = final.warm_start
+            preprocessor = self.best_estimator_[:-1].fit(X, y)
+            X_encoded = preprocessor.transform(X)
+            _initialize(final.set_params(warm_start=True), self.init, X_encoded.shape[1])
+            final.fit(X_encoded, np.asarray(y).ravel()).set_params(warm_start=warm_start)
+        else:
+            self.best_estimator_.fit(X, np.asarray(y).ravel())
+        self.refit_time_ = time.time() - start
+        return self
+
+
+def _fit_and_score_candidate(estimator, params, X, y, train_idx, test_idx, scorer, return_train_score,
+                             candidate, fold_index, checkpoint=None):
+    """Fit one candidate on one fold of the raw rows, score it and record the result."""
+    X_fit, y_fit = X.iloc[train_idx], y[train_idx]
+    estimator = clone(estimator).set_params(**params)
+
+    start = time.time()
+    estimator.fit(X_fit, y_fit)
+    fit_time = time.time() - start
+
+    start = time.time()
+    test_score = scorer(estimator, X.iloc[test_idx], y[test_idx])
+    score_time = time.time() - start
+
+    result = {"fit_time": fit_time, "score_time": score_time, "test_score": test_score}
+    if return_train_score:
+        result["train_score"] = scorer(estimator, X_fit, y_fit)
+    if checkpoint is not None:
+        checkpoint.append(candidate, fold_index, result)
+    return result
+
+
+def _fit_and_score_encoded(estimator, params, fold, scorer, return_train_score, candidate, fold_index,
+                           checkpoint=None):
+    """Fit one candidate's steps after the preprocessor on one encoded fold, score it and record the result."""
+    estimator = clone(estimator).set_params(**params)[1:]
+
+    start = time.time()
+    estimator.fit(fold["X_train"], fold["y_train"])
+    fit_time = time.time() - start
+
+    start = time.time()
+    test_score = scorer(estimator, fold["X_test"], fold["y_test"])
+    score_time = time.time() - start
+
+    result = {"fit_time": fit_time, "score_time": score_time, "test_score": test_score}
+    if return_train_score:
+        result["train_score"] = scorer(estimator, fold["X_train"], fold["y_train"])
+    if checkpoint is not None:
+        checkpoint.append(candidate, fold_index, result)
+    return result
+
+
+class ResumableRandomizedSearchCV(BaseEstimator):
+    """
+    Randomized search over a pipeline's parameters that can resume after an interruption.
+
+    Candidates are drawn and folds are split as in `sklearn.model_selection.RandomizedSearchCV`
+    with the same arguments, so both searches score the same candidates on the same
+    folds. Each candidate x fold result is appended to an on-disk checkpoint as soon
+    as it is known (see `src.search_checkpoint`), and a rerun on the same data, candidates,
+    folds and metric fits only the pairs that are missing.
+
+    Parameters
+    ----------
+    estimator : sklearn.pipeline.Pipeline
+        The pipeline to tune.
+    param_distributions : dict or list of dict
+        The search space, as in `RandomizedSearchCV`.
+    n_iter : int, optional, default=10
+        The number of candidates drawn.
+    scoring : str or callable, optional
+        The metric used to rank candidates. Defaults to the estimator's `score` method.
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy.
+    n_jobs : int, optional
+        Number of candidate x fold fits run in parallel. None means 1, -1 means all cores.
+    random_state : int, optional
+        Seed of the candidate sampling.
+    return_train_score : bool, optional, default=False
+        Whether to include training scores in `cv_results_`.
+    checkpoint_dir : str, optional
+        Directory of the append-only checkpoint. None disables checkpointing.
+    folds : list of dict, optional
+        Encoded folds already returned by `preprocess_folds` for the pipeline's first step
+        (e.g. `TrainingResult.folds` from `class_model_trainer`). Each candidate then fits
+        only the steps after it on the encoded fold, so workers receive fold handles
+        (`src.shared_data.SharedFold`) instead of the raw rows; `cv` is ignored. The
+        candidates may only set parameters of those later steps.
+
+    Attributes
+    ----------
+    cv_results_ : dict of numpy.ndarray
+        Per-candidate scores in the layout of `RandomizedSearchCV.cv_results_`.
+    best_estimator_ : sklearn.pipeline.Pipeline
+        The pipeline refitted on all of the data with the best candidate.
+    best_params_ : dict
+        The best candidate.
+    best_score_ : float
+        The mean cross-validated score of the best candidate.
+    best_index_ : int
+        Row of `cv_results_` holding the best candidate. Ties go to the earliest drawn.
+    n_resumed_ : int
+        The number of candidate x fold results read from the checkpoint instead of refitted.
+
+    Examples
+    --------
+    >>> search = ResumableRandomizedSearchCV(models["logreg_bal"], {"logisticregression__C": np.logspace(-5, 5, 50)},
+    ...                                      n_iter=100, scoring=custom_scorer, random_state=123,
+    ...                                      checkpoint_dir="results/checkpoints")
+    >>> search.fit(X_train, y_train)
+    """
+
+    def __init__(self, estimator, param_distributions, n_iter=10, scoring=None, cv=5, n_jobs=None,
+                 random_state=None, return_train_score=False, checkpoint_dir=None, folds=None):
+        self.estimator = estimator
+        self.param_distributions = param_distributions
+        self.n_iter = n_iter
+        self.scoring = scoring
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.return_train_score = return_train_score
+        self.checkpoint_dir = checkpoint_dir
+        self.folds = folds
+
+    def fit(self, X, y):
+        """
+        Evaluate the candidates that have no checkpointed result yet and refit the best one on all of `X`.
+
+        Parameters
+        ----------
+        X : pandas.DataFrame
+            The training feature set.
+        y : pandas.Series or pandas.DataFrame
+            The training target variable.
+
+        Returns
+        -------
+        ResumableRandomizedSearchCV
+            The fitted search.
+        """
+        y_values = np.asarray(y).ravel()
+        candidates = list(ParameterSampler(self.param_distributions, self.n_iter, random_state=self.random_state))
+        scorer = check_scoring(self.estimator, scoring=self.scoring)
+        if self.folds is None:
+            splits = list(check_cv(self.cv, y_values, classifier=True).split(X, y_values))
+        else:
+            splits = [(fold["train_idx"], fold["test_idx"]) for fold in self.folds]
+            first_step = self.estimator.steps[0][0]
+            if any(name.split("__")[0] == first_step for candidate in candidates for name in candidate):
+                raise ValueError(f"With folds, candidates cannot set parameters of the first step {first_step!r}.")
+
+        checkpoint, completed = None, {}
+        if self.checkpoint_dir is not None:
+            key = search_key(self.estimator, X, y, candidates, self.cv if self.folds is None else splits,
+                             self.scoring, self.return_train_score)
+            checkpoint = SearchCheckpoint(self.checkpoint_dir, key)
+            completed = checkpoint.completed()
+
+        jobs = [(candidate, k) for candidate in range(len(candidates)) for k in range(len(splits))
+                if (candidate, k) not in completed]
+        if self.folds is None:
+            tasks = (delayed(_fit_and_score_candidate)(self.estimator, candidates[candidate], X, y_values, *splits[k],
+                                                       scorer, self.return_train_score, candidate, k, checkpoint)
+                     for candidate, k in jobs)
+        else:
+            tasks = (delayed(_fit_and_score_encoded)(self.estimator, candidates[candidate], self.folds[k], scorer,
+                                                     self.return_train_score, candidate, k, checkpoint)
+                     for candidate, k in jobs)
+        outputs = Parallel(n_jobs=self.n_jobs)(tasks)
+        results = {**completed, **dict(zip(jobs, outputs))}
+        self.n_resumed_ = len(completed)
+
+        fold_results = [[results[(candidate, k)] for candidate in range(len(candidates))] for k in range(len(splits))]
+        self.cv_results_ = _cv_results(candidates, fold_results, self.return_train_score)
+        self.best_index_ = int(np.argmin(self.cv_results_["rank_test_score"]))
+        self.best_score_ = self.cv_results_["mean_test_score"][self.best_index_]
+        self.best_params_ = candidates[self.best_index_]
+
+        start = time.time()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y_values)
+        self.refit_time_ = time.time() - start
+        self.n_splits_ = len(splits)
+        return self
+
+
+# Default search spaces for the `class_model_trainer` model zoo, keyed by model name and
+# expressed on the final estimator of each pipeline.
+DEFAULT_PARAM_SPACES = {
+    "dummy": {},
+    "logreg": {"C": loguniform(1e-5, 1e5)},
+    "svc": {"C": loguniform(1e-3, 1e3), "gamma": loguniform(1e-4, 1e1)},
+    "logreg_bal": {"C": loguniform(1e-5, 1e5)},
+    "svc_bal": {"C": loguniform(1e-3, 1e3), "gamma": loguniform(1e-4, 1e1)},
+    "linear_svc": {"C": loguniform(1e-3, 1e3)},
+    "linear_svc_bal": {"C": loguniform(1e-3, 1e3)},
+    "nystroem_svc": {"alpha": loguniform(1e-6, 1e-1)},
+    "nystroem_svc_bal": {"alpha": loguniform(1e-6, 1e-1)},
+}
+
+
+def _fit_and_score_subsample(estimator, params, fold, n_resources, scorer, seed):
+    """Fit one candidate on a stratified subsample of one fold's training rows and score it."""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    X_fit, y_fit, X_test, y_test = fold["X_train"], fold["y_train"], fold["X_test"], fold["y_test"]
+    if n_resources < len(y_fit):
+        X_fit, y_fit = resample(X_fit, y_fit, n_samples=n_resources, replace=False,
+                                stratify=y_fit, random_state=seed)
+    estimator = clone(estimator).set_params(**params).fit(X_fit, y_fit)
+    score = scorer(estimator, X_test, y_test)
+    return score, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def budgeted_halving_search(models, preprocessor, X_train, y_train, scoring, param_spaces=None,
+                            budget=None, budget_type="wall", factor=3, min_resources=20,
+                            n_candidates=None, cv=5, n_jobs=None, seed=None, shared_dir=None, folds=None):
+    """
+    Tune every model in a model zoo with successive halving under a compute budget.
+
+    For each model, candidates are drawn from its search space and evaluated by
+    cross-validation on a small stratified subsample of each fold's training rows.
+    After every round only the best `1 / factor` of the candidates survive, and the
+    survivors are re-evaluated on `factor` times more rows, until the full fold is used.
+    The preprocessor is fitted once per fold and shared by all models and rounds.
+
+    The budget is split evenly over the models, and unused budget carries over to the
+    models tuned later. A model stops halving as soon as its share is spent and keeps
+    the best candidate of its last completed round.
+
+    Parameters
+    ----------
+    models : dict of str to sklearn.pipeline.Pipeline
+        The candidate pipelines, as returned by `class_model_trainer`.
+    preprocessor : sklearn.compose.ColumnTransformer
+        The preprocessing step shared by the pipelines.
+    X_train : pandas.DataFrame
+        The training feature set.
+    y_train : pandas.Series or pandas.DataFrame
+        The training target variable.
+    scoring : str or callable
+        The metric used to rank candidates.
+    param_spaces : dict, optional
+        Search space per model name, with parameters named on the pipeline's final
+        estimator (e.g. {"svc": {"C": ..., "gamma": ...}}). Defaults to `DEFAULT_PARAM_SPACES`.
+    budget : float, optional
+        Total budget in seconds for all models. None means no limit.
+    budget_type : {"wall", "cpu"}, optional, default="wall"
+        Whether the budget counts elapsed wall-clock seconds or CPU seconds summed over
+        all fit and score jobs.
+    factor : int, optional, default=3
+        Proportion of candidates kept, and growth of rows used, per round.
+    min_resources : int, optional, default=20
+        Number of training rows per fold in the first round.
+    n_candidates : int, optional
+        Number of candidates drawn per model. Defaults to enough candidates for a single
+        survivor to reach the full fold, i.e. `factor ** (n_rounds - 1)`.
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy.
+    n_jobs : int, optional
+        Number of workers for the candidate x fold jobs. None means 1, -1 means all cores.
+    seed : int, optional
+        The random seed for candidate sampling and row subsampling.
+    shared_dir : str, optional
+        Directory for memory-mapped fold matrices, so workers receive only fold indices.
+    folds : list of dict, optional
+        Encoded folds already returned by `preprocess_folds` for `preprocessor` (e.g.
+        `TrainingResult.folds`), used instead of encoding `X_train` again; `cv` and
+        `shared_dir` are then ignored.
+
+    Returns
+    -------
+    best_estimators : dict of str to sklearn.pipeline.Pipeline
+        The best pipeline of each model, refitted on all of the data.
+    results : pandas.DataFrame
+        One row per model, candidate and round with the rows used, the mean score and
+        the wall-clock and CPU seconds spent.
+    """
+    if budget_type not in ("wall", "cpu"):
+        raise ValueError("budget_type must be 'wall' or 'cpu'")
+    if param_spaces is None:
+        param_spaces = DEFAULT_PARAM_SPACES
+
+    if folds is None:
+        folds = preprocess_folds(preprocessor, X_train, y_train, cv=cv, shared_dir=shared_dir)
+    max_resources = min(len(fold["train_idx"]) for fold in folds)
+    min_resources = min(min_resources, max_resources)
+    n_rounds = 1 + int(math.floor(math.log(max_resources / min_resources, factor)))
+    y = np.asarray(y_train).ravel()
+
+    search_start = time.perf_counter()
+    cpu_spent = 0.0
+
+    def used():
+        return cpu_spent if budget_type == "cpu" else time.perf_counter() - search_start
+
+    best_estimators, rows = {}, []
+    for model_position, (model_name, pipeline) in enumerate(models.items()):
+        step_name, estimator = pipeline.steps[-1]
+        scorer = check_scoring(estimator, scoring=scoring)
+        if len(pipeline.steps) > 2 and pipeline.steps[0][1] is preprocessor:
+            # Steps between the preprocessor and the estimator (e.g. a DenseTransformer) are kept
+            fit_estimator, prefix, model_folds = pipeline[1:], f"{step_name}__", folds
+        elif len(pipeline.steps) > 1 and pipeline.steps[0][1] is preprocessor:
+            fit_estimator, prefix, model_folds = estimator, "", folds
+        else:
+            # Pipelines that do not share the preprocessor are fitted on the raw rows
+            fit_estimator, prefix = pipeline, f"{step_name}__"
+            model_folds = untransformed_folds(folds, X_train)
+
+        space = param_spaces.get(model_name, {})
+        if space:
+            n_draws = n_candidates or factor ** (n_rounds - 1)
+            candidates = list(ParameterSampler(space, n_draws, random_state=seed))
+            model_rounds = n_rounds
+        else:
+            candidates, model_rounds = [{}], 1
+
+        model_budget = None if budget is None else (budget - used()) / (len(models) - model_position)
+        model_start = used()
+
+        survivors = list(range(len(candidates)))
+        for round_number in range(model_rounds):
+            if model_budget is not None and round_number > 0 and used() - model_start >= model_budget:
+                break
+            is_last = round_number == model_rounds - 1
+            n_resources = max_resources if is_last else min_resources * factor ** round_number
+
+            jobs = [(candidate, fold) for candidate in survivors for fold in model_folds]
+            outputs = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_and_score_subsample)(
+                    fit_estimator, {prefix + key: value for key, value in candidates[candidate].items()},
+                    fold, n_resources, scorer, seed)
+                for candidate, fold in jobs
+            )
+
+            scores = {candidate: {"scores": [], "wall": 0.0, "cpu": 0.0} for candidate in survivors}
+            for (candidate, _), (score, wall, cpu) in zip(jobs, outputs):
+                scores[candidate]["scores"].append(score)
+                scores[candidate]["wall"] += wall
+                scores[candidate]["cpu"] += cpu
+                cpu_spent += cpu
+
+            for candidate, entry in scores.items():
+                rows.append({
+                    "model": model_name,
+                    "candidate": candidate,
+                    "params": candidates[candidate],
+                    "round": round_number,
+                    "n_resources": n_resources,
+                    "mean_test_score": np.mean(entry["scores"]),
+                    "wall_time": entry["wall"],
+                    "cpu_time": entry["cpu"],
+                })
+
+            # Stable sort, so ties keep the earlier-drawn candidate
+            survivors = sorted(survivors, key=lambda candidate: -np.mean(scores[candidate]["scores"]))
+            best_candidate = survivors[0]
+            survivors = survivors[:max(1, math.ceil(len(survivors) / factor))]
+
+        best_params = {f"{step_name}__{key}": value for key, value in candidates[best_candidate].items()}
+        best_estimators[model_name] = clone(pipeline).set_params(**best_params).fit(X_train, y)
+
+    return best_estimators, pd.DataFrame(rows)
+
+
+def summarize_budget(results):
+    """
+    Summarize the budget each halving candidate used.
+
+    Parameters
+    ----------
+    results : pandas.DataFrame
+        The per-round results returned by `budgeted_halving_search`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per model and candidate with its parameters, the last round it reached,
+        the rows and score of that round, and its total wall-clock and CPU seconds.
+    """
+    return (
+        results.sort_values("round")
+        .groupby(["model", "candidate"], sort=False)
+        .agg(params=("params", "first"), rounds=("round", "max"), n_resources=("n_resources", "last"),
+             mean_test_score=("mean_test_score", "last"), wall_time=("wall_time", "sum"),
+             cpu_time=("cpu_time", "sum"))
+        .reset_index()
+        .sort_values(["model", "rounds", "mean_test_score"], ascending=[True, False, False])
+    )
@@ -0,0 +1,339 @@
+# prediction_service.py
+# author: agent
+# date: 2026-10-17
+
+import asyncio
+import collections
+import json
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+import pandera as pa
+
+from src.data_validation import validate_features
+from src.threshold_tuning import positive_scores
+
+
+class LatencyStats:
+    """
+    Counts requests and rows served and keeps a window of recent request latencies
+
+    Parameters
+    ----------
+    window : int
+        The number of most recent latencies the percentiles are computed over
+    """
+
+    def __init__(self, window=10000):
+        self.latencies = collections.deque(maxlen=window)
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record(self, seconds, rows):
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.rows += rows
+
+    def snapshot(self):
+        """Returns the counters, p50/p99 latency in milliseconds and the throughput since start."""
+        uptime = time.perf_counter() - self.started
+        latencies = np.asarray(self.latencies) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (np.nan, np.nan)
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_rows": self.rows / self.batches if self.batches else 0.0,
+            "p50_ms": None if np.isnan(p50) else round(float(p50), 3),
+            "p99_ms": None if np.isnan(p99) else round(float(p99), 3),
+            "requests_per_sec": self.requests / uptime,
+            "rows_per_sec": self.rows / uptime,
+            "uptime_sec": uptime,
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces prediction requests that arrive within a time window into one call to the model
+
+    The first request of a batch opens a window of `max_delay` seconds; every request arriving in it
+    (up to `max_batch_rows` rows) is validated and predicted together, and each caller gets its own
+    rows back. A batch that fails validation is re-validated request by request, so one malformed
+    payload does not fail the others.
+
+    Parameters
+    ----------
+    model : sklearn classifier
+        The fitted pipeline
+
+    max_delay : float
+        The batching window in seconds
+
+    max_batch_rows : int
+        The number of rows that closes a batch early
+
+    pos_label : str
+        The class whose score is returned
+
+    stats : LatencyStats
+        The counters batch sizes are recorded in
+    """
+
+    def __init__(self, model, max_delay=0.002, max_batch_rows=256,
+                 pos_label='> 50% diameter narrowing', stats=None):
+        self.model = model
+        self.max_delay = max_delay
+        self.max_batch_rows = max_batch_rows
+        self.pos_label = pos_label
+        self.stats = stats if stats is not None else LatencyStats()
+        self.queue = asyncio.Queue()
+        self.worker = None
+
+    def start(self):
+        self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, records):
+        """Queues a list of feature records and waits for their predictions and scores."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            rows = len(batch[0][0])
+            deadline = loop.time() + self.max_delay
+            while rows < self.max_batch_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                rows += len(item[0])
+            # Predict off the event loop so new requests keep being accepted meanwhile
+            try:
+                results = await loop.run_in_executor(None, self._predict_batch, [records for records, _ in batch])
+            except Exception as error:
+                results = [error] * len(batch)
+            self.stats.batches += 1
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+
+    def _predict_batch(self, payloads):
+        """Validates and predicts a list of payloads, returning one result (or exception) per payload."""
+        try:
+            validated = [validate_features(pd.DataFrame.from_records([r for records in payloads for r in records]))]
+            sizes = [len(records) for records in payloads]
+        except (pa.errors.SchemaErrors, ValueError, TypeError):
+            validated, sizes = [], []
+            for records in payloads:
+                try:
+                    validated.append(validate_features(pd.DataFrame.from_records(records)))
+                    sizes.append(len(records))
+                except (pa.errors.SchemaErrors, ValueError, TypeError) as error:
+                    sizes.append(error)
+        if validated:
+            features = pd.concat(validated, ignore_index=True)
+            predictions = self.model.predict(features)
+            scores = positive_scores(self.model, features, self.pos_label)
+        results, offset = [], 0
+        for size in sizes:
+            if isinstance(size, Exception):
+                results.append(size)
+                continue
+            results.append({"predictions": predictions[offset:offset + size].tolist(),
+                            "scores": scores[offset:offset + size].tolist()})
+            offset += size
+        return results
+
+
+def _describe_error(error):
+    """Turns a validation error into a short JSON-friendly description."""
+    if isinstance(error, pa.errors.SchemaErrors):
+        cases = error.failure_cases
+        return [{"column": column, "check": str(check), "value": None if pd.isna(value) else str(value)}
+                for column, check, value in zip(cases["column"], cases["check"], cases["failure_case"])]
+    return str(error)
+
+
+class _BadRequest(Exception):
+    """A request that cannot be parsed, answered with `status` before the connection is closed."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PredictionService:
+    """
+    An asyncio HTTP/1.1 server answering prediction requests with micro-batching
+
+    `POST /predict` takes one JSON object of feature values, or a list of them, and returns
+    {"predictions": [...], "scores": [...]}, or status 422 with the schema violations. Malformed
+    requests get status 400 (413 for oversized bodies) and the connection is closed.
+    `GET /metrics` returns the request, row and batch counters, p50/p99 latency and throughput,
+    and `GET /health` returns {"status": "ok"}.
+
+    Parameters
+    ----------
+    model : sklearn classifier
+        The fitted pipeline, loaded once for the lifetime of the service
+
+    host : str
+        The interface to listen on
+
+    port : int
+        The port to listen on (0 picks a free port)
+
+    max_delay : float
+        The micro-batching window in seconds
+
+    max_batch_rows : int
+        The number of rows that closes a batch early
+
+    max_body_bytes : int
+        The largest request body accepted; larger requests get status 413 before the body is read
+    """
+
+    def __init__(self, model, host="127.0.0.1", port=8000, max_delay=0.002, max_batch_rows=256,
+                 max_body_bytes=2**20):
+        self.model = model
+        self.host = host
+        self.port = port
+        self.max_delay = max_delay
+        self.max_batch_rows = max_batch_rows
+        self.max_body_bytes = max_body_bytes
+        self.stats = LatencyStats()
+        self.batcher = None
+        self.server = None
+
+    @classmethod
+    def from_pickle(cls, pipeline_path, **kwargs):
+        with open(pipeline_path, "rb") as f:
+            return cls(pickle.load(f), **kwargs)
+
+    async def start(self):
+        self.batcher = MicroBatcher(self.model, self.max_delay, self.max_batch_rows, stats=self.stats)
+        self.batcher.start()
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version, headers, body = await self._read_request(request_line, reader)
+                except _BadRequest as error:
+                    # The rest of the stream cannot be framed, so answer and close the connection
+                    self.stats.errors += 1
+                    status, payload = error.status, {"error": error.message}
+                    keep_alive = False
+                else:
+                    status, payload = await self._dispatch(method, path, body)
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, request_line, reader):
+        """Parses the request line, headers and body of one request, raising `_BadRequest` if malformed."""
+        try:
+            method, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise _BadRequest("400 Bad Request", "Malformed request line")
+        headers = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise _BadRequest("400 Bad Request", "Header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _BadRequest("400 Bad Request", "Invalid Content-Length")
+        if length < 0:
+            raise _BadRequest("400 Bad Request", "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise _BadRequest("413 Payload Too Large", f"Body exceeds {self.max_body_bytes} bytes")
+        return method, path, version, headers, await reader.readexactly(length)
+
+    async def _dispatch(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return "200 OK", {"status": "ok"}
+        if method == "GET" and path == "/metrics":
+            return "200 OK", self.stats.snapshot()
+        if method != "POST" or path != "/predict":
+            return "404 Not Found", {"error": f"No route for {method} {path}"}
+
+        start = time.perf_counter()
+        try:
+            records = json.loads(body)
+        except ValueError as error:  # Also bodies that are not UTF-8 (UnicodeDecodeError)
+            self.stats.errors += 1
+            return "400 Bad Request", {"error": f"Invalid JSON: {error}"}
+        records = [records] if isinstance(records, dict) else records
+        if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+            self.stats.errors += 1
+            return "400 Bad Request", {"error": "Body must be a JSON object or a non-empty list of objects"}
+
+        try:
+            result = await self.batcher.predict(records)
+        except (pa.errors.SchemaErrors, ValueError, TypeError) as error:
+            self.stats.errors += 1
+            return "422 Unprocessable Entity", {"error": "Payload does not match the schema",
+                                                "details": _describe_error(error)}
+        except Exception as error:
+            self.stats.errors += 1
+            return "500 Internal Server Error", {"error": str(error)}
+        self.stats.record(time.perf_counter() - start, len(records))
+        return "200 OK", result
@@ -0,0 +1,142 @@
+# search_checkpoint.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import hashlib  # For the search key
+import json  # For the one-line records
+import os  # For file paths and fsync
+
+# Data Manipulation
+import numpy as np  # For converting NumPy scalars and arrays
+
+from src.feature_cache import frame_digest, splits_digest, transformer_digest  # For hashing the data, splits and estimator
+
+
+def _plain(value):
+    """Convert NumPy scalars and arrays to the Python values `json` writes exactly."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _describe_cv(cv):
+    """Describe a splitting strategy; explicit (train, test) index pairs are hashed, since their repr is truncated."""
+    if isinstance(cv, (list, tuple)):
+        return splits_digest(cv)
+    return repr(cv)
+
+
+def search_key(estimator, X, y, candidates, cv, scoring, *extra):
+    """
+    Return a SHA-256 hex digest identifying a search.
+
+    Two searches share a key, and so a checkpoint, when they run the same estimator
+    configuration over the same data, candidate list, splitting strategy and metric.
+
+    Parameters
+    ----------
+    estimator : sklearn.base.BaseEstimator
+        The estimator being tuned.
+    X : pandas.DataFrame
+        The training feature set.
+    y : pandas.Series or pandas.DataFrame
+        The training target variable.
+    candidates : list of dict
+        The parameter settings evaluated, in order.
+    cv : int, cross-validation generator or list of (train, test) index pairs
+        The splitting strategy.
+    scoring : str or callable
+        The metric used to rank candidates.
+    *extra
+        Further values the results depend on.
+
+    Returns
+    -------
+    str
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(frame_digest(X, y).encode())
+    digest.update(transformer_digest(estimator).encode())
+    digest.update(repr([{key: _plain(value) for key, value in sorted(candidate.items())}
+                        for candidate in candidates]).encode())
+    digest.update(_describe_cv(cv).encode())
+    digest.update(repr(scoring).encode())
+    for value in extra:
+        digest.update(repr(_plain(value)).encode())
+    return digest.hexdigest()
+
+
+class SearchCheckpoint:
+    """
+    An append-only file of candidate x fold results of one search.
+
+    Each result is written as one JSON line and synced to disk as soon as it is known,
+    so an interrupted search loses at most the fits that were running. A line cut short
+    by the interruption is dropped when the file is read back. Workers in other
+    processes can append to the same checkpoint.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding the checkpoint files. Created if missing.
+    key : str
+        The `search_key` of the search; the file is `<directory>/<key>.jsonl`.
+    """
+
+    def __init__(self, directory, key):
+        self.directory = directory
+        self.key = key
+        self.path = os.path.join(directory, f"{key}.jsonl")
+
+    def completed(self):
+        """
+        Read back the results written so far.
+
+        A partial last line left by an interruption is cut from the file, so the next
+        result starts on a line of its own.
+
+        Returns
+        -------
+        dict of (int, int) to dict
+            The results keyed by their (candidate, fold) positions.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "rb") as f:
+            content = f.read()
+        complete = content[:content.rfind(b"\n") + 1]
+        if len(complete) < len(content):
+            with open(self.path, "r+b") as f:
+                f.truncate(len(complete))
+
+        results = {}
+        for line in complete.decode().splitlines():
+            record = json.loads(line)
+            results[(record["candidate"], record["fold"])] = record
+        return results
+
+    def append(self, candidate, fold, result):
+        """
+        Write the result of one candidate on one fold.
+
+        Parameters
+        ----------
+        candidate : int
+            Position of the candidate in the search's candidate list.
+        fold : int
+            Position of the fold.
+        result : dict
+            The scores and timings, and any state needed to resume (e.g. coefficients).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        record = {"candidate": int(candidate), "fold": int(fold)}
+        record.update({key: _plain(value) for key, value in result.items()})
+        # One write in append mode, so lines from concurrent workers do not interleave
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,159 @@
+# seed_sweep.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import multiprocessing  # For the fork start method
+import time  # For timing each seed
+from concurrent.futures import ProcessPoolExecutor  # For running seeds in a process pool
+
+# Data Manipulation
+import numpy as np  # For the C grid
+import pandas as pd  # For the per-seed and summary tables
+
+# Machine Learning
+from sklearn.metrics import make_scorer, precision_score, recall_score, f1_score  # For the CV metrics
+from sklearn.model_selection import train_test_split  # For the seeded train/test split
+from threadpoolctl import threadpool_limits  # For keeping each worker on one BLAS thread
+
+from src.class_model_trainer import class_model_trainer  # For cross-validating the model zoo
+from src.fused_preprocessor import FusedPreprocessor  # For the preprocessing step
+from src.model_eval import METRICS, binary_counts, confusion_counts  # For the held-out metrics
+from src.model_tuning import RegularizationPathSearchCV  # For tuning logreg_bal
+
+# The dataset of the running sweep, set once per worker process by `_init_worker`
+_DATA = None
+
+SWEEP_METRICS = ["accuracy", "precision", "recall", "f1"]
+
+
+def _init_worker(data):
+    """Keep the dataset for every seed this worker runs, and limit BLAS to one thread per worker."""
+    global _DATA
+    _DATA = data
+    threadpool_limits(1)
+
+
+def run_seed(seed, categorical_features, split=0.2, target='Diagnosis of heart disease',
+             pos_label='> 50% diameter narrowing', cv=5, Cs=None, data=None):
+    """
+    Run the training stage once: split, cross-validate the model zoo, tune logreg_bal and score it.
+
+    Parameters
+    ----------
+    seed : int
+        Seed of the train/test split and of the models.
+    categorical_features : list of str
+        Columns imputed with their most frequent value and one-hot encoded; every other
+        feature column is numeric.
+    split : float, optional, default=0.2
+        Proportion of rows held out as test data.
+    target : str, optional
+        Name of the label column.
+    pos_label : str, optional
+        The positive class.
+    cv : int, optional, default=5
+        The number of cross-validation folds.
+    Cs : array-like, optional
+        The values of `C` searched for logreg_bal. Defaults to `np.logspace(-5, 5, 50)`,
+        as in 4_training_models.py.
+    data : pandas.DataFrame, optional
+        The full dataset. Defaults to the dataset shared with the worker process.
+
+    Returns
+    -------
+    list of dict
+        One record per model, stage and metric: the mean cross-validated score of every
+        model ("cv"), the held-out score of the tuned logreg_bal ("test") and its `C`
+        ("tuning").
+    """
+    start = time.perf_counter()
+    data = _DATA if data is None else data
+    Cs = np.logspace(-5, 5, 50) if Cs is None else Cs
+    train_df, test_df = train_test_split(data, test_size=split, random_state=seed)
+    X_train, y_train = train_df.drop(columns=target), train_df[target]
+    X_test, y_test = test_df.drop(columns=target), test_df[target]
+    numeric_features = [col for col in X_train.columns if col not in categorical_features]
+
+    preprocessor = FusedPreprocessor(categorical_features, numeric_features)
+    metrics = {
+        "accuracy": "accuracy",
+        "precision": make_scorer(precision_score, pos_label=pos_label),
+        "recall": make_scorer(recall_score, pos_label=pos_label),
+        "f1": make_scorer(f1_score, pos_label=pos_label),
+    }
+    models = class_model_trainer(preprocessor, X_train, y_train, pos_lable=pos_label, seed=seed, write_to=None,
+                                 cv=cv, metrics=metrics)
+    records = [{"seed": seed, "model": model_name, "stage": "cv", "metric": metric,
+                "value": fold_scores[f"test_{metric}"].mean()}
+               for model_name, fold_scores in models.cv_results.items() for metric in SWEEP_METRICS]
+
+    search = RegularizationPathSearchCV(models["logreg_bal"], Cs=Cs, scoring=metrics["f1"],
+                                        return_train_score=False, folds=models.folds).fit(X_train, y_train)
+    counts = binary_counts(*confusion_counts(y_test, search.best_estimator_.predict(X_test)), pos_label)
+    records += [{"seed": seed, "model": "logreg_bal (tuned)", "stage": "test", "metric": metric,
+                 "value": float(METRICS[metric][1](*counts))} for metric in SWEEP_METRICS]
+    records.append({"seed": seed, "model": "logreg_bal (tuned)", "stage": "tuning", "metric": "C",
+                    "value": search.best_params_["logisticregression__C"]})
+
+    seconds = time.perf_counter() - start
+    return [{**record, "seconds": seconds} for record in records]
+
+
+def seed_sweep(data, seeds, categorical_features, n_jobs=1, **kwargs):
+    """
+    Run `run_seed` for every seed in a process pool.
+
+    The dataset is handed to each worker once, when the worker starts (with the fork
+    start method it is inherited without copying), and each task only sends a seed.
+    Every worker uses one BLAS thread, so `n_jobs` workers keep `n_jobs` cores busy and
+    the sweep takes about `len(seeds) / n_jobs` times one run.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        The full dataset, features and label.
+    seeds : list of int
+        The seeds to run.
+    categorical_features : list of str
+        The categorical feature columns.
+    n_jobs : int, optional, default=1
+        Number of worker processes. -1 means all cores.
+    **kwargs
+        Further arguments of `run_seed` (e.g. `split`, `cv`, `Cs`).
+
+    Returns
+    -------
+    pandas.DataFrame
+        The records of every seed, in seed order.
+    """
+    n_workers = multiprocessing.cpu_count() if n_jobs == -1 else max(1, n_jobs)
+    context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=context, initializer=_init_worker,
+                             initargs=(data,)) as pool:
+        futures = [pool.submit(run_seed, seed, categorical_features, **kwargs) for seed in seeds]
+        records = [record for future in futures for record in future.result()]
+    return pd.DataFrame(records)
+
+
+def summarize_sweep(records):
+    """
+    Summarize the distribution of each model's metrics over the seeds.
+
+    Parameters
+    ----------
+    records : pandas.DataFrame
+        The records returned by `seed_sweep`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per model, stage and metric with the number of seeds, the mean, standard
+        deviation, minimum, 5th, 50th and 95th percentiles and maximum.
+    """
+    grouped = records.groupby(["model", "stage", "metric"], sort=False)["value"]
+    summary = grouped.agg(n_seeds="count", mean="mean", std="std", min="min")
+    for name, q in [("p05", 0.05), ("median", 0.5), ("p95", 0.95)]:
+        summary[name] = grouped.quantile(q)
+    summary["max"] = grouped.max()
+    return summary.reset_index()
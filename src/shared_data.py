@@ -0,0 +1,181 @@
+# shared_data.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import hashlib  # For cache keys
+import os  # For file path operations
+from collections.abc import Mapping  # For the read-only fold interface
+
+# Data Manipulation
+import numpy as np  # For memory-mapped arrays
+from scipy import sparse  # For keeping sparse encoder output sparse
+
+# Machine Learning
+from sklearn.base import clone  # For unfitted copies of the preprocessor
+from sklearn.model_selection import check_cv  # For cross-validation splits
+
+from src.feature_cache import (frame_digest, splits_digest, transformer_digest, staged_entry, save_array, save_matrix,
+                               load_matrix, read_entry)
+
+class SharedFold(Mapping):
+    """
+    A cross-validation fold whose encoded features live in a memory-mapped file.
+
+    The object behaves like the fold dictionaries returned by `preprocess_folds`, but it
+    only carries the file paths, the fold number and the row indices. When it is sent to a
+    worker, nothing else is pickled; the worker slices its rows out of the shared file
+    the first time a matrix is requested. The memory maps it opens belong to the object
+    (they are not pickled with it), so they are closed when the fold is released rather
+    than held by long-lived workers after the files are deleted.
+
+    Parameters
+    ----------
+    features_path : str
+        Path of the `.npy` file holding the encoded features of every fold, with shape
+        (n_folds, n_rows, n_features), or, for sparse features, the path (without
+        extension) of this fold's CSR matrix written by `save_matrix`.
+    labels_path : str
+        Path of the `.npy` file holding the labels, with shape (n_rows,).
+    fold_number : int
+        The fold this object refers to.
+    train_idx, test_idx : numpy.ndarray
+        Row indices of the fold's training and validation rows.
+    sparse_features : bool, optional, default=False
+        Whether `features_path` refers to a sparse matrix.
+    """
+
+    def __init__(self, features_path, labels_path, fold_number, train_idx, test_idx, sparse_features=False):
+        self.features_path = features_path
+        self.labels_path = labels_path
+        self.fold_number = fold_number
+        self.train_idx = train_idx
+        self.test_idx = test_idx
+        self.sparse_features = sparse_features
+        self._arrays = {}
+
+    def _open(self, path, sparse_matrix=False):
+        """Open a `.npy` file read-only as a memory map, or a sparse matrix saved by `save_matrix`, once."""
+        if path not in self._arrays:
+            self._arrays[path] = (load_matrix(os.path.dirname(path), os.path.basename(path)) if sparse_matrix
+                                  else np.load(path, mmap_mode="r"))
+        return self._arrays[path]
+
+    def release(self):
+        """Close the memory maps opened by this fold."""
+        self._arrays.clear()
+
+    def __getstate__(self):
+        return {**self.__dict__, "_arrays": {}}
+
+    def __getitem__(self, key):
+        if key == "train_idx":
+            return self.train_idx
+        if key == "test_idx":
+            return self.test_idx
+        split, _, name = key.partition("_")
+        rows = {"train": self.train_idx, "test": self.test_idx}[name]
+        if split == "X" and self.sparse_features:
+            return self._open(self.features_path, sparse_matrix=True)[rows]
+        if split == "X":
+            return np.asarray(self._open(self.features_path)[self.fold_number][rows])
+        if split == "y":
+            return np.asarray(self._open(self.labels_path)[rows])
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(["train_idx", "test_idx", "X_train", "X_test", "y_train", "y_test"])
+
+    def __len__(self):
+        return 6
+
+
+def share_folds(preprocessor, X_train, y_train, directory, cv=5):
+    """
+    Fit the preprocessor once per fold and write every fold's encoded matrix to one memory-mapped file.
+
+    Each fold's preprocessor is fitted on the fold's training rows and then transforms all
+    rows once, so a fold's training and validation matrices are row slices of the same
+    block. Workers receive `SharedFold` handles (paths and indices) instead of arrays.
+    Every fold encodes every row with its own fitted preprocessor, so dense output takes
+    one (n_folds, n_rows, n_features) array: `cv` times the size of one encoded matrix,
+    as much as the in-memory folds hold. Float output keeps its dtype (e.g. float32),
+    and sparse output is stored as one CSR matrix per fold, which keeps only the stored
+    values of each fold's encoding.
+
+    Entries are content-addressed by the data, the preprocessor configuration and the
+    split indices (see `src.feature_cache`), so later calls with the same inputs, in this run
+    or a later one if `directory` is persistent, reopen the files instead of re-encoding.
+
+    Parameters
+    ----------
+    preprocessor : sklearn.compose.ColumnTransformer
+        The (unfitted) preprocessing step shared by the candidate pipelines.
+    X_train : pandas.DataFrame
+        The training feature set.
+    y_train : pandas.Series or pandas.DataFrame
+        The training target variable.
+    directory : str
+        Directory holding the fold entries. It should outlive the parallel jobs that
+        read from it (e.g. a `tempfile.TemporaryDirectory` or a persistent cache folder).
+    cv : int or cross-validation generator, optional, default=5
+        Determines the splitting strategy.
+
+    Returns
+    -------
+    list of SharedFold
+        One handle per fold, usable wherever `preprocess_folds` output is accepted.
+    """
+    y = np.asarray(y_train).ravel()
+    # Keyed by the split indices themselves: a shuffling splitter without a fixed seed splits
+    # differently on every call, though its repr stays the same
+    splits = list(check_cv(cv, y, classifier=True).split(X_train, y))
+    key = hashlib.sha256(
+        (frame_digest(X_train, y) + transformer_digest(preprocessor) + splits_digest(splits)).encode()
+    ).hexdigest()
+    entry_dir = os.path.join(directory, f"folds-{key[:32]}")
+
+    if not os.path.isdir(entry_dir):
+        with staged_entry(entry_dir) as staging:
+            features, is_sparse = None, False
+            for fold_number, (train_idx, _) in enumerate(splits):
+                fold_preprocessor = clone(preprocessor).fit(X_train.iloc[train_idx], y[train_idx])
+                encoded = fold_preprocessor.transform(X_train)
+                if sparse.issparse(encoded) or is_sparse:
+                    # Folds can differ in density; once one fold is sparse, all are stored sparse
+                    is_sparse = True
+                    save_matrix(staging, f"features-{fold_number}", sparse.csr_matrix(encoded))
+                    continue
+                if features is None:
+                    features = np.lib.format.open_memmap(
+                        os.path.join(staging, "features.npy"), mode="w+",
+                        dtype=encoded.dtype if encoded.dtype.kind == "f" else np.float64,
+                        shape=(len(splits), encoded.shape[0], encoded.shape[1])
+                    )
+                features[fold_number] = encoded
+            if features is not None:
+                features.flush()
+                del features
+            if is_sparse:
+                # Earlier dense folds are rewritten sparse so every fold has the same layout
+                for fold_number in range(len(splits)):
+                    if not os.path.exists(os.path.join(staging, f"features-{fold_number}.indptr.npy")):
+                        dense = np.load(os.path.join(staging, "features.npy"), mmap_mode="r")[fold_number]
+                        save_matrix(staging, f"features-{fold_number}", sparse.csr_matrix(dense))
+                if os.path.exists(os.path.join(staging, "features.npy")):
+                    os.remove(os.path.join(staging, "features.npy"))
+
+            test_fold = np.full((len(splits), len(y)), -1, dtype=np.int8)
+            for fold_number, (train_idx, test_idx) in enumerate(splits):
+                test_fold[fold_number, train_idx] = 0
+                test_fold[fold_number, test_idx] = 1
+            save_array(os.path.join(staging, "labels.npy"), y)
+            save_array(os.path.join(staging, "split_membership.npy"), test_fold)
+
+    # Row membership per fold: 0 = training row, 1 = validation row, -1 = unused
+    (membership,) = read_entry(entry_dir, ["split_membership"])
+    is_sparse = not os.path.exists(os.path.join(entry_dir, "features.npy"))
+    return [SharedFold(os.path.join(entry_dir, f"features-{fold_number}" if is_sparse else "features.npy"),
+                       os.path.join(entry_dir, "labels.npy"), fold_number,
+                       np.flatnonzero(row == 0), np.flatnonzero(row == 1), sparse_features=is_sparse)
+            for fold_number, row in enumerate(membership)]
@@ -0,0 +1,218 @@
+# storage.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import os  # For file extensions
+
+# Data Manipulation
+import numpy as np  # For the NaN missing marker
+import pandas as pd  # For CSV files and data frames
+import pyarrow as pa  # For Arrow tables, IPC files and memory maps
+import pyarrow.parquet as pq  # For Parquet files
+
+# File extension of each storage format
+FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+_EXTENSIONS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet", ".arrow": "arrow", ".feather": "arrow"}
+
+
+def storage_format(path):
+    """
+    Return the storage format of a file from its extension.
+
+    Parameters
+    ----------
+    path : str
+        A .parquet (.pq) or .arrow (.feather) file; any other file is read as CSV.
+
+    Returns
+    -------
+    str
+        One of the keys of `FORMATS`.
+    """
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def dataset_path(directory, name, format="csv"):
+    """Return the path of dataset `name` in `directory` stored as `format`."""
+    if format not in FORMATS:
+        raise ValueError(f"Unknown storage format {format!r}; expected one of {list(FORMATS)}.")
+    return os.path.join(directory, name + FORMATS[format])
+
+
+def _to_frame(table):
+    """Convert an Arrow table to pandas with NaN, the missing marker of the CSV reader, in text columns."""
+    frame = table.to_pandas()
+    # Parquet only keeps dictionaries of text, so categoricals of other values (e.g. booleans)
+    # come back as plain columns; the pandas metadata still records them as categorical
+    for column in (table.schema.pandas_metadata or {}).get("columns", []):
+        name = column["name"]
+        if (column["pandas_type"] == "categorical" and name in frame
+                and not isinstance(frame[name].dtype, pd.CategoricalDtype)):
+            frame[name] = frame[name].astype("category")
+    text = frame.columns[frame.dtypes == object]
+    frame[text] = frame[text].where(frame[text].notna(), np.nan)
+    return frame
+
+
+def booleans_as_objects(frame):
+    """
+    Return `frame` with its boolean columns (plain, nullable or categorical) as Python objects.
+
+    scikit-learn 1.2 casts a frame that mixes a boolean column with categorical columns to
+    float64 before imputing it, which fails. As objects, with NaN for missing values, the
+    booleans reach the estimators the way the CSV reader returns them.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        Data read with `read_dataset` or `iter_dataset`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A copy if any column was converted, otherwise `frame` itself.
+    """
+    booleans = [name for name, dtype in frame.dtypes.items() if pd.api.types.is_bool_dtype(dtype)]
+    if not booleans:
+        return frame
+    frame = frame.copy()
+    for name in booleans:
+        values = frame[name].astype(object)
+        frame[name] = values.where(values.notna(), np.nan)
+    return frame
+
+
+def _open_arrow(path):
+    """Memory-map an Arrow IPC file; record batches are read from the map without copying."""
+    return pa.ipc.open_file(pa.memory_map(path, "r"))
+
+
+class DatasetWriter:
+    """
+    Write data frames to a CSV, Parquet or Arrow IPC file, one chunk at a time.
+
+    The format follows the file extension. Parquet and Arrow files keep the column types
+    of the frames (categoricals, nullable integers, booleans); every chunk must have the
+    types of the first.
+
+    Parameters
+    ----------
+    path : str
+        The file to write; overwritten if it exists.
+    columns : list of str, optional
+        Columns of the empty frame written on `close` when no chunk was written.
+    """
+
+    def __init__(self, path, columns=None):
+        self.path = path
+        self.format = storage_format(path)
+        self.columns = columns
+        self.writer = None
+        self.n_rows = 0
+        self.started = False
+
+    def write(self, frame):
+        """Append the rows of `frame`."""
+        if self.format == "csv":
+            frame.to_csv(self.path, mode="a" if self.started else "w", header=not self.started, index=False)
+        else:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = (pq.ParquetWriter(self.path, table.schema) if self.format == "parquet"
+                               else pa.ipc.new_file(self.path, table.schema))
+            self.writer.write_table(table)
+        self.started = True
+        self.n_rows += len(frame)
+
+    def close(self):
+        """Finish the file."""
+        if not self.started and self.columns is not None:
+            self.write(pd.DataFrame(columns=self.columns))
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_dataset(frame, path):
+    """
+    Write a data frame to a CSV, Parquet or Arrow IPC file, by extension.
+
+    Parameters
+    ----------
+    frame : pandas.DataFrame
+        The data; its index is not written.
+    path : str
+        The file to write.
+    """
+    with DatasetWriter(path, columns=list(frame.columns)) as writer:
+        writer.write(frame)
+
+
+def read_dataset(path, columns=None):
+    """
+    Read a CSV, Parquet or Arrow IPC file into a data frame, by extension.
+
+    Parquet and Arrow files come back with the column types they were written with, and
+    only the requested columns are read from disk: Parquet files are memory-mapped and
+    decode only the projected column chunks, and Arrow files are memory-mapped and
+    converted from the mapped buffers directly.
+
+    Parameters
+    ----------
+    path : str
+        The file to read.
+    columns : list of str, optional
+        The columns to read, in this order. Defaults to every column.
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    format = storage_format(path)
+    if format == "csv":
+        frame = pd.read_csv(path, usecols=columns)
+        return frame if columns is None else frame[list(columns)]
+    if format == "parquet":
+        return _to_frame(pq.read_table(path, columns=columns, memory_map=True))
+    table = _open_arrow(path).read_all()
+    return _to_frame(table if columns is None else table.select(list(columns)))
+
+
+def iter_dataset(path, chunk_size=10000, columns=None):
+    """
+    Read a CSV, Parquet or Arrow IPC file as data frames of at most `chunk_size` rows.
+
+    Parameters
+    ----------
+    path : str
+        The file to read.
+    chunk_size : int, optional
+        The maximum number of rows per chunk.
+    columns : list of str, optional
+        The columns to read. Defaults to every column.
+
+    Returns
+    -------
+    generator of pandas.DataFrame
+        The chunks, in file order.
+    """
+    format = storage_format(path)
+    if format == "csv":
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_size):
+            yield chunk if columns is None else chunk[list(columns)]
+    elif format == "parquet":
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=chunk_size, columns=columns):
+            yield _to_frame(pa.Table.from_batches([batch]))
+    else:
+        table = _open_arrow(path).read_all()
+        table = table if columns is None else table.select(list(columns))
+        # Slices of a memory-mapped table are views, so each chunk only touches its own rows
+        for start in range(0, table.num_rows, chunk_size):
+            yield _to_frame(table.slice(start, chunk_size))
@@ -0,0 +1,216 @@
+# streaming_training.py
+# author: agent
+# date: 2026-10-17
+
+# Core Libraries
+import time  # For timing the passes
+
+# Data Manipulation
+import numpy as np  # For the running statistics
+import pandas as pd  # For per-chunk value counts
+
+# Machine Learning
+from sklearn.linear_model import SGDClassifier  # For logistic regression trained chunk by chunk
+from sklearn.pipeline import make_pipeline  # For the saved pipeline
+
+from src.batch_scoring import iter_chunks  # For reading CSV/Parquet/Arrow files in chunks
+from src.fused_preprocessor import FusedPreprocessor  # For the preprocessing step of the saved pipeline
+
+
+class StreamingStatistics:
+    """
+    Accumulates the statistics of a `FusedPreprocessor` over chunks of a dataset.
+
+    Memory does not grow with the number of rows: categorical features keep one count per
+    distinct value, numeric features keep running counts, means and sums of squared
+    deviations of their observed values (merged across chunks with Chan's update), and
+    a uniform reservoir sample of at most `sample_size` values for the median. The
+    medians are exact while a column has at most `sample_size` observed values. The mean
+    and variance of the median-imputed column follow from the observed ones and the
+    number of missing values, so a single pass is enough.
+
+    Parameters
+    ----------
+    categorical_features : list of str
+        Columns imputed with their most frequent value and one-hot encoded.
+    numeric_features : list of str
+        Columns imputed with their median and standardized.
+    sample_size : int, optional, default=100000
+        The reservoir size per numeric column used for the medians.
+    seed : int, optional
+        The seed of the reservoir sampling.
+    """
+
+    def __init__(self, categorical_features, numeric_features, sample_size=100000, seed=None):
+        self.categorical_features = list(categorical_features)
+        self.numeric_features = list(numeric_features)
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.columns = None
+        self.n_rows = 0
+        self.category_counts = [{} for _ in self.categorical_features]
+        self.class_counts = {}
+        n_numeric = len(self.numeric_features)
+        self.n_observed = np.zeros(n_numeric, dtype=np.int64)
+        self.observed_mean = np.zeros(n_numeric)
+        self.observed_m2 = np.zeros(n_numeric)
+        self.reservoirs = [np.empty(0) for _ in self.numeric_features]
+
+    def update(self, X, y=None):
+        """Adds one chunk of features (and optionally its labels) to the statistics."""
+        if self.columns is None:
+            self.columns = list(X.columns)
+        self.n_rows += len(X)
+
+        for counts, column in zip(self.category_counts, self.categorical_features):
+            chunk_counts = pd.Series(X[column].to_numpy(dtype=object), dtype=object).value_counts(dropna=False, sort=False)
+            for value, count in chunk_counts.items():
+                # Only NaN counts as missing, as in SimpleImputer
+                if value == value:
+                    counts[value] = counts.get(value, 0) + int(count)
+        if y is not None:
+            for label, count in pd.Series(np.asarray(y).ravel()).value_counts(sort=False).items():
+                self.class_counts[label] = self.class_counts.get(label, 0) + int(count)
+
+        values = X[self.numeric_features].to_numpy(dtype=np.float64)
+        observed = ~np.isnan(values)
+        n_chunk = observed.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            chunk_mean = np.where(n_chunk > 0, np.nansum(values, axis=0) / n_chunk, 0.0)
+        chunk_m2 = np.nansum((values - chunk_mean) ** 2, axis=0)
+        n_total = self.n_observed + n_chunk
+        delta = chunk_mean - self.observed_mean
+        share = np.divide(n_chunk, n_total, out=np.zeros(len(n_total)), where=n_total > 0)
+        self.observed_mean = self.observed_mean + delta * share
+        self.observed_m2 = self.observed_m2 + chunk_m2 + delta ** 2 * self.n_observed * share
+        for j in range(values.shape[1]):
+            self._sample(j, values[observed[:, j], j])
+        self.n_observed = n_total
+        return self
+
+    def _sample(self, j, values):
+        """Adds the observed values of numeric column `j` to its reservoir (algorithm R, vectorized per chunk)."""
+        seen, reservoir = self.n_observed[j], self.reservoirs[j]
+        free = max(0, min(self.sample_size - len(reservoir), len(values)))
+        reservoir = np.concatenate([reservoir, values[:free]])
+        positions = seen + free + np.arange(len(values) - free)
+        slots = self.rng.integers(0, positions + 1) if len(positions) else positions
+        kept = slots < self.sample_size
+        reservoir[slots[kept]] = values[free:][kept]
+        self.reservoirs[j] = reservoir
+
+    def preprocessor(self, **params):
+        """
+        Returns a FusedPreprocessor fitted with the accumulated statistics.
+
+        Parameters
+        ----------
+        **params
+            Further FusedPreprocessor parameters (e.g. `dtype`, `sparse_output`).
+
+        Returns
+        -------
+        FusedPreprocessor
+        """
+        if self.n_rows == 0:
+            raise ValueError("No rows were seen.")
+        fills, categories = [], []
+        for counts in self.category_counts:
+            if not counts:
+                fills.append(np.nan)
+                categories.append([])
+                continue
+            most = max(counts.values())
+            fills.append(min(value for value, count in counts.items() if count == most))
+            categories.append(sorted(counts))
+
+        # An entirely missing column is imputed with 0, as in FusedPreprocessor.fit
+        medians = np.array([np.median(sample) if len(sample) else 0.0 for sample in self.reservoirs])
+        # Merge the observed values with the imputed ones, which all equal the median
+        n, n_missing = self.n_rows, self.n_rows - self.n_observed
+        mean = (self.n_observed * self.observed_mean + n_missing * medians) / n
+        m2 = self.observed_m2 + (medians - self.observed_mean) ** 2 * self.n_observed * n_missing / n
+        preprocessor = FusedPreprocessor(self.categorical_features, self.numeric_features, **params)
+        return preprocessor._set_statistics(self.columns, n, fills, categories, medians, mean, m2 / n)
+
+
+def stream_train(data_path, categorical_features, numeric_features=None, target='Diagnosis of heart disease',
+                 chunk_size=10000, C=1.0, class_weight=None, n_epochs=5, seed=None, sample_size=100000):
+    """
+    Trains the logistic-regression pipeline from a CSV, Parquet or Arrow file without loading it whole.
+
+    A first pass over the file accumulates the imputation and scaling statistics
+    (`StreamingStatistics`) and the class counts. Then `n_epochs` passes feed each encoded
+    chunk to `SGDClassifier(loss="log_loss").partial_fit`, whose penalty
+    `alpha = 1 / (C * n_rows)` makes its objective that of `LogisticRegression(C=C)`;
+    the averaged weights are kept, which settle in fewer epochs than the last iterate.
+    Only one chunk is held in memory at a time. Rows are visited in file order, so a
+    file sorted by label should be shuffled beforehand.
+
+    Parameters
+    ----------
+    data_path : str
+        The CSV, Parquet or Arrow training file, including the label column.
+    categorical_features : list of str
+        Columns imputed with their most frequent value and one-hot encoded.
+    numeric_features : list of str, optional
+        Columns imputed with their median and standardized. Defaults to every column of
+        the file other than the categorical features and the target, in file order.
+    target : str, optional
+        Name of the label column.
+    chunk_size : int, optional, default=10000
+        The number of rows read at a time.
+    C : float, optional, default=1.0
+        Inverse regularization strength, as in LogisticRegression.
+    class_weight : {"balanced"} or dict, optional
+        Class weights. "balanced" is computed from the class counts of the first pass,
+        as LogisticRegression(class_weight="balanced") does.
+    n_epochs : int, optional, default=5
+        The number of passes over the file with `partial_fit`.
+    seed : int, optional
+        Seed for the median sampling and the SGD shuffling.
+    sample_size : int, optional, default=100000
+        The reservoir size per numeric column used for the medians.
+
+    Returns
+    -------
+    pipeline : sklearn.pipeline.Pipeline
+        The fitted FusedPreprocessor and SGDClassifier, usable wherever the pipeline of
+        `4_training_models.py` is (e.g. by `5_evaluate.py`).
+    summary : dict
+        The number of rows and chunks, the epochs and the seconds spent in each pass.
+    """
+    start = time.perf_counter()
+    statistics, n_chunks = None, 0
+    for chunk in iter_chunks(data_path, chunk_size, target=None):
+        if statistics is None:
+            if numeric_features is None:
+                numeric_features = [column for column in chunk.columns
+                                    if column not in categorical_features and column != target]
+            statistics = StreamingStatistics(categorical_features, numeric_features, sample_size=sample_size, seed=seed)
+        statistics.update(chunk.drop(columns=target), chunk[target])
+        n_chunks += 1
+    if statistics is None:
+        raise ValueError(f"{data_path} has no rows.")
+    preprocessor = statistics.preprocessor()
+    statistics_seconds = time.perf_counter() - start
+
+    classes = np.array(sorted(statistics.class_counts))
+    # partial_fit needs explicit weights; these are what "balanced" computes on the whole file
+    weights = class_weight if class_weight != "balanced" else {
+        label: statistics.n_rows / (len(classes) * count) for label, count in statistics.class_counts.items()}
+    classifier = SGDClassifier(loss="log_loss", alpha=1.0 / (C * statistics.n_rows), class_weight=weights,
+                               average=True, random_state=seed)
+
+    start = time.perf_counter()
+    for _ in range(n_epochs):
+        for chunk in iter_chunks(data_path, chunk_size, target=None):
+            classifier.partial_fit(preprocessor.transform(chunk.drop(columns=target)), chunk[target].to_numpy(),
+                                   classes=classes)
+    training_seconds = time.perf_counter() - start
+    # Refits of the saved pipeline (e.g. out-of-fold scoring in 5_evaluate.py) recompute the weights
+    classifier.set_params(class_weight=class_weight)
+
+    summary = {"rows": statistics.n_rows, "chunks": n_chunks, "epochs": n_epochs,
+               "statistics_seconds": statistics_seconds, "training_seconds": training_seconds}
+    return make_pipeline(preprocessor, classifier), summary
@@ -0,0 +1,193 @@
+# threshold_tuning.py
+# author: agent
+# date: 2026-10-17
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.model_selection import cross_val_predict
+
+from src.model_eval import METRICS
+
+
+def positive_scores(model, X, pos_label='> 50% diameter narrowing'):
+    """
+    Returns a continuous score per row where larger values mean the positive class is more likely
+
+    The model's `decision_function` is used when available, otherwise the positive-class column of
+    `predict_proba`.
+
+    Parameters
+    ----------
+    model : sklearn classifier
+        A fitted binary classifier (or pipeline ending in one)
+
+    X : pandas.DataFrame or numpy.ndarray
+        The feature-data to score
+
+    pos_label : str
+        The positive class
+
+    Returns
+    -------
+    numpy.ndarray
+        One score per row
+    """
+    method = _score_method(model)
+    return _orient(getattr(model, method)(X), method, model.classes_, pos_label)
+
+
+def out_of_fold_scores(model, X, y, cv=5, pos_label='> 50% diameter narrowing'):
+    """
+    Returns `positive_scores` for every row from a clone of the model that was fitted without that row
+
+    Parameters
+    ----------
+    model : sklearn classifier
+        The (fitted or unfitted) classifier to clone for each fold
+
+    X : pandas.DataFrame or numpy.ndarray
+        The feature-data
+
+    y : pandas.DataFrame or pandas.Series
+        The target labels
+
+    cv : int or cross-validation generator
+        The cross-validation splitting strategy
+
+    pos_label : str
+        The positive class
+
+    Returns
+    -------
+    numpy.ndarray
+        One out-of-fold score per row
+    """
+    y = np.asarray(y).ravel()
+    method = _score_method(model)
+    scores = cross_val_predict(clone(model), X, y, cv=cv, method=method)
+    return _orient(scores, method, np.unique(y), pos_label)
+
+
+def _score_method(model):
+    return "decision_function" if hasattr(model, "decision_function") else "predict_proba"
+
+
+def _orient(scores, method, classes, pos_label):
+    """Turns raw decision_function / predict_proba output into positive-class scores."""
+    scores, position = np.asarray(scores, dtype=float), list(classes).index(pos_label)
+    if method == "predict_proba":
+        return scores[:, position]
+    # Binary decision functions are positive for classes_[1]
+    return scores if position == 1 else -scores
+
+
+def threshold_curve(y_true, scores, pos_label='> 50% diameter narrowing'):
+    """
+    Computes precision, recall and F1 at every distinct decision threshold from one sort of the scores
+
+    The scores are sorted once in decreasing order. The running sum of positives then gives the true and
+    false positive counts for "predict positive when score >= threshold" at every distinct score, so the
+    whole curve costs O(n log n) however many thresholds there are.
+
+    Parameters
+    ----------
+    y_true : array-like
+        The true labels
+
+    scores : array-like
+        Scores where larger values mean the positive class is more likely (see `positive_scores`)
+
+    pos_label : str
+        The positive class
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per distinct threshold, in decreasing order, with the confusion counts and the
+        precision, recall and F1 score of predicting positive when score >= threshold
+    """
+    y_true, scores = np.asarray(y_true).ravel(), np.asarray(scores, dtype=float).ravel()
+    order = np.argsort(-scores, kind="mergesort")
+    sorted_scores = scores[order]
+    is_positive = (y_true[order] == pos_label).astype(np.int64)
+
+    # Last position of each run of equal scores
+    ends = np.r_[np.flatnonzero(np.diff(sorted_scores)), len(sorted_scores) - 1]
+    tp = np.cumsum(is_positive)[ends]
+    fp = ends + 1 - tp
+    fn = is_positive.sum() - tp
+    tn = len(is_positive) - is_positive.sum() - fp
+
+    curve = pd.DataFrame({"threshold": sorted_scores[ends], "tp": tp, "fp": fp, "fn": fn, "tn": tn})
+    for name in ["precision", "recall", "f1"]:
+        curve[name] = METRICS[name][1](tp, fp, fn, tn)
+    return curve
+
+
+def select_threshold(curve, target_recall):
+    """
+    Picks the operating point that reaches a target recall with the best precision
+
+    Parameters
+    ----------
+    curve : pandas.DataFrame
+        The output of `threshold_curve`
+
+    target_recall : float
+        The minimum recall the threshold must achieve
+
+    Returns
+    -------
+    pandas.Series
+        The selected row of `curve`. Ties in precision go to the highest threshold.
+    """
+    if not 0 <= target_recall <= 1:
+        raise ValueError("target_recall must be between 0 and 1.")
+    feasible = curve[curve["recall"] >= target_recall]
+    # Rows are in decreasing threshold order, so idxmax keeps the highest threshold among ties
+    return feasible.loc[feasible["precision"].idxmax()]
+
+
+class ThresholdClassifier(BaseEstimator, ClassifierMixin):
+    """
+    Wraps a fitted binary classifier so that it predicts the positive class when its score reaches a threshold
+
+    Pickling this object stores the chosen operating point together with the pipeline, so inference code
+    calling `predict` uses the tuned threshold instead of the default decision boundary.
+
+    Parameters
+    ----------
+    estimator : sklearn classifier
+        A fitted binary classifier or pipeline
+
+    threshold : float
+        Rows whose score (see `positive_scores`) is at least this value are predicted positive
+
+    pos_label : str
+        The positive class
+    """
+
+    def __init__(self, estimator, threshold, pos_label='> 50% diameter narrowing'):
+        self.estimator = estimator
+        self.threshold = threshold
+        self.pos_label = pos_label
+
+    @property
+    def classes_(self):
+        return self.estimator.classes_
+
+    def fit(self, X, y):
+        """Refits the wrapped estimator, keeping the threshold."""
+        self.estimator.fit(X, y)
+        return self
+
+    def decision_function(self, X):
+        """Returns the wrapped estimator's scores, positive for classes_[1] as in sklearn."""
+        return positive_scores(self.estimator, X, self.classes_[1])
+
+    def predict(self, X):
+        """Predicts the positive class where its score reaches the threshold."""
+        negative_label = [label for label in self.classes_ if label != self.pos_label][0]
+        scores = positive_scores(self.estimator, X, self.pos_label)
+        return np.where(scores >= self.threshold, self.pos_label, negative_label)
@@ -0,0 +1,113 @@
+# test_batch_scoring.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.batch_scoring import iter_chunks, score_file
+from src.threshold_tuning import ThresholdClassifier
+
+# Test data setup
+rng = np.random.default_rng(0)
+n = 103
+data = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n),
+    "Age (in years)": rng.integers(30, 80, n),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n).round(),
+    "Diagnosis of heart disease": rng.choice(["> 50% diameter narrowing", "< 50% diameter narrowing"], n),
+})
+# A missing age late in the file, so later chunks differ in type from the first
+data["Age (in years)"] = data["Age (in years)"].astype("Int64")
+data.loc[90, "Age (in years)"] = pd.NA
+
+X = data.drop(columns="Diagnosis of heart disease")
+y = data["Diagnosis of heart disease"]
+model = make_pipeline(
+    make_column_transformer(
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["Sex"]),
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()),
+         ["Age (in years)", "Serum cholesterol (in mg/dl)"]),
+    ),
+    LogisticRegression(),
+).fit(X.astype({"Age (in years)": float}), y)
+
+
+@pytest.fixture
+def pipeline_path(tmp_path):
+    path = tmp_path / "disease_pipeline.pickle"
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+# Test Case 1: chunked CSV scoring gives exactly the whole-file predictions
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_score_csv_matches_predict(tmp_path, pipeline_path, n_jobs):
+    data_path, output_path = tmp_path / "patients.csv", tmp_path / "predictions.csv"
+    data.to_csv(data_path, index=False)
+
+    stats = score_file(pipeline_path, str(data_path), str(output_path), chunk_size=10, n_jobs=n_jobs)
+    predictions = pd.read_csv(output_path)
+    whole = pd.read_csv(data_path).drop(columns="Diagnosis of heart disease")
+
+    assert stats["rows"] == n and stats["chunks"] == 11
+    assert stats["rows_per_sec"] > 0
+    np.testing.assert_array_equal(predictions["prediction"], model.predict(whole))
+    np.testing.assert_allclose(predictions["score"], model.decision_function(whole))
+
+
+# Test Case 2: Parquet input and output round-trip through the same path
+def test_score_parquet(tmp_path, pipeline_path):
+    pytest.importorskip("pyarrow")
+    data_path, output_path = tmp_path / "patients.parquet", tmp_path / "predictions.parquet"
+    data.to_parquet(data_path, index=False)
+
+    score_file(pipeline_path, str(data_path), str(output_path), chunk_size=25)
+    predictions = pd.read_parquet(output_path)
+    np.testing.assert_array_equal(predictions["prediction"], model.predict(pd.read_parquet(data_path).drop(columns="Diagnosis of heart disease")))
+
+
+# Test Case 3: a thresholded pipeline is scored with its tuned threshold
+def test_score_thresholded_model(tmp_path):
+    thresholded = ThresholdClassifier(model, -0.5)
+    pipeline_path, data_path, output_path = tmp_path / "model.pickle", tmp_path / "patients.csv", tmp_path / "out.csv"
+    with open(pipeline_path, "wb") as f:
+        pickle.dump(thresholded, f)
+    data.to_csv(data_path, index=False)
+
+    score_file(str(pipeline_path), str(data_path), str(output_path), chunk_size=40)
+    whole = pd.read_csv(data_path).drop(columns="Diagnosis of heart disease")
+    np.testing.assert_array_equal(pd.read_csv(output_path)["prediction"], thresholded.predict(whole))
+
+
+# Test Case 4: chunk sizes are validated and the label column is dropped
+def test_iter_chunks(tmp_path):
+    data_path = tmp_path / "patients.csv"
+    data.to_csv(data_path, index=False)
+    chunks = list(iter_chunks(str(data_path), chunk_size=50))
+    assert [len(chunk) for chunk in chunks] == [50, 50, 3]
+    assert "Diagnosis of heart disease" not in chunks[0].columns
+    with pytest.raises(ValueError):
+        list(iter_chunks(str(data_path), chunk_size=0))
+
+
+# Test Case 5: CSV column types come from the schema, not from the first chunk
+def test_iter_chunks_pins_declared_dtypes(tmp_path):
+    data_path = tmp_path / "patients.csv"
+    late = data.assign(Thalassemia=[np.nan] * 100 + ["normal"] * (len(data) - 100))
+    late.to_csv(data_path, index=False)
+    chunks = list(iter_chunks(str(data_path), chunk_size=50))
+    assert all(chunk["Thalassemia"].dtype == object for chunk in chunks)
+    assert chunks[-1]["Thalassemia"].tolist() == ["normal"] * 3
@@ -13,14 +13,19 @@ from sklearn.compose import make_column_transformer
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 from sklearn.impute import SimpleImputer
 from sklearn.datasets import make_classification
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, cross_validate, cross_val_predict, StratifiedKFold
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
 
-# Dynamically add the src directory to the Python path
-src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
-if src_path not in sys.path:
-    sys.path.append(src_path)
+# Dynamically add the src directory (and the project root, for src.* imports) to the Python path
+root_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+src_path = os.path.join(root_path, "src")
+for path in (src_path, root_path):
+    if path not in sys.path:
+        sys.path.append(path)
 
-from class_model_trainer import class_model_trainer
+from class_model_trainer import class_model_trainer, cross_validate_shared, TrainingResult
+from src.model_tuning import RegularizationPathSearchCV
 
 
 def test_class_model_trainer():
@@ -88,5 +93,106 @@ def test_class_model_trainer():
         shutil.rmtree(output_dir)
 
 
+def test_cross_validate_shared_matches_cross_validate():
+    # Fitting the preprocessor once per fold must not change any fold score
+    X, y = make_classification(n_samples=80, n_features=6, random_state=0)
+    X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(X.shape[1])])
+    y = pd.Series(np.where(y == 1, "pos", "neg"), name="target")
+
+    preprocessor = make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), list(X.columns))
+    )
+    models = {
+        "logreg": make_pipeline(preprocessor, LogisticRegression(random_state=0)),
+        "svc": make_pipeline(preprocessor, SVC(random_state=0)),
+    }
+    scoring = {"accuracy": "accuracy", "f1": "f1_macro"}
+
+    shared = cross_validate_shared(models, preprocessor, X, y, cv=4, scoring=scoring, n_jobs=2)
+
+    for model_name, pipeline in models.items():
+        expected = pd.DataFrame(
+            cross_validate(pipeline, X, y, cv=4, scoring=scoring, return_train_score=True)
+        )
+        assert list(shared[model_name].columns) == list(expected.columns)
+        score_columns = [col for col in expected.columns if not col.endswith("_time")]
+        np.testing.assert_allclose(shared[model_name][score_columns], expected[score_columns])
+
+    # Without scoring, each estimator's default scorer is reported as "score", as cross_validate does
+    default = cross_validate_shared(models, preprocessor, X, y, cv=4)
+    expected = pd.DataFrame(cross_validate(models["logreg"], X, y, cv=4, return_train_score=True))
+    assert list(default["logreg"].columns) == list(expected.columns)
+    np.testing.assert_allclose(default["logreg"]["test_score"], expected["test_score"])
+
+
+def test_scalable_tier_above_max_kernel_rows(tmp_path):
+    # Past max_kernel_rows the kernel SVCs are replaced by linear-time models, and the tier is recorded
+    X, y = make_classification(n_samples=120, n_features=6, random_state=1)
+    X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(X.shape[1])])
+    y = pd.Series(np.where(y == 1, '> 50% diameter narrowing', '<= 50% diameter narrowing'), name="target")
+    preprocessor = make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), list(X.columns))
+    )
+    os.makedirs(tmp_path / "tables")
+
+    for max_kernel_rows, tier in [(1000, "exact"), (100, "scalable")]:
+        models = class_model_trainer(preprocessor, X, y, pos_lable='> 50% diameter narrowing', seed=123,
+                                     write_to=str(tmp_path), cv=3, max_kernel_rows=max_kernel_rows)
+        assert ("svc" in models) == (tier == "exact")
+        assert ("nystroem_svc_bal" in models) == (tier == "scalable")
+        mean_df = pd.read_csv(tmp_path / "tables" / "cross_val_score.csv", header=[0, 1])
+        tier_df = pd.read_csv(tmp_path / "tables" / "cross_val_tier.csv")
+        assert set(tier_df["tier"]) == {tier}
+        assert list(tier_df["model"]) == list(models)
+        # The score tables stay numeric
+        assert all(pd.api.types.is_float_dtype(dtype) for dtype in mean_df.dtypes.iloc[1:])
+        assert mean_df.iloc[-2, 0] == "test_f1"
+
+    with pytest.raises(ValueError):
+        class_model_trainer(preprocessor, X, y, pos_lable='> 50% diameter narrowing', seed=123,
+                            write_to=str(tmp_path), tier="fast")
+
+
+def test_training_result_keeps_fits_and_folds(tmp_path):
+    # The fold fits, scores and assignment are returned, so later steps need not refit
+    X, y = make_classification(n_samples=90, n_features=5, random_state=3)
+    X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(X.shape[1])])
+    y = pd.Series(np.where(y == 1, '> 50% diameter narrowing', '<= 50% diameter narrowing'), name="target")
+    preprocessor = make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), list(X.columns))
+    )
+    os.makedirs(tmp_path / "tables")
+
+    result = class_model_trainer(preprocessor, X, y, pos_lable='> 50% diameter narrowing', seed=123,
+                                 write_to=str(tmp_path), cv=3)
+    assert isinstance(result, TrainingResult) and result.tier == "exact"
+    assert set(result.fold_estimators) == set(result) == set(result.cv_results)
+    assert all(len(estimators) == 3 for estimators in result.fold_estimators.values())
+    assert list(result.timings.columns) == ["fit_time", "score_time", "mean_fit_time", "mean_score_time"]
+    assert "estimator" not in result.cv_results["logreg"].columns
+
+    expected_splits = StratifiedKFold(3).split(X, y)
+    for (train_idx, test_idx), (expected_train, expected_test) in zip(result.splits, expected_splits):
+        np.testing.assert_array_equal(train_idx, expected_train)
+        np.testing.assert_array_equal(test_idx, expected_test)
+
+    # Out-of-fold predictions from the stored fits equal a fresh cross_val_predict
+    for model_name in ["dummy", "logreg_bal"]:
+        expected = cross_val_predict(result[model_name], X, y, cv=3, method="predict")
+        np.testing.assert_array_equal(result.out_of_fold(model_name, X), expected)
+
+    # Both tables come from the one summary
+    mean_df = pd.read_csv(tmp_path / "tables" / "cross_val_score.csv")
+    std_df = pd.read_csv(tmp_path / "tables" / "cross_val_std.csv")
+    pd.testing.assert_frame_equal(mean_df, std_df)
+    assert pd.read_csv(tmp_path / "tables" / "cross_val_tier.csv")["tier"].tolist() == ["exact"] * len(result)
+
+    # Tuning on the stored folds matches tuning that encodes the data again
+    Cs = np.logspace(-2, 2, 5)
+    reused = RegularizationPathSearchCV(result["logreg_bal"], Cs=Cs, cv=3, folds=result.folds).fit(X, y)
+    fresh = RegularizationPathSearchCV(result["logreg_bal"], Cs=Cs, cv=3).fit(X, y)
+    np.testing.assert_array_equal(reused.cv_results_["mean_test_score"], fresh.cv_results_["mean_test_score"])
+
+
 if __name__ == "__main__":
     pytest.main(["-v", "test/test_class_model_trainer.py"])
@@ -0,0 +1,74 @@
+# test_codebook.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.codebook import CODEBOOK, DIAGNOSIS_CODES, decode_column, decode_csv, decode_frame, read_decoded
+
+# Test data setup: source codes as ucimlrepo returns them
+source_df = pd.DataFrame({
+    "age": [63, 67, 37],
+    "sex": [1, 1, 0],
+    "cp": [1, 4, 3],
+    "trestbps": [145, 160, 130],
+    "chol": [233, 286, 250],
+    "fbs": [1, 0, 0],
+    "restecg": [2, 2, 0],
+    "thalach": [150, 108, 187],
+    "exang": [0, 1, 0],
+    "oldpeak": [2.3, 1.5, 3.5],
+    "slope": [3, 2, 3],
+    "ca": [0.0, 3.0, np.nan],
+    "thal": [6.0, 3.0, np.nan],
+    "num": [0, 2, 4],
+})
+
+
+# Test Case 1: codes map to labels; missing, unknown and fractional codes become missing
+def test_decode_column():
+    decoded = decode_column([3, 6.0, 7, np.nan, 5, 6.5, -1, 100], CODEBOOK["thal"][1])
+    assert isinstance(decoded, pd.Categorical)
+    assert list(decoded.categories) == ["normal", "fixed defect", "reversable defect"]
+    assert list(decoded[:3]) == ["normal", "fixed defect", "reversable defect"]
+    assert pd.isna(decoded[3:]).all()
+
+    diagnosis = decode_column(pd.Series([0, 1, 3, 4], dtype="Int64"), DIAGNOSIS_CODES)
+    assert list(diagnosis.categories) == ["< 50% diameter narrowing", "> 50% diameter narrowing"]
+    assert list(diagnosis.codes) == [0, 1, 1, -1]
+
+
+# Test Case 2: a frame is decoded under the display names with the codebook dtypes
+def test_decode_frame():
+    decoded = decode_frame(source_df)
+    assert list(decoded.columns) == [name for name, _, _ in CODEBOOK.values()]
+    assert list(decoded["Sex"]) == ["male", "male", "female"]
+    assert decoded["Chest pain type"].dtype == "category"
+    assert list(decoded["Fasting blood sugar > 120 mg/dl"]) == [True, False, False]
+    assert decoded["Age (in years)"].dtype == "Int64"
+    assert decoded["Thalassemia"].isna().tolist() == [False, False, True]
+    assert list(decoded["Diagnosis of heart disease"]) == [0, 2, 4]
+
+    with pytest.raises(ValueError):
+        decode_frame(source_df.drop(columns="thal"))
+
+
+# Test Case 3: decoding a file in chunks writes what decoding it whole writes, and reads back typed
+def test_decode_csv_in_chunks(tmp_path):
+    source = pd.concat([source_df] * 5, ignore_index=True)
+    source.to_csv(tmp_path / "source.csv", index=False)
+    decode_frame(source).to_csv(tmp_path / "whole.csv", index=False)
+
+    assert decode_csv(str(tmp_path / "source.csv"), str(tmp_path / "chunked.csv"), chunksize=4) == 15
+    assert (tmp_path / "chunked.csv").read_text() == (tmp_path / "whole.csv").read_text()
+
+    decoded = read_decoded(str(tmp_path / "chunked.csv"), chunksize=4)
+    pd.testing.assert_frame_equal(decoded, read_decoded(str(tmp_path / "chunked.csv")))
+    assert decoded["Sex"].dtype == pd.CategoricalDtype(["female", "male"])
+    assert decoded["Fasting blood sugar > 120 mg/dl"].dtype == pd.CategoricalDtype([False, True])
@@ -0,0 +1,91 @@
+# test_compact_features.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import GaussianNB
+from sklearn.svm import SVC
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.compact_features import (DenseTransformer, accepts_sparse, may_produce_sparse, with_dense_fallback,
+                                  make_compact, feature_memory_report)
+from src.fused_preprocessor import FusedPreprocessor
+from src.class_model_trainer import class_model_trainer
+
+# Test data setup
+rng = np.random.default_rng(3)
+n = 90
+X = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"], n).astype(object),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n),
+})
+X.loc[::8, "Chest pain type"] = np.nan
+y = pd.DataFrame({"Diagnosis of heart disease": np.where(X["Age (in years)"] + rng.normal(0, 10, n) > 55,
+                                                         '> 50% diameter narrowing', '< 50% diameter narrowing')})
+categorical = ["Sex", "Chest pain type"]
+numeric = ["Age (in years)", "Serum cholesterol (in mg/dl)"]
+
+composite = make_column_transformer(
+    (make_pipeline(SimpleImputer(strategy="most_frequent"),
+                   OneHotEncoder(handle_unknown="ignore", drop="if_binary", dtype=int, sparse_output=False)),
+     categorical),
+    (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric),
+)
+
+
+# Test Case 1: compact preprocessors give the dense values as a sparse float32 matrix
+@pytest.mark.parametrize("dense", [composite, FusedPreprocessor(categorical, numeric)])
+def test_make_compact(dense):
+    compact = make_compact(dense)
+    assert not may_produce_sparse(dense) and may_produce_sparse(compact)
+
+    encoded = compact.fit_transform(X)
+    assert sparse.issparse(encoded) and encoded.dtype == np.float32
+    expected = dense.fit_transform(X).astype(np.float32)
+    np.testing.assert_array_equal(encoded.toarray(), expected)
+
+    with pytest.raises(ValueError):
+        make_compact(StandardScaler())
+
+
+# Test Case 2: only estimators that need dense input get a DenseTransformer
+def test_with_dense_fallback():
+    compact = make_compact(composite)
+    assert accepts_sparse(LogisticRegression()) and accepts_sparse(SVC())
+    assert not accepts_sparse(GaussianNB())
+
+    assert len(with_dense_fallback(make_pipeline(compact, LogisticRegression())).steps) == 2
+    assert len(with_dense_fallback(make_pipeline(composite, GaussianNB())).steps) == 2
+    pipeline = with_dense_fallback(make_pipeline(compact, GaussianNB()))
+    assert isinstance(pipeline[1], DenseTransformer)
+    pipeline.fit(X, y.to_numpy().ravel())
+    assert pipeline.score(X, y.to_numpy().ravel()) > 0.5
+
+
+# Test Case 3: the memory report covers each stage and shows the compact savings
+def test_feature_memory_report(tmp_path):
+    os.makedirs(tmp_path / "tables")
+    compact = make_compact(composite)
+    models = class_model_trainer(compact, X, y, pos_lable='> 50% diameter narrowing', seed=123,
+                                 write_to=str(tmp_path), cv=3, n_jobs=1, shared_dir=str(tmp_path / "cache"))
+    assert all(len(pipeline.steps) <= 2 for pipeline in models.values())
+
+    report = feature_memory_report(compact, models, X, y, n_folds=3).set_index("stage")
+    assert report.loc["encoded features", "format"] == "CSR"
+    assert report.loc["encoded features", "dtype"] == "float32"
+    assert report.loc["encoded features", "megabytes"] < report.loc["dense float64 equivalent", "megabytes"]
+    assert report.loc["estimator input: dummy", "format"] == "DataFrame"
+    assert report.loc["estimator input: svc", "format"] == "CSR"
@@ -0,0 +1,113 @@
+# test_compiled_scorer.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import subprocess
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler, MinMaxScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.compiled_scorer import compile_pipeline, export_scorer, CompiledScorer
+from src.threshold_tuning import ThresholdClassifier
+from src.fused_preprocessor import FusedPreprocessor
+from src.compact_features import make_compact
+
+# Test data setup
+rng = np.random.default_rng(1)
+n = 120
+X = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Thalassemia": rng.choice(["normal", "fixed defect", "reversable defect"], n).astype(object),
+    "Fasting blood sugar > 120 mg/dl": rng.choice([True, False], n),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n),
+})
+y = rng.choice(["> 50% diameter narrowing", "< 50% diameter narrowing"], n)
+categorical = ["Sex", "Thalassemia", "Fasting blood sugar > 120 mg/dl"]
+numeric = ["Age (in years)", "Serum cholesterol (in mg/dl)"]
+
+
+def make_model(scaler=StandardScaler()):
+    return make_pipeline(
+        make_column_transformer(
+            (make_pipeline(SimpleImputer(strategy="most_frequent"),
+                           OneHotEncoder(handle_unknown="ignore", drop="if_binary", dtype=int, sparse_output=False)),
+             categorical),
+            (make_pipeline(SimpleImputer(strategy="median"), scaler), numeric),
+        ),
+        LogisticRegression(class_weight="balanced"),
+    ).fit(X, y)
+
+
+# Rows with missing values and an unseen category
+X_new = X.copy().astype({"Fasting blood sugar > 120 mg/dl": object})
+X_new.loc[::4, "Age (in years)"] = np.nan
+X_new.loc[::5, "Thalassemia"] = np.nan
+X_new.loc[::6, "Fasting blood sugar > 120 mg/dl"] = np.nan
+X_new.loc[1::7, "Sex"] = "unknown"
+
+
+# Test Case 1: the compiled scorer reproduces the pipeline bit for bit
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_compiled_scorer_is_bit_identical(tmp_path):
+    model = make_model()
+    export_scorer(model, tmp_path / "scorer.json")
+    scorer = CompiledScorer.load(tmp_path / "scorer.json")
+
+    for data in (X, X_new):
+        np.testing.assert_array_equal(scorer.transform(data), model[0].transform(data))
+        np.testing.assert_array_equal(scorer.decision_function(data), model.decision_function(data))
+        np.testing.assert_array_equal(scorer.predict(data), model.predict(data))
+
+
+# Test Case 2: a thresholded model keeps its threshold, and a dict of columns is accepted
+def test_compiled_threshold():
+    thresholded = ThresholdClassifier(make_model(), 0.3)
+    scorer = CompiledScorer(compile_pipeline(thresholded))
+    np.testing.assert_array_equal(scorer.predict(X.to_dict("list")), thresholded.predict(X))
+
+
+# Test Case 3: steps without a compiled equivalent are rejected
+def test_unsupported_step():
+    with pytest.raises(ValueError):
+        compile_pipeline(make_model(scaler=MinMaxScaler()))
+
+
+# Test Case 4: scoring with the artifact does not import scikit-learn
+def test_scorer_does_not_import_sklearn(tmp_path):
+    export_scorer(make_model(), tmp_path / "scorer.json")
+    row = {column: [value] for column, value in X.iloc[0].items()}
+    code = ("import sys; from src.compiled_scorer import CompiledScorer; "
+            f"CompiledScorer.load({str(tmp_path / 'scorer.json')!r}).predict({row!r}); "
+            "assert 'sklearn' not in sys.modules and 'pandas' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), '..'), check=True)
+
+
+# Test Case 5: a pipeline built on the fused preprocessor compiles to the same scores
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_compiled_fused_preprocessor(dtype):
+    model = make_pipeline(FusedPreprocessor(categorical, numeric, dtype=dtype),
+                          LogisticRegression(class_weight="balanced")).fit(X, y)
+    scorer = CompiledScorer(compile_pipeline(model))
+    np.testing.assert_array_equal(scorer.decision_function(X_new), model.decision_function(X_new))
+
+
+# Test Case 6: compact (sparse float32) preprocessors compile to the same scores
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_compiled_compact_preprocessors():
+    dense_models = [make_model(), make_pipeline(FusedPreprocessor(categorical, numeric), LogisticRegression())]
+    for dense in dense_models:
+        model = make_pipeline(make_compact(dense[0]), LogisticRegression(class_weight="balanced")).fit(X, y)
+        artifact = compile_pipeline(model)
+        assert artifact["sparse"]
+        scorer = CompiledScorer(artifact)
+        np.testing.assert_array_equal(scorer.decision_function(X_new), model.decision_function(X_new))
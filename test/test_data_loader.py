@@ -0,0 +1,87 @@
+# test_data_loader.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.codebook import CODEBOOK, decode_frame
+from src.data_loader import COMPACT_DTYPES, compact_dtypes, format_footprint, load_heart_data
+from src.data_validation import validate_data
+from src.storage import write_dataset
+
+# Test data setup: source codes as ucimlrepo returns them, decoded, with a missing value in most columns
+source_df = pd.DataFrame({
+    "age": [63, 67, 37, 41],
+    "sex": [1, 1, 0, 0],
+    "cp": [1, 4, 3, 2],
+    "trestbps": [145, 160, np.nan, 130],
+    "chol": [233, 286, 250, 204],
+    "fbs": [1, 0, np.nan, 0],
+    "restecg": [2, 2, 0, 1],
+    "thalach": [150, 108, 187, 172],
+    "exang": [0, 1, 0, 0],
+    "oldpeak": [2.3, 1.5, 3.5, 1.4],
+    "slope": [3, 2, 3, 1],
+    "ca": [0.0, 3.0, np.nan, 0.0],
+    "thal": [6.0, 3.0, np.nan, 7.0],
+    "num": [0, 2, 4, 1],
+})
+raw_df = decode_frame(source_df)
+processed_df = raw_df.assign(**{"Diagnosis of heart disease": ["< 50% diameter narrowing", "> 50% diameter narrowing",
+                                                                 np.nan, "> 50% diameter narrowing"]})
+
+
+# Test Case 1: every codebook column has a declared dtype, and the diagnosis dtype follows its values
+def test_compact_dtypes():
+    assert set(COMPACT_DTYPES) == {name for name, _, _ in CODEBOOK.values()} - {"Diagnosis of heart disease"} | {"Site"}
+    assert COMPACT_DTYPES["Fasting blood sugar > 120 mg/dl"] == "boolean"
+    assert COMPACT_DTYPES["Age (in years)"] == "Int8"
+    assert COMPACT_DTYPES["ST depression induced by exercise relative to rest"] == "float64"
+    assert compact_dtypes(raw_df)["Diagnosis of heart disease"] == "Int8"
+    assert compact_dtypes(processed_df)["Diagnosis of heart disease"] == pd.CategoricalDtype(
+        ["< 50% diameter narrowing", "> 50% diameter narrowing"])
+
+
+# Test Case 2: CSV, Parquet and Arrow files, whole or in chunks, load into the same compact frame
+def test_load_heart_data(tmp_path):
+    frames = {}
+    for name in ["processed.csv", "processed.parquet", "processed.arrow"]:
+        write_dataset(processed_df, str(tmp_path / name))
+        frames[name], footprint = load_heart_data(str(tmp_path / name))
+        pd.testing.assert_frame_equal(load_heart_data(str(tmp_path / name), chunksize=3)[0], frames[name])
+    frame = frames["processed.csv"]
+    pd.testing.assert_frame_equal(frames["processed.parquet"], frame)
+    pd.testing.assert_frame_equal(frames["processed.arrow"], frame)
+
+    assert dict(frame.dtypes) == compact_dtypes(processed_df)
+    assert frame["Fasting blood sugar > 120 mg/dl"].tolist()[:2] == [True, False]
+    assert frame["Resting blood pressure (in mm Hg on admission to the hospital)"].isna().tolist() == [False, False, True, False]
+    assert frame["Sex"].tolist() == ["male", "male", "female", "female"]
+    assert frame["Diagnosis of heart disease"].isna().sum() == 1
+
+    # Past a few rows, the category codes and narrow integers take a fraction of the default dtypes
+    write_dataset(pd.concat([processed_df] * 50, ignore_index=True), str(tmp_path / "repeated.csv"))
+    _, footprint = load_heart_data(str(tmp_path / "repeated.csv"))
+    assert footprint["after"] * 4 < footprint["before"]
+    assert format_footprint(footprint).endswith("x smaller)")
+
+
+# Test Case 3: compact frames still pass the data validation schema
+def test_compact_data_validates(tmp_path):
+    write_dataset(processed_df.dropna(), str(tmp_path / "processed.csv"))
+    frame, _ = load_heart_data(str(tmp_path / "processed.csv"))
+    validate_data(frame)
+
+
+# Test Case 4: a label outside the declared categories fails the load instead of becoming missing
+def test_unknown_label_is_rejected(tmp_path):
+    write_dataset(processed_df.astype({"Sex": object}).assign(Sex=["male", "male", "other", "female"]),
+                  str(tmp_path / "processed.csv"))
+    with pytest.raises(ValueError, match="Sex"):
+        load_heart_data(str(tmp_path / "processed.csv"))
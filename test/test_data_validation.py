@@ -10,7 +10,7 @@ import pandas as pd
 import pandera as pa
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from src.data_validation import validate_data
+from src.data_validation import validate_data, validate_features
 
 
 # Test data setup
@@ -84,4 +84,45 @@ invalid_data_cases.append((case_missing_obs, f"Check absent or incorrect for mis
 @pytest.mark.parametrize("invalid_data, description", invalid_data_cases)
 def test_valid_w_invalid_data(invalid_data, description):
     with pytest.raises(pa.errors.SchemaErrors) as excinfo:
-        validate_data(invalid_data)
\ No newline at end of file
+        validate_data(invalid_data)
+
+
+# Setup feature payloads (no diagnosis) as they arrive from JSON
+valid_features = valid_data.drop(columns="Diagnosis of heart disease")
+
+# Case: a payload row with missing values in nullable columns is accepted on its own,
+# and comes back the way pandas.read_csv would give it to the pipeline
+def test_validate_features_single_row_with_missing():
+    row = valid_features.iloc[[0]].astype(object)
+    row.loc[0, ["Age (in years)", "Fasting blood sugar > 120 mg/dl", "Thalassemia"]] = None
+    validated = validate_features(row)
+    assert validated["Age (in years)"].dtype == float
+    assert validated.loc[0, ["Age (in years)", "Fasting blood sugar > 120 mg/dl", "Thalassemia"]].isna().all()
+    assert validated.loc[0, "Thalassemia"] is not None
+
+# Case: duplicate rows are allowed in a payload
+def test_validate_features_allows_duplicates():
+    validated = validate_features(pd.concat([valid_features, valid_features], ignore_index=True))
+    assert len(validated) == 2 * len(valid_features)
+
+# Setup list of invalid payload cases
+invalid_feature_cases = []
+
+case_wrong_category = valid_features.copy()
+case_wrong_category.loc[0, "Sex"] = "unknown"
+invalid_feature_cases.append(case_wrong_category)
+
+case_fractional_age = valid_features.copy().astype({"Age (in years)": float})
+case_fractional_age.loc[0, "Age (in years)"] = 63.5
+invalid_feature_cases.append(case_fractional_age)
+
+case_missing_required = valid_features.copy()
+case_missing_required.loc[0, "Chest pain type"] = None
+invalid_feature_cases.append(case_missing_required)
+
+invalid_feature_cases.append(valid_features.drop(columns="Thalassemia"))
+
+@pytest.mark.parametrize("invalid_features", invalid_feature_cases)
+def test_validate_features_w_invalid_data(invalid_features):
+    with pytest.raises(pa.errors.SchemaErrors):
+        validate_features(invalid_features)
@@ -0,0 +1,75 @@
+# test_dataset_store.py
+# author: agent
+# date: 2026-10-17
+
+import functools
+import hashlib
+import os
+import sys
+import threading
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.dataset_store import DatasetStore, uci_name
+
+# Test data setup
+data = b"age,sex,num\n63,1,0\n67,1,2\n"
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """A local HTTP server of `tmp_path`, standing in for the dataset host"""
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=str(tmp_path))
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+# Test Case 1: bytes are stored once under their checksum and resolved by name
+def test_put_and_resolve(tmp_path):
+    store = DatasetStore(str(tmp_path / "store"))
+    assert uci_name(45) not in store
+    with pytest.raises(KeyError):
+        store.resolve(uci_name(45))
+
+    digest = store.put(data, uci_name(45), source="test")
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert uci_name(45) in store
+    assert store.ref(uci_name(45))["size"] == len(data)
+    with open(store.resolve(uci_name(45)), "rb") as f:
+        assert f.read() == data
+
+    # The same bytes under another name share the object
+    store.put(data, "copy")
+    objects = [name for _, _, files in os.walk(tmp_path / "store" / "objects") for name in files]
+    assert objects == [digest]
+
+
+# Test Case 2: a corrupted object fails its checksum
+def test_resolve_detects_corruption(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    digest = store.put(data, "heart")
+    with open(store.object_path(digest), "ab") as f:
+        f.write(b"1,1,1\n")
+    with pytest.raises(ValueError):
+        store.resolve("heart")
+    store.resolve("heart", verify=False)
+
+
+# Test Case 3: the store is seeded from a local file, a file:// URL and a local HTTP server
+def test_fetch(tmp_path, http_server):
+    (tmp_path / "heart.csv").write_bytes(data)
+    store = DatasetStore(str(tmp_path / "store"))
+
+    digests = {
+        store.fetch(str(tmp_path / "heart.csv"), "from-path"),
+        store.fetch((tmp_path / "heart.csv").as_uri(), "from-file-url"),
+        store.fetch(f"{http_server}/heart.csv", "from-http"),
+    }
+    assert digests == {hashlib.sha256(data).hexdigest()}
+    assert store.ref("from-http")["source"] == f"{http_server}/heart.csv"
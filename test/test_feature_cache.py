@@ -0,0 +1,86 @@
+# test_feature_cache.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.impute import SimpleImputer
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.feature_cache import file_digest, transformer_digest, encode_cached
+from src.class_model_trainer import preprocess_folds
+from src.compact_features import make_compact
+
+# Test data setup
+data = pd.DataFrame({
+    "Sex": ["male", "female", "female", "male", "male", "female", "male", "female"],
+    "Age (in years)": [63, 37, 41, 56, 57, 62, 44, 52],
+    "Diagnosis of heart disease": ["> 50% diameter narrowing", "< 50% diameter narrowing"] * 4,
+})
+
+
+def make_preprocessor(strategy="median"):
+    return make_column_transformer(
+        (OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["Sex"]),
+        (make_pipeline(SimpleImputer(strategy=strategy), StandardScaler()), ["Age (in years)"]),
+    )
+
+
+# Test Case 1: digests follow the file contents and the transformer configuration
+def test_digests(tmp_path):
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    first = file_digest(path)
+    data.iloc[:-1].to_csv(path, index=False)
+    assert file_digest(path) != first
+
+    assert transformer_digest(make_preprocessor()) == transformer_digest(make_preprocessor())
+    assert transformer_digest(make_preprocessor()) != transformer_digest(make_preprocessor("mean"))
+
+
+# Test Case 2: a cache hit reopens the stored matrix as a memory map
+def test_encode_cached(tmp_path):
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    X, y = data.drop(columns="Diagnosis of heart disease"), data["Diagnosis of heart disease"]
+    preprocessor = make_preprocessor().fit(X, y)
+    cache_dir = tmp_path / "cache"
+
+    X_encoded, labels = encode_cached(preprocessor, str(path), str(cache_dir))
+    assert isinstance(X_encoded, np.memmap)
+    np.testing.assert_allclose(X_encoded, preprocessor.transform(X))
+    np.testing.assert_array_equal(labels, y)
+
+    encode_cached(preprocessor, str(path), str(cache_dir))
+    assert len(os.listdir(cache_dir)) == 1
+
+
+# Test Case 3: folds encoded for the same data and preprocessor are stored once
+def test_fold_cache_is_reused(tmp_path):
+    X, y = data.drop(columns="Diagnosis of heart disease"), data[["Diagnosis of heart disease"]]
+    first = preprocess_folds(make_preprocessor(), X, y, cv=2, shared_dir=str(tmp_path))
+    second = preprocess_folds(make_preprocessor(), X, y, cv=2, shared_dir=str(tmp_path))
+
+    assert len(os.listdir(tmp_path)) == 1
+    np.testing.assert_allclose(first[1]["X_test"], second[1]["X_test"])
+
+
+# Test Case 4: sparse float32 output is cached sparse, over memory maps
+def test_encode_cached_sparse(tmp_path):
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    X, y = data.drop(columns="Diagnosis of heart disease"), data["Diagnosis of heart disease"]
+    preprocessor = make_compact(make_preprocessor()).fit(X, y)
+
+    X_encoded, _ = encode_cached(preprocessor, str(path), str(tmp_path / "cache"))
+    assert sparse.issparse(X_encoded) and X_encoded.dtype == np.float32
+    assert not X_encoded.data.flags.owndata and not X_encoded.data.flags.writeable
+    np.testing.assert_array_equal(X_encoded.toarray(), preprocessor.transform(X).toarray())
@@ -0,0 +1,82 @@
+# test_feature_importance.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.compose import make_column_transformer
+from sklearn.inspection import permutation_importance
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import make_scorer, f1_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.feature_importance import feature_groups, permutation_importance_encoded
+from src.fused_preprocessor import FusedPreprocessor
+
+# Test data setup
+rng = np.random.default_rng(7)
+n = 120
+X = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "asymptomatic"], n).astype(object),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Age (in years) squared": rng.normal(0, 1, n),
+})
+y = np.where(X["Age (in years)"] + 10 * (X["Chest pain type"] == "asymptomatic") + rng.normal(0, 8, n) > 60,
+             '> 50% diameter narrowing', '< 50% diameter narrowing')
+categorical, numeric = ["Sex", "Chest pain type"], ["Age (in years)", "Age (in years) squared"]
+pos_label = '> 50% diameter narrowing'
+
+
+def composite_pipeline():
+    preprocessor = make_column_transformer(
+        (OneHotEncoder(drop='if_binary', sparse_output=False), categorical),
+        (StandardScaler(), numeric),
+    )
+    return make_pipeline(preprocessor, LogisticRegression()).fit(X, y)
+
+
+# Test Case 1: one-hot columns are grouped back to their feature, also when a name prefixes another
+def test_feature_groups():
+    for preprocessor in [composite_pipeline()[0], FusedPreprocessor(categorical, numeric).fit(X, y)]:
+        groups = feature_groups(preprocessor)
+        assert list(groups) == list(X.columns)
+        assert sorted(len(columns) for columns in groups.values()) == [1, 1, 1, 3]
+        assert len(groups["Chest pain type"]) == 3
+        assert len(groups["Age (in years)"]) == 1
+        assert sorted(np.concatenate(list(groups.values()))) == list(range(6))
+
+
+# Test Case 2: the importances equal sklearn's permutation importance on the raw features
+@pytest.mark.parametrize("make_model", [composite_pipeline,
+                                        lambda: make_pipeline(FusedPreprocessor(categorical, numeric),
+                                                              LogisticRegression()).fit(X, y)])
+def test_matches_sklearn_permutation_importance(make_model):
+    model = make_model()
+    scorer = make_scorer(f1_score, pos_label=pos_label)
+    reference = permutation_importance(model, X, y, scoring=scorer, n_repeats=6, random_state=3)
+
+    for scoring in [scorer, "f1"]:
+        result = permutation_importance_encoded(model, X, y, scoring=scoring, n_repeats=6, random_state=3)
+        result = result.set_index("feature").loc[X.columns]
+        np.testing.assert_allclose(result.filter(like="repeat_").to_numpy(), reference.importances, atol=1e-12)
+        np.testing.assert_allclose(result["importance_mean"], reference.importances_mean, atol=1e-12)
+        np.testing.assert_allclose(result["importance_std"], reference.importances_std, atol=1e-12)
+
+
+# Test Case 3: the result does not depend on the number of workers, and is sorted by importance
+def test_parallel_matches_serial():
+    model = composite_pipeline()
+    serial = permutation_importance_encoded(model, X, y, scoring="f1", n_repeats=5, n_jobs=1, random_state=0)
+    parallel = permutation_importance_encoded(model, X, y, scoring="f1", n_repeats=5, n_jobs=2, random_state=0)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["importance_mean"].is_monotonic_decreasing
+    assert list(serial.columns[:4]) == ["feature", "n_columns", "importance_mean", "importance_std"]
+    assert serial.set_index("feature").loc["Chest pain type", "n_columns"] == 3
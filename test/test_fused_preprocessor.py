@@ -0,0 +1,96 @@
+# test_fused_preprocessor.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import cross_validate
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.fused_preprocessor import FusedPreprocessor
+from src.class_model_trainer import cross_validate_shared
+
+# Test data setup
+rng = np.random.default_rng(2)
+n = 80
+X = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"], n).astype(object),
+    "Fasting blood sugar > 120 mg/dl": rng.choice([True, False], n),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n),
+    "Constant": np.full(n, 3.0),
+})
+X.loc[::7, "Chest pain type"] = np.nan
+X.loc[::9, "Age (in years)"] = np.nan
+y = pd.DataFrame({"target": rng.choice(["> 50% diameter narrowing", "< 50% diameter narrowing"], n)})
+categorical = ["Sex", "Chest pain type", "Fasting blood sugar > 120 mg/dl"]
+numeric = ["Age (in years)", "Serum cholesterol (in mg/dl)", "Constant"]
+
+composite = make_column_transformer(
+    (make_pipeline(SimpleImputer(strategy="most_frequent"),
+                   OneHotEncoder(handle_unknown="ignore", drop="if_binary", dtype=int, sparse_output=False)),
+     categorical),
+    (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric),
+)
+
+X_new = X.copy()
+X_new.loc[::5, "Sex"] = np.nan
+X_new.loc[1::6, "Chest pain type"] = "unknown"
+X_new.loc[::4, "Serum cholesterol (in mg/dl)"] = np.nan
+
+
+# Test Case 1: same columns, same order and the same values as the composite preprocessor
+def test_matches_composite():
+    expected = clone(composite).fit(X)
+    fused = FusedPreprocessor(categorical, numeric).fit(X)
+    for data in (X, X_new):
+        np.testing.assert_array_equal(fused.transform(data), expected.transform(data))
+    assert len(fused.get_feature_names_out()) == fused.transform(X).shape[1]
+
+
+# Test Case 2: float32 and sparse outputs hold the same values
+def test_output_formats():
+    expected = clone(composite).fit_transform(X)
+    as_float32 = FusedPreprocessor(categorical, numeric, dtype=np.float32).fit_transform(X)
+    as_sparse = FusedPreprocessor(categorical, numeric, sparse_output=True).fit_transform(X)
+    assert as_float32.dtype == np.float32
+    np.testing.assert_allclose(as_float32, expected, rtol=1e-6)
+    assert sparse.isspmatrix_csr(as_sparse)
+    np.testing.assert_array_equal(as_sparse.toarray(), expected)
+
+
+# Test Case 3: ties in the most frequent category go to the smallest value, as in SimpleImputer
+def test_most_frequent_tie():
+    data = pd.DataFrame({"Sex": ["male", "female", np.nan, "male", "female"], "Age (in years)": [1.0] * 5})
+    fused = FusedPreprocessor(["Sex"], ["Age (in years)"], drop=None).fit(data)
+    assert fused.categorical_fill_ == ["female"]
+    np.testing.assert_array_equal(fused.transform(data)[2, :2], [1, 0])
+
+
+# Test Case 4: unknown categories can be rejected
+def test_handle_unknown_error():
+    fused = FusedPreprocessor(categorical, numeric, handle_unknown="error").fit(X)
+    with pytest.raises(ValueError):
+        fused.transform(X_new)
+
+
+# Test Case 5: drop-in replacement inside the shared-fold cross-validation
+def test_plugs_into_cross_validation():
+    fused = FusedPreprocessor(categorical, numeric)
+    pipeline = make_pipeline(fused, LogisticRegression())
+    results = cross_validate_shared({"logreg": pipeline}, fused, X, y, cv=3, scoring={"accuracy": "accuracy"})
+    expected = cross_validate(make_pipeline(clone(composite), LogisticRegression()), X, y.squeeze(), cv=3,
+                              scoring="accuracy")
+    np.testing.assert_allclose(results["logreg"]["test_accuracy"], expected["test_score"])
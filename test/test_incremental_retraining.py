@@ -0,0 +1,98 @@
+# test_incremental_retraining.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import make_pipeline
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.incremental_retraining import RetrainingState, incremental_retrain, map_coefficients
+from src.fused_preprocessor import FusedPreprocessor
+
+# Test data setup
+rng = np.random.default_rng(7)
+n = 260
+data = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "asymptomatic"], n).astype(object),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n),
+})
+data.loc[::9, "Age (in years)"] = np.nan
+data["Diagnosis of heart disease"] = np.where(data["Age (in years)"].fillna(55) + rng.normal(0, 8, n) > 55,
+                                              '> 50% diameter narrowing', '< 50% diameter narrowing')
+# A category that only appears in the appended rows
+data.loc[200:, "Chest pain type"] = data.loc[200:, "Chest pain type"].replace("asymptomatic", "non-anginal pain")
+data.loc[:199, "Chest pain type"] = data.loc[:199, "Chest pain type"].replace("non-anginal pain", "asymptomatic")
+categorical = ["Sex", "Chest pain type"]
+numeric = ["Age (in years)", "Serum cholesterol (in mg/dl)"]
+target = "Diagnosis of heart disease"
+
+
+def train_state(path, n_rows):
+    """Write the first `n_rows` rows, fit the pipeline on them and record its state."""
+    data.iloc[:n_rows].to_csv(path, index=False)
+    X, y = data.iloc[:n_rows].drop(columns=target), data.iloc[:n_rows][target]
+    model = make_pipeline(FusedPreprocessor(categorical, numeric),
+                          LogisticRegression(C=0.5, max_iter=1000, class_weight="balanced")).fit(X, y)
+    return RetrainingState.from_training(path, X, y, model, categorical, numeric, seed=0)
+
+
+# Test Case 1: appended rows are counted; any other edit is detected
+def test_new_rows_detects_appends(tmp_path):
+    path = str(tmp_path / "train.csv")
+    state = train_state(path, 200)
+    assert state.new_rows(path, 200) == 0
+
+    data.iloc[200:].to_csv(path, mode="a", header=False, index=False)
+    assert state.new_rows(path, n) == 60
+
+    data.iloc[1:].to_csv(path, index=False)
+    assert state.new_rows(path, n - 1) is None
+
+
+# Test Case 2: coefficients follow their feature names; unseen columns start at zero
+def test_map_coefficients():
+    classifier = LogisticRegression(C=2.0).fit(np.eye(3), [0, 1, 1])
+    mapped = map_coefficients(classifier, ["a", "b", "c"], ["c", "new", "a"])
+
+    np.testing.assert_array_equal(mapped.coef_[0], [classifier.coef_[0, 2], 0.0, classifier.coef_[0, 0]])
+    np.testing.assert_array_equal(mapped.intercept_, classifier.intercept_)
+    assert mapped.C == 2.0
+
+
+# Test Case 3: the retrained pipeline uses statistics of every row and C near the previous optimum
+def test_incremental_retrain(tmp_path):
+    path = str(tmp_path / "train.csv")
+    state = train_state(path, 200)
+    data.iloc[200:].to_csv(path, mode="a", header=False, index=False)
+    X, y = data.drop(columns=target), data[target]
+
+    pipeline, search, summary = incremental_retrain(state, path, X, y, scoring="accuracy", n_Cs=3, cv=3)
+
+    full = FusedPreprocessor(categorical, numeric).fit(X)
+    np.testing.assert_allclose(pipeline[0].transform(X), full.transform(X))
+    assert "Chest pain type_non-anginal pain" in pipeline[0].get_feature_names_out()
+    assert summary["previous_rows"] == 200 and summary["new_rows"] == 60 and summary["rows"] == n
+    assert 0.5 / np.sqrt(10) <= summary["C"] <= 0.5 * np.sqrt(10)
+    assert len(search.cv_results_["params"]) == 3
+    assert pipeline[-1].C == summary["C"] and pipeline[-1].warm_start is False
+    assert pipeline.score(X, y) > 0.6
+
+    # The state now covers the whole file
+    assert state.new_rows(path, n) == 0
+    assert state.fingerprint["rows"] == n
+
+
+# Test Case 4: a file with fewer rows than the state covers is rejected
+def test_incremental_retrain_fewer_rows(tmp_path):
+    path = str(tmp_path / "train.csv")
+    state = train_state(path, 200)
+    with pytest.raises(ValueError):
+        incremental_retrain(state, path, data.iloc[:100].drop(columns=target), data.iloc[:100][target])
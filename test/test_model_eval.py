@@ -13,7 +13,10 @@ from sklearn.datasets import make_classification
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.model_eval import eval_model
+from src.model_eval import eval_model, confusion_counts, bootstrap_intervals
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (f1_score, recall_score, precision_score, accuracy_score, 
+                             balanced_accuracy_score, confusion_matrix)
 
 # Test data setup
 
@@ -55,6 +58,52 @@ def test_success():
     assert isinstance(output_df, pd.DataFrame), "Output is not a pandas DataFrame"
     assert output_df.shape == (3, 3), "Output does not have the shape (3, 3)"
 
+# Test case 4: metrics derived from the single confusion matrix agree with sklearn
+logreg = LogisticRegression().fit(X_train, y_train.values.ravel())
+def test_metrics_match_sklearn():
+    metrics = ["f1", "recall", "accuracy", "precision", "specificity", "balanced_accuracy"]
+    output_df = eval_model(logreg, X_train, y_train, X_test, y_test, metrics=metrics)
+    pos = '> 50% diameter narrowing'
+    pred = logreg.predict(X_test)
+    expected = [
+        f1_score(y_test, pred, pos_label=pos),
+        recall_score(y_test, pred, pos_label=pos),
+        accuracy_score(y_test, pred),
+        precision_score(y_test, pred, pos_label=pos),
+        recall_score(y_test, pred, pos_label='<= 50% diameter narrowing'),
+        balanced_accuracy_score(y_test, pred),
+    ]
+    assert output_df.shape == (6, 3), "Output does not have one row per requested metric"
+    np.testing.assert_allclose(output_df["Test"], np.round(expected, 3))
+
+# Test case 5: the confusion matrix matches sklearn's layout
+def test_confusion_counts():
+    pred = logreg.predict(X_test)
+    confusion, labels = confusion_counts(y_test, pred)
+    np.testing.assert_array_equal(confusion, confusion_matrix(y_test, pred))
+    np.testing.assert_array_equal(labels, np.unique(y_test))
+
+# Test case 6: unknown metric names are rejected
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        eval_model(dummy, X_train, y_train, X_test, y_test, metrics=["auc"])
+
+# Test case 7: bootstrap intervals add CI columns that bracket the point estimates
+def test_bootstrap_columns():
+    output_df = eval_model(logreg, X_train, y_train, X_test, y_test, n_bootstrap=2000, random_state=0)
+    assert list(output_df.columns) == ['Metric', 'Train', 'Test', 'Train CI Lower', 'Train CI Upper',
+                                       'Test CI Lower', 'Test CI Upper']
+    assert (output_df['Test CI Lower'] <= output_df['Test']).all()
+    assert (output_df['Test'] <= output_df['Test CI Upper']).all()
+
+# Test case 8: bootstrap intervals are reproducible and narrow as the sample grows
+def test_bootstrap_intervals():
+    small = bootstrap_intervals((24, 2, 6, 27), ["f1"], random_state=0)
+    again = bootstrap_intervals((24, 2, 6, 27), ["f1"], random_state=0)
+    large = bootstrap_intervals((2400, 200, 600, 2700), ["f1"], random_state=0)
+    np.testing.assert_array_equal(small, again)
+    assert np.diff(large[0]) < np.diff(small[0])
+
 print("All tests passed.")
 
 
@@ -0,0 +1,173 @@
+# test_model_tuning.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import StandardScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from sklearn.dummy import DummyClassifier
+from sklearn.datasets import make_classification
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.class_model_trainer import preprocess_folds
+from src.model_tuning import (RegularizationPathSearchCV, ResumableRandomizedSearchCV, budgeted_halving_search,
+                              summarize_budget)
+
+# Test data setup
+X, y = make_classification(n_samples=120, n_features=8, n_informative=4, random_state=42)
+X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(X.shape[1])])
+y = pd.DataFrame(np.where(y == 1, '> 50% diameter narrowing', '< 50% diameter narrowing'), columns=["target"])
+
+preprocessor = make_column_transformer(
+    (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), list(X.columns))
+)
+pipeline = make_pipeline(preprocessor, LogisticRegression(max_iter=1000, class_weight="balanced"))
+Cs = np.logspace(-3, 3, 13)
+
+
+# Test Case 1: the path search agrees with an exhaustive cold-start grid search
+def test_path_search_matches_grid_search():
+    path_search = RegularizationPathSearchCV(pipeline, Cs=Cs, scoring="accuracy").fit(X, y)
+    grid_search = GridSearchCV(pipeline, {"logisticregression__C": Cs}, scoring="accuracy",
+                               return_train_score=True).fit(X, y.values.ravel())
+
+    np.testing.assert_allclose(path_search.cv_results_["mean_test_score"],
+                               grid_search.cv_results_["mean_test_score"], atol=0.02)
+    assert path_search.best_params_ == grid_search.best_params_
+    np.testing.assert_allclose(path_search.best_estimator_[-1].coef_,
+                               grid_search.best_estimator_[-1].coef_)
+
+
+# Test Case 2: the per-C score table has one row per candidate, sorted by C
+def test_path_search_results_table():
+    path_search = RegularizationPathSearchCV(pipeline, Cs=Cs[::-1], scoring="accuracy", cv=3).fit(X, y)
+    results = pd.DataFrame(path_search.cv_results_)
+
+    assert results.shape[0] == len(Cs)
+    assert results["param_logisticregression__C"].is_monotonic_increasing
+    assert {"split2_test_score", "mean_train_score", "rank_test_score"} <= set(results.columns)
+    assert results.loc[path_search.best_index_, "rank_test_score"] == 1
+
+
+# Test Case 3: starting from a converged model reaches the same optimum; refit=False skips the refit
+def test_path_search_init_and_refit():
+    full = RegularizationPathSearchCV(pipeline, Cs=Cs, scoring="accuracy").fit(X, y)
+    warm = RegularizationPathSearchCV(pipeline, Cs=Cs, scoring="accuracy",
+                                      init=full.best_estimator_[-1]).fit(X, y)
+    np.testing.assert_allclose(warm.best_estimator_[-1].coef_, full.best_estimator_[-1].coef_, atol=1e-4)
+    assert warm.best_estimator_[-1].warm_start is False
+
+    scores_only = RegularizationPathSearchCV(pipeline, Cs=Cs, scoring="accuracy", refit=False).fit(X, y)
+    assert scores_only.best_params_ == full.best_params_
+    assert not hasattr(scores_only, "best_estimator_")
+
+
+def interrupt(checkpoint_dir, n_lines):
+    """Cut the single checkpoint file in `checkpoint_dir` to its first `n_lines` lines plus a partial one."""
+    path = os.path.join(checkpoint_dir, os.listdir(checkpoint_dir)[0])
+    with open(path) as f:
+        lines = f.readlines()
+    with open(path, "w") as f:
+        f.writelines(lines[:n_lines])
+        f.write(lines[n_lines][:20])
+
+
+# Test Case 4: a path search resumed from a partial checkpoint equals an uninterrupted one
+def test_path_search_resumes_from_checkpoint(tmp_path):
+    checkpoint_dir = str(tmp_path)
+    full = RegularizationPathSearchCV(pipeline, Cs=Cs, scoring="accuracy", cv=3,
+                                      checkpoint_dir=checkpoint_dir).fit(X, y)
+    interrupt(checkpoint_dir, 20)
+    resumed = RegularizationPathSearchCV(pipeline, Cs=Cs, scoring="accuracy", cv=3,
+                                         checkpoint_dir=checkpoint_dir).fit(X, y)
+
+    for key in ["split0_test_score", "split2_test_score", "mean_test_score", "mean_train_score"]:
+        np.testing.assert_array_equal(resumed.cv_results_[key], full.cv_results_[key])
+    assert resumed.best_params_ == full.best_params_
+    np.testing.assert_array_equal(resumed.best_estimator_[-1].coef_, full.best_estimator_[-1].coef_)
+    assert len(os.listdir(checkpoint_dir)) == 1
+
+
+# Test Case 5: the resumable randomized search matches RandomizedSearchCV and refits only missing pairs
+def test_resumable_randomized_search(tmp_path):
+    space = {"logisticregression__C": np.logspace(-3, 3, 30)}
+    reference = RandomizedSearchCV(pipeline, space, n_iter=8, scoring="accuracy", cv=3, random_state=0,
+                                   return_train_score=True).fit(X, y.values.ravel())
+    search = ResumableRandomizedSearchCV(pipeline, space, n_iter=8, scoring="accuracy", cv=3, random_state=0,
+                                         return_train_score=True, checkpoint_dir=str(tmp_path)).fit(X, y)
+    for key in ["params", "split1_test_score", "mean_test_score", "rank_test_score", "mean_train_score"]:
+        np.testing.assert_array_equal(search.cv_results_[key], reference.cv_results_[key])
+    assert search.best_index_ == reference.best_index_
+    np.testing.assert_array_equal(search.best_estimator_[-1].coef_, reference.best_estimator_[-1].coef_)
+
+    interrupt(str(tmp_path), 10)
+    resumed = ResumableRandomizedSearchCV(pipeline, space, n_iter=8, scoring="accuracy", cv=3, random_state=0,
+                                          return_train_score=True, checkpoint_dir=str(tmp_path)).fit(X, y)
+    assert resumed.n_resumed_ == 10
+    np.testing.assert_array_equal(resumed.cv_results_["mean_test_score"], search.cv_results_["mean_test_score"])
+
+
+
+# Test Case 6: on shared encoded folds the randomized search scores what RandomizedSearchCV scores
+def test_resumable_randomized_search_on_shared_folds(tmp_path):
+    space = {"logisticregression__C": np.logspace(-3, 3, 30)}
+    folds = preprocess_folds(preprocessor, X, y, cv=3, shared_dir=str(tmp_path))
+    splits = [(fold["train_idx"], fold["test_idx"]) for fold in folds]
+    reference = RandomizedSearchCV(pipeline, space, n_iter=8, scoring="accuracy", cv=splits, random_state=0,
+                                   return_train_score=True).fit(X, y.values.ravel())
+    search = ResumableRandomizedSearchCV(pipeline, space, n_iter=8, scoring="accuracy", random_state=0,
+                                         return_train_score=True, folds=folds, n_jobs=2).fit(X, y)
+    assert search.cv_results_["params"] == reference.cv_results_["params"]
+    for key in ["split1_test_score", "mean_test_score", "mean_train_score"]:
+        np.testing.assert_allclose(search.cv_results_[key], reference.cv_results_[key])
+    assert search.best_index_ == reference.best_index_
+
+    with pytest.raises(ValueError):
+        ResumableRandomizedSearchCV(pipeline, {"columntransformer__remainder": ["drop"]}, n_iter=1,
+                                    folds=folds).fit(X, y)
+
+
+models = {
+    "dummy": make_pipeline(DummyClassifier()),
+    "logreg": make_pipeline(preprocessor, LogisticRegression(max_iter=1000)),
+    "svc": make_pipeline(preprocessor, SVC()),
+}
+
+
+# Test Case 3: halving tunes every model and only the survivors reach the full folds
+def test_halving_search_tunes_every_model():
+    best_estimators, results = budgeted_halving_search(models, preprocessor, X, y, scoring="accuracy",
+                                                       factor=3, min_resources=10, cv=3, seed=123)
+
+    assert set(best_estimators) == set(models)
+    assert best_estimators["svc"][-1].get_params()["gamma"] != SVC().gamma
+    svc_rounds = results[results["model"] == "svc"].groupby("round")["candidate"].nunique()
+    assert svc_rounds.is_monotonic_decreasing
+    assert svc_rounds.iloc[-1] == 1
+
+    budget = summarize_budget(results)
+    assert len(budget) == results.groupby(["model", "candidate"]).ngroups
+    assert (budget["cpu_time"] > 0).all()
+
+
+# Test Case 4: an exhausted budget stops halving after the first round
+def test_halving_search_respects_budget():
+    _, results = budgeted_halving_search(models, preprocessor, X, y, scoring="accuracy", budget=0,
+                                         budget_type="cpu", min_resources=10, cv=3, seed=123)
+    assert results["round"].max() == 0
+
+
+# Test Case 5: unknown budget types are rejected
+def test_halving_search_invalid_budget_type():
+    with pytest.raises(ValueError):
+        budgeted_halving_search(models, preprocessor, X, y, scoring="accuracy", budget_type="gpu")
@@ -0,0 +1,146 @@
+# test_prediction_service.py
+# author: agent
+# date: 2026-10-17
+
+import asyncio
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.prediction_service import PredictionService
+
+# Test data setup
+rng = np.random.default_rng(0)
+n = 60
+data = pd.DataFrame({
+    "Age (in years)": rng.integers(30, 80, n),
+    "Sex": rng.choice(["male", "female"], n),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"], n),
+    "Resting blood pressure (in mm Hg on admission to the hospital)": rng.integers(100, 180, n),
+    "Serum cholesterol (in mg/dl)": rng.integers(150, 350, n),
+    "Fasting blood sugar > 120 mg/dl": rng.choice([True, False], n),
+    "Resting electrocardiographic results": rng.choice(["normal", "having ST-T wave abnormality"], n),
+    "Maximum heart rate achieved": rng.integers(90, 200, n),
+    "Exercise-induced angina": rng.choice(["yes", "no"], n),
+    "ST depression induced by exercise relative to rest": rng.uniform(0, 4, n).round(1),
+    "Slope of the peak exercise ST segment": rng.choice(["upsloping", "flat", "downsloping"], n),
+    "Number of major vessels (0–3) colored by fluoroscopy": rng.integers(0, 4, n).astype(float),
+    "Thalassemia": rng.choice(["normal", "fixed defect", "reversible defect"], n),
+})
+y = rng.choice(["> 50% diameter narrowing", "< 50% diameter narrowing"], n)
+categorical = [col for col in data.columns if data[col].dtype in (object, bool)]
+numeric = [col for col in data.columns if col not in categorical]
+model = make_pipeline(
+    make_column_transformer(
+        (make_pipeline(SimpleImputer(strategy="most_frequent"), OneHotEncoder(handle_unknown="ignore")), categorical),
+        (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()), numeric),
+    ),
+    LogisticRegression(),
+).fit(data, y)
+records = json.loads(data.to_json(orient="records"))
+
+
+async def request(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    response = await reader.read()
+    writer.close()
+    return status, json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def with_service(scenario, **kwargs):
+    service = await PredictionService(model, port=0, **kwargs).start()
+    try:
+        return await scenario(service)
+    finally:
+        await service.stop()
+
+
+# Test Case 1: concurrent single-row requests are batched and match model.predict
+def test_concurrent_requests_are_batched():
+    async def scenario(service):
+        responses = await asyncio.gather(*(request(service.port, "POST", "/predict", record) for record in records))
+        return responses, service.stats.snapshot()
+
+    responses, stats = asyncio.run(with_service(scenario, max_delay=0.05))
+    assert all(status == 200 for status, _ in responses)
+    predictions = [body["predictions"][0] for _, body in responses]
+    scores = [body["scores"][0] for _, body in responses]
+    np.testing.assert_array_equal(predictions, model.predict(data))
+    np.testing.assert_allclose(scores, model.decision_function(data))
+    assert stats["requests"] == n and stats["batches"] < n
+    assert stats["p50_ms"] <= stats["p99_ms"]
+
+
+# Test Case 2: an invalid payload is rejected without failing the requests batched with it
+def test_invalid_payload_is_isolated():
+    bad = dict(records[0], Sex="unknown")
+
+    async def scenario(service):
+        return await asyncio.gather(request(service.port, "POST", "/predict", records[:3]),
+                                    request(service.port, "POST", "/predict", bad),
+                                    request(service.port, "POST", "/predict", "not a record"))
+
+    (ok_status, ok_body), (bad_status, bad_body), (malformed_status, _) = asyncio.run(
+        with_service(scenario, max_delay=0.05))
+    assert ok_status == 200 and len(ok_body["predictions"]) == 3
+    assert bad_status == 422 and bad_body["details"][0]["column"] == "Sex"
+    assert malformed_status == 400
+
+
+# Test Case 3: health and metrics endpoints
+def test_metrics_and_health():
+    async def scenario(service):
+        await request(service.port, "POST", "/predict", records[0])
+        return (await request(service.port, "GET", "/health"),
+                await request(service.port, "GET", "/metrics"),
+                await request(service.port, "GET", "/missing"))
+
+    (health_status, health), (_, metrics), (missing_status, _) = asyncio.run(with_service(scenario))
+    assert health_status == 200 and health == {"status": "ok"}
+    assert metrics["requests"] == 1 and metrics["rows"] == 1
+    assert {"p50_ms", "p99_ms", "requests_per_sec", "rows_per_sec"} <= set(metrics)
+    assert missing_status == 404
+
+
+# Test Case 4: malformed and oversized requests are answered before the connection closes
+def test_malformed_requests_get_a_response():
+    async def raw(port, head):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(head)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return int(response.split()[1])
+
+    async def scenario(service):
+        return await asyncio.gather(raw(service.port, b"GARBAGE\r\n\r\n"),
+                                    raw(service.port, b"POST /predict HTTP/1.1\r\nContent-Length: abc\r\n\r\n"),
+                                    raw(service.port, b"POST /predict HTTP/1.1\r\nContent-Length: 2000000\r\n\r\n"))
+
+    assert asyncio.run(with_service(scenario, max_body_bytes=10**6)) == [400, 400, 413]
+
+
+# Test Case 5: a body that is not UTF-8 is answered with 400 and counted as an error
+def test_non_utf8_body_is_rejected():
+    async def scenario(service):
+        reader, writer = await asyncio.open_connection("127.0.0.1", service.port)
+        writer.write(b"POST /predict HTTP/1.1\r\nContent-Length: 1\r\nConnection: close\r\n\r\n\xff")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return int(response.split()[1]), service.stats.errors
+
+    assert asyncio.run(with_service(scenario)) == (400, 1)
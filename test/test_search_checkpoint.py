@@ -0,0 +1,58 @@
+# test_search_checkpoint.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.search_checkpoint import SearchCheckpoint, search_key
+
+# Test data setup
+X = pd.DataFrame({"a": [1.0, 2.0, 3.0, 4.0], "b": [0.5, 0.1, 0.2, 0.3]})
+y = pd.Series(["no", "yes", "no", "yes"])
+candidates = [{"C": 0.1}, {"C": 1.0}]
+
+
+# Test Case 1: results round-trip exactly, NumPy values included
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = SearchCheckpoint(str(tmp_path / "checkpoints"), "key")
+    assert checkpoint.completed() == {}
+
+    coef = np.array([[0.1, -1 / 3]])
+    checkpoint.append(1, 0, {"test_score": np.float64(2 / 3), "coef": coef})
+    checkpoint.append(0, 2, {"test_score": 0.5})
+
+    completed = checkpoint.completed()
+    assert set(completed) == {(1, 0), (0, 2)}
+    assert completed[(1, 0)]["test_score"] == 2 / 3
+    np.testing.assert_array_equal(np.array(completed[(1, 0)]["coef"]), coef)
+
+
+# Test Case 2: a line cut short by an interruption is dropped and removed from the file
+def test_checkpoint_drops_partial_line(tmp_path):
+    checkpoint = SearchCheckpoint(str(tmp_path), "key")
+    checkpoint.append(0, 0, {"test_score": 0.5})
+    with open(checkpoint.path, "a") as f:
+        f.write('{"candidate": 0, "fold": 1, "test_sc')
+
+    assert set(checkpoint.completed()) == {(0, 0)}
+    checkpoint.append(0, 1, {"test_score": 0.25})
+    assert checkpoint.completed()[(0, 1)]["test_score"] == 0.25
+
+
+# Test Case 3: the key changes with the data, the candidates and the settings
+def test_search_key():
+    estimator = LogisticRegression()
+    key = search_key(estimator, X, y, candidates, 5, "accuracy")
+
+    assert key == search_key(estimator, X.copy(), y.copy(), [dict(c) for c in candidates], 5, "accuracy")
+    assert key != search_key(estimator, X.assign(a=X["a"] + 1), y, candidates, 5, "accuracy")
+    assert key != search_key(estimator, X, y, candidates[:1], 5, "accuracy")
+    assert key != search_key(estimator, X, y, candidates, 3, "accuracy")
+    assert key != search_key(LogisticRegression(max_iter=10), X, y, candidates, 5, "accuracy")
+    assert key != search_key(estimator, X, y, candidates, 5, "accuracy", True)
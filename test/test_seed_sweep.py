@@ -0,0 +1,56 @@
+# test_seed_sweep.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.seed_sweep import run_seed, seed_sweep, summarize_sweep
+
+# Test data setup
+rng = np.random.default_rng(11)
+n = 150
+data = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "asymptomatic"], n).astype(object),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n),
+})
+data["Diagnosis of heart disease"] = np.where(data["Age (in years)"] + rng.normal(0, 8, n) > 55,
+                                              '> 50% diameter narrowing', '< 50% diameter narrowing')
+categorical = ["Sex", "Chest pain type"]
+settings = {"cv": 3, "Cs": np.logspace(-2, 2, 5)}
+
+
+# Test Case 1: the pooled sweep reproduces running each seed directly
+def test_seed_sweep_matches_direct_runs():
+    records = seed_sweep(data, [1, 2, 3], categorical, n_jobs=2, **settings)
+    direct = pd.DataFrame([record for seed in [1, 2, 3] for record in run_seed(seed, categorical, data=data, **settings)])
+
+    pd.testing.assert_frame_equal(records.drop(columns="seconds"), direct.drop(columns="seconds"))
+    assert list(records["seed"].unique()) == [1, 2, 3]
+    assert set(records["model"]) == {"dummy", "logreg", "svc", "logreg_bal", "svc_bal", "logreg_bal (tuned)"}
+    assert set(records["stage"]) == {"cv", "test", "tuning"}
+
+
+# Test Case 2: different seeds give different splits
+def test_run_seed_depends_on_seed():
+    first = pd.DataFrame(run_seed(1, categorical, data=data, **settings))
+    second = pd.DataFrame(run_seed(2, categorical, data=data, **settings))
+    assert not np.allclose(first["value"], second["value"])
+
+
+# Test Case 3: one summary row per model, stage and metric
+def test_summarize_sweep():
+    records = pd.DataFrame({"seed": [0, 1, 2, 0, 1, 2], "model": ["a"] * 3 + ["b"] * 3, "stage": "cv",
+                            "metric": "f1", "value": [0.1, 0.2, 0.3, 0.5, 0.5, 0.5], "seconds": 1.0})
+    summary = summarize_sweep(records).set_index("model")
+
+    assert list(summary.columns) == ["stage", "metric", "n_seeds", "mean", "std", "min", "p05", "median", "p95", "max"]
+    assert summary.loc["a", "n_seeds"] == 3
+    np.testing.assert_allclose(summary.loc["a", ["mean", "std", "median", "max"]].astype(float), [0.2, 0.1, 0.2, 0.3])
+    assert summary.loc["b", "std"] == 0
@@ -0,0 +1,99 @@
+# test_shared_data.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.pipeline import make_pipeline
+from sklearn.compose import make_column_transformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import KFold
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.class_model_trainer import preprocess_folds, cross_validate_shared
+from src.shared_data import SharedFold
+from src.compact_features import make_compact
+
+# Test data setup
+rng = np.random.default_rng(0)
+X = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], 90),
+    "Age (in years)": rng.integers(30, 80, 90),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, 90),
+})
+y = pd.DataFrame({"target": np.where(X["Age (in years)"] + rng.normal(0, 10, 90) > 55,
+                                     '> 50% diameter narrowing', '< 50% diameter narrowing')})
+
+preprocessor = make_column_transformer(
+    (OneHotEncoder(handle_unknown="ignore", sparse_output=False), ["Sex"]),
+    (make_pipeline(SimpleImputer(strategy="median"), StandardScaler()),
+     ["Age (in years)", "Serum cholesterol (in mg/dl)"]),
+)
+
+
+# Test Case 1: shared folds hold the same matrices as in-memory folds
+def test_shared_folds_match_in_memory_folds(tmp_path):
+    in_memory = preprocess_folds(preprocessor, X, y, cv=3)
+    shared = preprocess_folds(preprocessor, X, y, cv=3, shared_dir=str(tmp_path))
+
+    assert all(isinstance(fold, SharedFold) for fold in shared)
+    for expected, fold in zip(in_memory, shared):
+        for key in ["X_train", "X_test"]:
+            np.testing.assert_allclose(fold[key], expected[key])
+        for key in ["y_train", "y_test", "train_idx", "test_idx"]:
+            np.testing.assert_array_equal(fold[key], expected[key])
+
+
+# Test Case 2: a pickled fold carries indices and paths, not the encoded data
+def test_shared_fold_pickles_without_data(tmp_path):
+    fold = preprocess_folds(preprocessor, X, y, cv=3, shared_dir=str(tmp_path))[0]
+    payload = pickle.dumps(fold)
+    assert len(payload) < fold["X_train"].nbytes + fold["X_test"].nbytes
+    np.testing.assert_allclose(pickle.loads(payload)["X_test"], fold["X_test"])
+
+    # The maps opened by a fold stay with it: never pickled, and closed on release
+    assert fold._arrays and not pickle.loads(pickle.dumps(fold))._arrays
+    fold.release()
+    assert not fold._arrays
+
+
+# Test Case 3: cross-validation scores do not depend on the handoff
+def test_cross_validate_shared_with_memmap(tmp_path):
+    models = {"logreg": make_pipeline(preprocessor, LogisticRegression())}
+    scoring = {"accuracy": "accuracy"}
+    expected = cross_validate_shared(models, preprocessor, X, y, cv=3, scoring=scoring)
+    shared = cross_validate_shared(models, preprocessor, X, y, cv=3, scoring=scoring,
+                                   n_jobs=2, shared_dir=str(tmp_path))
+    np.testing.assert_allclose(shared["logreg"]["test_accuracy"], expected["logreg"]["test_accuracy"])
+
+
+# Test Case 4: sparse float32 output is stored sparse and keeps its dtype
+def test_shared_folds_keep_sparse_float32(tmp_path):
+    compact = make_compact(preprocessor)
+    in_memory = preprocess_folds(compact, X, y, cv=3)
+    shared = preprocess_folds(compact, X, y, cv=3, shared_dir=str(tmp_path))
+
+    assert not any(name.endswith("features.npy") for _, _, files in os.walk(tmp_path) for name in files)
+    for expected, fold in zip(in_memory, shared):
+        for key in ["X_train", "X_test"]:
+            assert sparse.issparse(fold[key]) and fold[key].dtype == np.float32
+            np.testing.assert_array_equal(fold[key].toarray(), expected[key].toarray())
+
+
+# Test Case 5: folds are keyed by their indices, so an unseeded shuffling splitter never reuses stale folds
+def test_shared_folds_follow_unseeded_splits(tmp_path):
+    first = preprocess_folds(preprocessor, X, y, cv=KFold(3, shuffle=True), shared_dir=str(tmp_path))
+    second = preprocess_folds(preprocessor, X, y, cv=KFold(3, shuffle=True), shared_dir=str(tmp_path))
+    assert not np.array_equal(first[0]["test_idx"], second[0]["test_idx"])
+
+    in_memory = preprocess_folds(preprocessor, X, y, cv=[(f["train_idx"], f["test_idx"]) for f in second])
+    for expected, fold in zip(in_memory, second):
+        np.testing.assert_allclose(fold["X_test"], expected["X_test"])
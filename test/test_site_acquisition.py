@@ -0,0 +1,92 @@
+# test_site_acquisition.py
+# author: agent
+# date: 2026-10-17
+
+import functools
+import os
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.codebook import CODEBOOK
+from src.dataset_store import DatasetStore
+from src.site_acquisition import HEART_DISEASE_SITES, acquire_sites, site_name
+
+# Test data setup: one source row per site, in the headerless UCI format with "?" for missing values
+ROWS = {
+    "cleveland": "63.0,1.0,1.0,145.0,233.0,1.0,2.0,150.0,0.0,2.3,3.0,0.0,6.0,0",
+    "hungarian": "28,1,2,130,132,0,2,185,0,0,?,?,?,0",
+    "switzerland": "32,1,1,95,0,?,0,127,0,.7,1,?,?,1",
+    "va": "63,1,4,140,260,0,1,112,1,3,2,?,?,2",
+}
+DELAY = 0.5
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    """Serves files after a fixed delay, standing in for a distant host"""
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site_server(tmp_path):
+    """A local HTTP server of the four site files"""
+    www = tmp_path / "www"
+    www.mkdir()
+    for site, row in ROWS.items():
+        (www / HEART_DISEASE_SITES[site]).write_text(row + "\n")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(SlowHandler, directory=str(www)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+# Test Case 1: the sites are decoded in the codebook schema, tagged and merged in order
+def test_acquire_sites_merges_and_tags(tmp_path, site_server):
+    store = DatasetStore(str(tmp_path / "store"))
+    merged, seconds = acquire_sites(store, list(ROWS), base_url=site_server)
+
+    assert list(merged.columns) == [name for name, _, _ in CODEBOOK.values()] + ["Site"]
+    assert list(merged["Site"]) == list(ROWS)
+    assert list(merged["Sex"]) == ["male"] * 4
+    assert list(merged["Chest pain type"]) == ["typical angina", "atypical angina", "typical angina", "asymptomatic"]
+    assert merged["Slope of the peak exercise ST segment"].isna().tolist() == [False, True, False, False]
+    assert merged["Fasting blood sugar > 120 mg/dl"].isna().tolist() == [False, False, True, False]
+    np.testing.assert_allclose(merged["ST depression induced by exercise relative to rest"], [2.3, 0, 0.7, 3])
+    assert set(seconds) == set(ROWS)
+    assert all(site_name(site) in store for site in ROWS)
+
+
+# Test Case 2: the sites download concurrently, so the total is close to one site's time
+def test_acquire_sites_is_concurrent(tmp_path, site_server):
+    start = time.perf_counter()
+    acquire_sites(DatasetStore(str(tmp_path / "store")), list(ROWS), base_url=site_server)
+    assert time.perf_counter() - start < 2 * DELAY < len(ROWS) * DELAY
+
+
+# Test Case 3: offline acquisition reads the store and fails on a missing site
+def test_acquire_sites_offline(tmp_path, site_server):
+    store = DatasetStore(str(tmp_path / "store"))
+    online, _ = acquire_sites(store, ["va", "hungarian"], base_url=site_server)
+
+    start = time.perf_counter()
+    offline, _ = acquire_sites(store, ["va", "hungarian"], base_url="http://127.0.0.1:9", offline=True)
+    assert time.perf_counter() - start < DELAY
+    pd.testing.assert_frame_equal(online, offline)
+
+    with pytest.raises(KeyError):
+        acquire_sites(store, ["cleveland"], offline=True)
+    with pytest.raises(ValueError):
+        acquire_sites(store, ["mars"])
@@ -0,0 +1,88 @@
+# test_storage.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.storage import DatasetWriter, booleans_as_objects, dataset_path, iter_dataset, read_dataset, storage_format, write_dataset
+
+# Test data setup: the column types of the decoded heart disease data
+frame = pd.DataFrame({
+    "Age (in years)": pd.array([63, 67, None, 41], dtype="Int64"),
+    "Sex": pd.Categorical(["male", "male", "female", None], categories=["female", "male"]),
+    "Fasting blood sugar > 120 mg/dl": pd.Categorical([True, False, None, False], categories=[False, True]),
+    "Number of major vessels (0-3) colored by flourosopy": [0.0, 3.0, np.nan, 1.0],
+    "Diagnosis of heart disease": ["< 50% diameter narrowing", "> 50% diameter narrowing", np.nan, "> 50% diameter narrowing"],
+})
+
+
+# Test Case 1: the format follows the extension, with CSV for anything else
+def test_storage_format():
+    assert storage_format("data/train_df.csv") == "csv"
+    assert storage_format("data/train_df.parquet") == "parquet"
+    assert storage_format("data/train_df.PQ") == "parquet"
+    assert storage_format("data/train_df.feather") == "arrow"
+    assert storage_format("data/train_df.txt") == "csv"
+    assert dataset_path("data", "train_df", "arrow") == os.path.join("data", "train_df.arrow")
+    with pytest.raises(ValueError):
+        dataset_path("data", "train_df", "xlsx")
+
+
+# Test Case 2: Parquet and Arrow files keep the column types; every format reads a projection in order
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_round_trip_keeps_types(tmp_path, format):
+    path = dataset_path(str(tmp_path), "heart", format)
+    write_dataset(frame, path)
+    pd.testing.assert_frame_equal(read_dataset(path), frame)
+
+    columns = ["Diagnosis of heart disease", "Sex"]
+    pd.testing.assert_frame_equal(read_dataset(path, columns=columns), frame[columns])
+    write_dataset(frame, str(tmp_path / "heart.csv"))
+    assert list(read_dataset(str(tmp_path / "heart.csv"), columns=columns).columns) == columns
+
+
+# Test Case 3: chunks written one at a time read back as the whole, in chunks of the requested size
+@pytest.mark.parametrize("format", ["csv", "parquet", "arrow"])
+def test_chunked_write_and_read(tmp_path, format):
+    path = dataset_path(str(tmp_path), "heart", format)
+    with DatasetWriter(path) as writer:
+        writer.write(frame.iloc[:3])
+        writer.write(frame.iloc[3:])
+    assert writer.n_rows == len(frame)
+
+    chunks = list(iter_dataset(path, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+    whole = pd.concat(chunks, ignore_index=True)
+    assert whole["Diagnosis of heart disease"].tolist()[:2] == frame["Diagnosis of heart disease"].tolist()[:2]
+    pd.testing.assert_frame_equal(whole.astype(str), read_dataset(path).astype(str))
+
+    # Nothing written still leaves a file with the columns
+    empty = dataset_path(str(tmp_path), "empty", format)
+    DatasetWriter(empty, columns=["prediction", "score"]).close()
+    assert list(read_dataset(empty).columns) == ["prediction", "score"]
+
+
+# Test Case 4: boolean columns reach the estimators as objects, next to the categoricals
+def test_booleans_as_objects():
+    from sklearn.impute import SimpleImputer
+
+    X = frame[["Sex", "Fasting blood sugar > 120 mg/dl"]]
+    with pytest.raises(ValueError):
+        SimpleImputer(strategy="most_frequent").fit(X)
+
+    converted = booleans_as_objects(X)
+    assert converted["Fasting blood sugar > 120 mg/dl"].dtype == object
+    assert converted["Fasting blood sugar > 120 mg/dl"].tolist()[:2] == [True, False]
+    assert converted["Sex"].dtype == "category"
+    imputed = SimpleImputer(strategy="most_frequent").fit_transform(converted)
+    assert imputed[2].tolist() == ["female", False]
+    assert imputed[3].tolist() == ["male", False]
+
+    X = frame[["Sex"]]
+    assert booleans_as_objects(X) is X
@@ -0,0 +1,76 @@
+# test_streaming_training.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import cross_val_predict
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.streaming_training import StreamingStatistics, stream_train
+from src.fused_preprocessor import FusedPreprocessor
+
+# Test data setup
+rng = np.random.default_rng(4)
+n = 300
+data = pd.DataFrame({
+    "Sex": rng.choice(["male", "female"], n).astype(object),
+    "Chest pain type": rng.choice(["typical angina", "atypical angina", "non-anginal pain", "asymptomatic"], n).astype(object),
+    "Age (in years)": rng.integers(30, 80, n).astype(float),
+    "Serum cholesterol (in mg/dl)": rng.normal(240, 40, n),
+    "Constant": np.full(n, 3.0),
+})
+data.loc[::7, "Chest pain type"] = np.nan
+data.loc[::9, "Age (in years)"] = np.nan
+data.loc[:40, "Serum cholesterol (in mg/dl)"] = np.nan
+data["Diagnosis of heart disease"] = np.where(data["Age (in years)"].fillna(55) + rng.normal(0, 8, n) > 55,
+                                              '> 50% diameter narrowing', '< 50% diameter narrowing')
+X = data.drop(columns="Diagnosis of heart disease")
+categorical = ["Sex", "Chest pain type"]
+numeric = ["Age (in years)", "Serum cholesterol (in mg/dl)", "Constant"]
+
+
+# Test Case 1: chunked statistics equal those of a whole-data fit
+@pytest.mark.parametrize("chunk_size", [1, 37, 1000])
+def test_streaming_statistics_match_fit(chunk_size):
+    statistics = StreamingStatistics(categorical, numeric)
+    for start in range(0, n, chunk_size):
+        statistics.update(X.iloc[start:start + chunk_size])
+    streamed, expected = statistics.preprocessor(), FusedPreprocessor(categorical, numeric).fit(X)
+
+    assert streamed.categories_ == expected.categories_
+    assert streamed.categorical_fill_ == expected.categorical_fill_
+    np.testing.assert_array_equal(streamed.numeric_fill_, expected.numeric_fill_)
+    for attribute in ("mean_", "var_", "scale_"):
+        np.testing.assert_allclose(getattr(streamed, attribute), getattr(expected, attribute), rtol=1e-12)
+    np.testing.assert_allclose(streamed.transform(X), expected.transform(X), atol=1e-12)
+
+
+# Test Case 2: the reservoir holds at most sample_size values per column
+def test_reservoir_is_bounded():
+    statistics = StreamingStatistics(categorical, numeric, sample_size=50, seed=0)
+    for start in range(0, n, 64):
+        statistics.update(X.iloc[start:start + 64])
+    assert all(len(sample) == 50 for sample in statistics.reservoirs)
+    assert abs(statistics.preprocessor().numeric_fill_[1] - X["Serum cholesterol (in mg/dl)"].median()) < 30
+
+
+# Test Case 3: the streamed pipeline trains from CSV and Parquet files and refits like any pipeline
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_stream_train(tmp_path, suffix):
+    path = str(tmp_path / f"train{suffix}")
+    data.to_csv(path, index=False) if suffix == ".csv" else data.to_parquet(path, index=False)
+    pipeline, summary = stream_train(path, categorical, chunk_size=64, class_weight="balanced", n_epochs=10, seed=0)
+
+    assert summary["rows"] == n and summary["chunks"] == 5
+    assert list(pipeline[0].numeric_features) == numeric
+    y = data["Diagnosis of heart disease"]
+    assert (pipeline.predict(X) == y).mean() > 0.75
+    # As in 5_evaluate.py, out-of-fold scores refit clones on label-encoded targets
+    scores = cross_val_predict(clone(pipeline), X, y, cv=3, method="decision_function")
+    assert scores.shape == (n,)
@@ -0,0 +1,69 @@
+# test_threshold_tuning.py
+# author: agent
+# date: 2026-10-17
+
+import os
+import sys
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import precision_recall_curve, recall_score
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.threshold_tuning import (positive_scores, out_of_fold_scores, threshold_curve,
+                                  select_threshold, ThresholdClassifier)
+
+POS = '> 50% diameter narrowing'
+
+# Test data setup
+X, y = make_classification(n_samples=200, n_features=6, n_informative=3, random_state=0)
+X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(X.shape[1])])
+y = pd.Series(np.where(y == 1, POS, '<= 50% diameter narrowing'))
+model = LogisticRegression().fit(X, y)
+
+
+# Test Case 1: the one-pass curve matches sklearn's precision-recall curve
+def test_threshold_curve_matches_sklearn():
+    scores = positive_scores(model, X)
+    # Ties in the rounded scores exercise the grouping of equal thresholds
+    scores = np.round(scores, 1)
+    curve = threshold_curve(y, scores)
+    precision, recall, thresholds = precision_recall_curve(y, scores, pos_label=POS)
+
+    expected = pd.DataFrame({"threshold": thresholds, "precision": precision[:-1], "recall": recall[:-1]})
+    actual = curve.set_index("threshold").loc[thresholds, ["precision", "recall"]]
+    np.testing.assert_allclose(actual["precision"], expected["precision"])
+    np.testing.assert_allclose(actual["recall"], expected["recall"])
+    assert (curve["tp"] + curve["fp"] + curve["fn"] + curve["tn"] == len(y)).all()
+
+
+# Test Case 2: the selected threshold reaches the target recall when applied
+def test_select_threshold_reaches_target():
+    scores = positive_scores(model, X)
+    chosen = select_threshold(threshold_curve(y, scores), 0.95)
+    thresholded = ThresholdClassifier(model, chosen["threshold"])
+
+    assert recall_score(y, thresholded.predict(X), pos_label=POS) == pytest.approx(chosen["recall"])
+    assert chosen["recall"] >= 0.95
+    with pytest.raises(ValueError):
+        select_threshold(threshold_curve(y, scores), 1.5)
+
+
+# Test Case 3: the wrapper survives pickling and defaults to the model's own boundary at 0
+def test_threshold_classifier_pickles():
+    thresholded = pickle.loads(pickle.dumps(ThresholdClassifier(model, 0.0)))
+    assert thresholded.threshold == 0.0
+    # LogisticRegression predicts positive only when the decision function is > 0
+    scores = model.decision_function(X)
+    np.testing.assert_array_equal(thresholded.predict(X)[scores != 0], model.predict(X)[scores != 0])
+
+
+# Test Case 4: out-of-fold scores come from one score per row
+def test_out_of_fold_scores():
+    scores = out_of_fold_scores(LogisticRegression(), X, y.to_frame())
+    assert scores.shape == (len(X),)
+    assert np.corrcoef(scores, positive_scores(model, X))[0, 1] > 0.9